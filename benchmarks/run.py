@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+# Benchmarks of the stages of onot on synthetic documents.
+#
+#   python -m benchmarks.run                                # 100 and 10k packages
+#   python -m benchmarks.run --scales 100,10000,100000 --save before
+#   python -m benchmarks.run --compare before               # exit 1 on a regression
+#
+# Every stage runs `repeat` times at every scale; the best wall time counts. The peak
+# memory is the peak of the Python allocations (tracemalloc) of one more run. The
+# licenses come from a local stand-in of spdx.org (test/spdx_server.py), so the
+# benchmarks run offline and the license stage measures onot, not the network.
+#
+# Results are stored in benchmarks/results/<name>.json.
+
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+import click
+import onot
+from onot.parsing import excel
+from onot.parsing import rdf_xml
+from onot.parsing import rdf_xml_stream
+from onot.parsing import spdx_license
+from onot.generating import html
+from onot.generating import text
+from onot.tools import synth
+from test import spdx_server
+from test.spdx_server import SPDXServer
+
+DEFAULT_SCALES = "100,10000"
+DEFAULT_REPEAT = 3
+# relative loss of throughput or growth of peak memory reported as a regression
+DEFAULT_THRESHOLD = 0.1
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+def read_stages(instance, file):
+    # everything the parser does before license_info
+    instance.validate_file(file)
+    instance.document_info()
+    instance.package_info()
+    instance.per_file_info()
+    instance.extracted_license_info()
+    return instance
+
+def read_excel(context):
+    instance = excel.Parser(context.excel_file)
+    try:
+        return read_stages(instance, context.excel_file)
+    finally:
+        instance.wb.close()
+
+class Context():
+    # the fixtures of one scale and everything the stages share
+    def __init__(self, scale, directory, url_prefix):
+        self.scale = scale
+        self.directory = directory
+        self.url_prefix = url_prefix
+        # one extracted license per 50 packages; only licenses the stand-in serves
+        document = synth.SyntheticDocument(scale, files=scale // 10, extracted_licenses=max(scale // 50, 1),
+                                           license_ids=sorted(spdx_server.LICENSES),
+                                           exception_ids=sorted(spdx_server.EXCEPTIONS),
+                                           name="benchmark-%d" % scale)
+        self.excel_file = os.path.join(directory, "benchmark-%d.xlsx" % scale)
+        self.rdf_xml_file = os.path.join(directory, "benchmark-%d.rdf.xml" % scale)
+        synth.write_excel(document, self.excel_file)
+        synth.write_rdf_xml(document, self.rdf_xml_file)
+        self.doc = None
+
+    def new_registry(self):
+        # a cold registry: the license lists and details are downloaded again
+        spdx_license.configure(url_prefix=self.url_prefix, use_cache=False, use_database=False)
+
+    def get_doc(self):
+        if self.doc is None:
+            self.new_registry()
+            instance = read_excel(self)
+            instance.license_info()
+            self.doc = instance.doc
+        return self.doc
+
+# name -> (setup(context) -> argument, run(context, argument)); only run is measured
+def setup_nothing(context):
+    return None
+
+def setup_license_info(context):
+    context.new_registry()
+    return read_excel(context)
+
+def run_generator(generator):
+    def run(context, doc):
+        path = generator().generate(doc)
+        os.remove(path)
+    return run
+
+STAGES = {
+    "excel.Parser": (setup_nothing, lambda context, _: read_excel(context)),
+    "rdf_xml_stream.Parser": (setup_nothing, lambda context, _: read_stages(rdf_xml_stream.Parser(context.rdf_xml_file), context.rdf_xml_file)),
+    "rdf_xml.Parser": (setup_nothing, lambda context, _: read_stages(rdf_xml.Parser(context.rdf_xml_file), context.rdf_xml_file)),
+    "license_info": (setup_license_info, lambda context, instance: instance.license_info()),
+    "html.Generator": (lambda context: context.get_doc(), run_generator(html.Generator)),
+    "text.Generator": (lambda context: context.get_doc(), run_generator(text.Generator)),
+}
+
+def measure(context, stage, repeat, memory):
+    setup, run = STAGES[stage]
+    walls = []
+    cpus = []
+    for _ in range(repeat):
+        argument = setup(context)
+        gc.collect()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        run(context, argument)
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    best = min(range(repeat), key=lambda index: walls[index])
+    result = {
+        "packages": context.scale,
+        "wall_best": round(walls[best], 6),
+        "wall_mean": round(sum(walls) / repeat, 6),
+        "cpu": round(cpus[best], 6),
+        "packages_per_second": round(context.scale / walls[best], 1) if walls[best] > 0 else None,
+        "peak_memory_bytes": None
+    }
+    if memory:
+        argument = setup(context)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(context, argument)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+def run_benchmarks(scales, stages=None, repeat=DEFAULT_REPEAT, memory=True, on_result=None):
+    # returns {"<stage>@<scale>": result}
+    stages = stages or list(STAGES)
+    results = {}
+    server = SPDXServer().start()
+    directory = tempfile.mkdtemp(prefix="onot_benchmark_")
+    cwd = os.getcwd()
+    # the generators write to ./output
+    os.chdir(directory)
+    try:
+        for scale in scales:
+            context = Context(scale, directory, server.url_prefix)
+            for stage in stages:
+                key = stage + "@" + str(scale)
+                results[key] = measure(context, stage, repeat, memory)
+                if on_result is not None:
+                    on_result(key, results[key])
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+        server.stop()
+    return results
+
+def make_report(results, repeat):
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "onot": onot.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results
+    }
+
+def results_path(name):
+    # a name in benchmarks/results or a path
+    if os.sep in name or name.endswith(".json"):
+        return name
+    return os.path.join(RESULTS_DIR, name + ".json")
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    # the regressions of results against the baseline, as lines of text
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if before["packages_per_second"] and result["packages_per_second"] is not None:
+            change = result["packages_per_second"] / before["packages_per_second"] - 1
+            if change < -threshold:
+                regressions.append("%s: throughput %.0f -> %.0f packages/s (%+.0f%%)" % (
+                    key, before["packages_per_second"], result["packages_per_second"], change * 100))
+        if before["peak_memory_bytes"] and result["peak_memory_bytes"] is not None:
+            change = result["peak_memory_bytes"] / before["peak_memory_bytes"] - 1
+            if change > threshold:
+                regressions.append("%s: peak memory %.1f -> %.1f MB (%+.0f%%)" % (
+                    key, before["peak_memory_bytes"] / 1e6, result["peak_memory_bytes"] / 1e6, change * 100))
+    return regressions
+
+def echo_result(key, result):
+    memory = "-" if result["peak_memory_bytes"] is None else "%.1f MB" % (result["peak_memory_bytes"] / 1e6)
+    click.echo("%-32s %10.4fs %12s packages/s %12s" % (key, result["wall_best"], result["packages_per_second"], memory))
+
+@click.command(context_settings=CONTEXT_SETTINGS, help="This runs the onot benchmarks on synthetic SPDX documents.")
+@click.option('--scales', type=click.STRING, default=DEFAULT_SCALES, show_default=True, help="Numbers of packages, separated by commas.")
+@click.option('--stages', type=click.STRING, default=None, help="Stages to run, separated by commas. (default: all of " + ", ".join(STAGES) + ")")
+@click.option('--repeat', type=click.IntRange(min=1), default=DEFAULT_REPEAT, show_default=True, help="Runs of every stage; the best one counts.")
+@click.option('--no_memory', is_flag=True, default=False, help="Do not measure the peak memory (one run less per stage).")
+@click.option('--save', type=click.STRING, default=None, help="Store the results as benchmarks/results/<name>.json (or the given path).")
+@click.option('--compare', 'baseline', type=click.STRING, default=None, help="Compare with stored results and exit with 1 on a regression.")
+@click.option('--threshold', type=click.FLOAT, default=DEFAULT_THRESHOLD, show_default=True, help="Relative change reported as a regression.")
+def main(scales, stages, repeat, no_memory, save, baseline, threshold):
+    scales = [int(scale) for scale in scales.split(",") if scale.strip()]
+    stages = [stage.strip() for stage in stages.split(",")] if stages else None
+    for stage in stages or []:
+        if stage not in STAGES:
+            raise click.UsageError("unknown stage: " + stage)
+
+    results = run_benchmarks(scales, stages, repeat, not no_memory, on_result=echo_result)
+    report = make_report(results, repeat)
+    if save is not None:
+        path = results_path(save)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="UTF-8") as f:
+            json.dump(report, f, indent=2)
+        click.echo("results are here - " + path)
+    if baseline is not None:
+        with open(results_path(baseline), "r", encoding="UTF-8") as f:
+            regressions = compare(json.load(f)["results"], results, threshold)
+        for regression in regressions:
+            click.echo("REGRESSION " + regression)
+        if regressions:
+            sys.exit(1)
+        click.echo("no regression against " + baseline)
+
+if __name__ == "__main__":
+    main()
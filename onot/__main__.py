@@ -3,13 +3,13 @@
 # SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
 # SPDX-License-Identifier: Apache-2.0
 
-from onot.tools import create_notice
+from onot.tools import cli
 from onot.log import log_setting
 
 
 def main():
     log_setting.init()
-    create_notice.main()
+    cli.main()
 
 
 if __name__ == '__main__':
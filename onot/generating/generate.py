@@ -2,14 +2,56 @@
 
 # SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
 # SPDX-License-Identifier: Apache-2.0
+from concurrent.futures import ThreadPoolExecutor
 from onot.generating import html
 from onot.generating import text
+from onot.log import metrics
 
-def generate_notice(doc, ext):
+OUTPUT_FORMATS = ['html', 'text']
+
+def parse_output_formats(output_format):
+    # "html,text" or ['html', 'text'] -> ['html', 'text'] (in the given order, without duplicates)
+    # all the formats are checked before any notice is written
+    if isinstance(output_format, str):
+        output_format = output_format.split(',')
+    formats = []
+    for ext in output_format:
+        ext = str(ext).strip()
+        if ext and ext not in formats:
+            if ext not in OUTPUT_FORMATS:
+                raise ValueError("unsupported output format: " + ext)
+            formats.append(ext)
+    if not formats:
+        raise ValueError("no output format")
+    return formats
+
+def generate_notice(doc, ext, max_workers=None, deterministic=False, tag=None):
+    # ext: output formats ('html', 'html,text' or a list) -> paths of the notices, in the same order.
+    # the notices of several formats are rendered at the same time from the same doc.
+    # deterministic: name the notices after the hash of their contents instead of the time,
+    #                and do not write a notice which is already in the output directory.
+    # tag: added to the time in the file names, to tell apart the notices of documents of the same name
+    formats = parse_output_formats(ext)
+    if len(formats) == 1:
+        return [generate_one(doc, formats[0], deterministic, tag)]
+    with ThreadPoolExecutor(max_workers=max_workers or len(formats)) as executor:
+        return list(executor.map(lambda ext: generate_one(doc, ext, deterministic, tag), formats))
+
+def generate_one(doc, ext, deterministic=False, tag=None):
     if ext == 'html':
         file_type = html
     elif ext == 'text':
         file_type = text
+    else:
+        raise ValueError("unsupported output format: " + str(ext))
     g = file_type.Generator()
-    return g.generate(doc)
-    
\ No newline at end of file
+    with metrics.stage("generate." + ext):
+        return g.generate(doc, deterministic, tag)
+
+def write_notice(doc, ext, stream):
+    # write the notice to a text stream instead of a file in the output directory
+    with metrics.stage("generate." + str(ext)), metrics.timed_writes(stream, "write_seconds") as stream:
+        if ext == 'html':
+            html.Generator().write_html(doc, stream)
+        elif ext == 'text':
+            text.Generator().write_text(doc, stream)
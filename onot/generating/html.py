@@ -6,11 +6,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import re
-import sys
 import logging
 from datetime import datetime
+from onot.generating import output
+from onot.log import metrics
 from onot.generating.html_resource import *
+from onot.parsing import license_expression
+
+# bytes buffered before the notice file is written to
+WRITE_BUFFER_SIZE = 1024 * 1024
 
 logger = logging.getLogger("root")
 
@@ -18,15 +22,34 @@ class Generator():
 
     def __init__(self):
         logger.debug("Html class")
+        # license expression -> html of the expression; component tables repeat a few expressions many times
+        self.license_expression_html = {}
 
     def convert_license_expression(self, license_name):
-        splited = re.split(r'OR|AND|WITH', str(license_name))
-        licenses = list(map(lambda license: license.replace("(", "").replace(")", "").strip(), splited))
-        license_component = license_name
-        for license in licenses:
-            license_component = str(license_component).replace(str(license), '<a href="#' + str(license) + '">' + str(license) + '</a>')
+        license_name = str(license_name)
+        license_component = self.license_expression_html.get(license_name)
+        if license_component is None:
+            license_component = self.link_licenses(license_expression.parse(license_name))
+            self.license_expression_html[license_name] = license_component
         return license_component
 
+    def link_licenses(self, expression):
+        # link every license of the expression to its license text, in one pass over the tokens
+        # (MIT and MIT-0 are different tokens, so neither is linked inside the other)
+        text = expression.text
+        parts = []
+        end = 0
+        for token in expression.tokens:
+            license = token.license
+            if license is None or token is not license.tokens[0]:
+                continue
+            start = token.start
+            parts.append(text[end:start])
+            end = license.tokens[-1].end
+            parts.append('<a href="#' + license.id + '">' + text[start:end] + '</a>')
+        parts.append(text[end:])
+        return ''.join(parts)
+
     def convert_download_location(self, download_location, name_version):
         if download_location == "":
             return name_version
@@ -37,50 +60,54 @@ class Generator():
                 " target="_blank">
                 """ + name_version + "</a>"
 
-    def make_html_code(self, doc):
+    def iter_html(self, doc):
+        # yield the notice chunk by chunk (a table row, a license text, ...) so that it can be
+        # written out as it is rendered; the whole document is never held as one string
         title = doc['name']
         intro = 'A portion of this ' +  \
             doc['creationInfo']['organization'] + \
             ' product contains open source software, which is used and distributed in accordance with the specific license under which the open source software is distributed. A list of such open source software and the corresponding license terms is as follows:'
-        head = DOCTYPE + XMLNS + HEAD + STYLE_CSS
-        body_title = BODY_TABLE_1 + '<h2>OSS Notice for ' + title + '</h2>'
-        body_intro = BODY_TABLE_2 + intro
+        yield DOCTYPE + XMLNS + HEAD + STYLE_CSS
+        yield BODY_TABLE_1 + '<h2>OSS Notice for ' + title + '</h2>'
+        yield BODY_TABLE_2 + intro
 
         # component info field
-        body_component = COMPONENT_TITLE
+        yield COMPONENT_TITLE
         for component in doc['packages']:
             name_version = component['name'] + ' ' + str(component['versionInfo'])
-            body_component += '<tr>'
-            body_component += '<td scope="row" data-label="Name" id="' + name_version.replace(' ', '_') + '">'
-            body_component += self.convert_download_location(component["downloadLocation"], name_version)
-            body_component += '</td>'
-            body_component += '<td data-label="License">' + self.convert_license_expression(component['licenseConcluded']) + '</td>'
-            body_component += '<td data-label="Copyright">' + str(component['copyrightText']) + '</td>'
-            body_component += '</tr>'
-        body_component_close = TABLE_CLOSE
+            yield ''.join([
+                '<tr>',
+                '<td scope="row" data-label="Name" id="' + name_version.replace(' ', '_') + '">',
+                self.convert_download_location(component["downloadLocation"], name_version),
+                '</td>',
+                '<td data-label="License">' + self.convert_license_expression(component['licenseConcluded']) + '</td>',
+                '<td data-label="Copyright">' + str(component['copyrightText']) + '</td>',
+                '</tr>'
+            ])
+        yield TABLE_CLOSE
 
         # license text field
-        body_license = LICENSE_TITLE
+        yield LICENSE_TITLE
         for license in doc['licenses']:
-            body_license += '<div class="license">'
-            body_license += '<h4 id="' + license['licenseId'] + '">' + license['name']
+            yield '<div class="license">'
+            yield '<h4 id="' + license['licenseId'] + '">' + license['name']
             # component list
             for package in license['packages']:
                 name_version = ' '.join(package)
-                body_license += '<a href = "#' + name_version.replace(' ', '_') + '">' + name_version + '</a>'
-            body_license += '</h4>'
-            body_license += '<div class="article">'
+                yield '<a href = "#' + name_version.replace(' ', '_') + '">' + name_version + '</a>'
+            yield '</h4>'
+            yield '<div class="article">'
             # license text
-            license_text = ''
             # if license['licenseTextHtml'] is None:
             #     license_text = license['licenseText'].replace('\n', '<br>')
             # else:
             #     license_text = license['licenseTextHtml']
-            license_text = license['licenseText'].replace('\n', '<br>')
-            body_license += '<p>' + license_text + '</p><br />'
-            body_license += '</div>'
-            body_license += '</div>'
-        body_license += LICENSE_TABLE_CLOSE
+            yield '<p>'
+            yield license['licenseText'].replace('\n', '<br>')
+            yield '</p><br />'
+            yield '</div>'
+            yield '</div>'
+        yield LICENSE_TABLE_CLOSE
 
         # writter
         body_offer = WRITTEN_OFFER_TITLE
@@ -91,40 +118,51 @@ class Generator():
             sourceDownloadUrl = doc['creationInfo']['sourceDownloadUrl']
             body_offer += 'You may also find the source code at <a href="' + sourceDownloadUrl + '">' + sourceDownloadUrl + '</a>'
         body_offer += "</p>\n" + WRITTEN_OFFER_CLOSE
+        yield body_offer
 
         # closing
         body_closing = 'If you have any questions regarding open source software contained in this product, please contact '
         body_closing += email + '.'
+        yield body_closing
 
         # footer
-        footer = FOOTER
+        yield FOOTER
+
+    def make_html_code(self, doc):
+        return ''.join(self.iter_html(doc))
 
-        return head + body_title + body_intro + body_component + body_component_close + body_license + body_offer + body_closing + footer
+    def write_html(self, doc, stream):
+        # write the notice to a writable text stream (a file, sys.stdout, io.StringIO, ...)
+        for chunk in self.iter_html(doc):
+            stream.write(chunk)
 
-    def generate_html_file(self, doc, html_code):
+    def html_file_path(self, doc, tag=None):
+        # tag: added to the time, to tell apart notices of the same name written in the same second
         now = datetime.now()
         date_time = now.strftime("%Y%m%d_%H%M%S")
-        name = doc['name'].replace(' ', '_')
-
-        if "/Contents" in sys.executable:
-            current_path = os.path.dirname(sys.executable.split("/Contents")[0])
-            directory_name = os.path.join(current_path, "output")
-        else:
-            directory_name = os.path.abspath("output")
-
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
-
-        file_name = 'OSS_Notice_' + doc['name'].replace(' ', '_') + '_' + date_time + '.html'
-        file_path_name = os.path.join(directory_name, file_name)
-        f = open(file_path_name, 'w', encoding='UTF-8')
-        f.write(html_code)
-        f.close()
+        if tag:
+            date_time += '_' + str(tag)
+        return os.path.join(output.output_directory(), output.notice_file_name(doc, date_time, '.html'))
+
+    def generate_html_file(self, doc, html_code=None, tag=None):
+        # html_code: the rendered notice; if None, the notice is rendered while it is written
+        file_path_name = self.html_file_path(doc, tag)
+        with open(file_path_name, 'w', encoding='UTF-8', buffering=WRITE_BUFFER_SIZE) as f, \
+                metrics.timed_writes(f, "write_seconds") as f:
+            if html_code is None:
+                self.write_html(doc, f)
+            else:
+                f.write(html_code)
+        metrics.count("output_bytes", os.path.getsize(file_path_name))
         logger.debug("output is here - " + str(file_path_name))
         return file_path_name
 
-    def generate(self, doc):
-        html_code = self.make_html_code(doc)
-        file_path_name = self.generate_html_file(doc, html_code)
+    def generate(self, doc, deterministic=False, tag=None):
+        # deterministic: name the notice after the hash of its contents and keep an identical one
+        # tag: see html_file_path; a content addressed name needs none
+        if deterministic:
+            file_path_name = output.write_content_addressed(doc, self.iter_html, '.html')
+        else:
+            file_path_name = self.generate_html_file(doc, tag=tag)
         logger.debug("generate completed")
         return file_path_name
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import hashlib
+import tempfile
+import logging
+from onot.log import metrics
+
+# hex digits of the sha256 of the notice in a content addressed file name
+CONTENT_HASH_LENGTH = 16
+
+logger = logging.getLogger("root")
+
+def output_directory():
+    # ./output, or next to the application bundle on macOS
+    if "/Contents" in sys.executable:
+        current_path = os.path.dirname(sys.executable.split("/Contents")[0])
+        directory_name = os.path.join(current_path, "output")
+    else:
+        directory_name = os.path.abspath("output")
+
+    if not os.path.exists(directory_name):
+        os.makedirs(directory_name)
+    return directory_name
+
+def notice_file_name(doc, tag, suffix):
+    # tag: time of the run, or hash of the contents
+    return 'OSS_Notice_' + doc['name'].replace(' ', '_') + '_' + tag + suffix
+
+def encoded_chunks(chunks):
+    # the bytes a text mode file would get
+    for chunk in chunks:
+        if os.linesep != '\n':
+            chunk = chunk.replace('\n', os.linesep)
+        yield chunk.encode('UTF-8')
+
+def write_content_addressed(doc, iter_chunks, suffix):
+    # write the notice rendered by iter_chunks(doc) as OSS_Notice_<name>_<hash><suffix>.
+    # the same notice always gets the same name, and a notice which is already
+    # there is not written again. the chunks are hashed in memory first; they are
+    # rendered a second time and written only if there is no file of that name.
+    directory_name = output_directory()
+    sha256 = hashlib.sha256()
+    for encoded in encoded_chunks(iter_chunks(doc)):
+        sha256.update(encoded)
+    file_path_name = os.path.join(directory_name, notice_file_name(doc, sha256.hexdigest()[:CONTENT_HASH_LENGTH], suffix))
+    if os.path.exists(file_path_name):
+        logger.debug("output is unchanged - " + str(file_path_name))
+        metrics.count("outputs_unchanged")
+        return file_path_name
+
+    size = 0
+    # an interrupted run leaves no partial notice under the final name
+    fd, temp_path = tempfile.mkstemp(dir=directory_name, suffix=".tmp")
+    try:
+        with metrics.stage("write"):
+            with os.fdopen(fd, 'wb') as f:
+                for encoded in encoded_chunks(iter_chunks(doc)):
+                    size += len(encoded)
+                    f.write(encoded)
+            os.replace(temp_path, file_path_name)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    metrics.count("output_bytes", size)
+    logger.debug("output is here - " + str(file_path_name))
+    return file_path_name
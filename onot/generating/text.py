@@ -6,9 +6,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import sys
 import logging
 from datetime import datetime
+from onot.generating import output
+from onot.log import metrics
+
+# bytes buffered before the notice file is written to
+WRITE_BUFFER_SIZE = 1024 * 1024
 
 logger = logging.getLogger("root")
 
@@ -17,38 +21,35 @@ class Generator():
     def __init__(self):
         logger.debug("text class")
 
-    def make_text(self, doc):
-        title = 'OSS Notice for ' + doc['name']
+    def iter_text(self, doc):
+        # yield the notice section by section, a package or a license at a time, so that it can be
+        # written out as it is rendered; the whole document is never held as one string
+        yield 'OSS Notice for ' + doc['name'] + '\n\n' + '='*40 + '\n\n'
 
-        intro = 'A portion of this ' + \
+        yield 'A portion of this ' + \
             doc['creationInfo']['organization'] + \
-            ' product contains open source software, which is used and distributed in accordance with the specific license under which the open source software is distributed. A list of such open source software and the corresponding license terms is as follows:'
+            ' product contains open source software, which is used and distributed in accordance with the specific license under which the open source software is distributed. A list of such open source software and the corresponding license terms is as follows:' + \
+            '\n\n'
 
-        components = ''
         for component in doc['packages']:
-            components += component['name'] + ' ' + str(component['versionInfo']) + "\n"
-            components += '  ' + component['licenseConcluded'] + '\n\n'
+            yield component['name'] + ' ' + str(component['versionInfo']) + "\n" + \
+                '  ' + component['licenseConcluded'] + '\n\n'
+        yield '-'*40 + '\n\n'
 
-        copyright_data = ''
+        yield 'Copyright Data\n\n'
         for copyright in doc['packages']:
-            copyright_data += copyright['name'] + ' ' + str(copyright['versionInfo']) + "\n"
-            copyright_data += '  ' + str(copyright['copyrightText']) + '\n\n'
+            yield copyright['name'] + ' ' + str(copyright['versionInfo']) + "\n" + \
+                '  ' + str(copyright['copyrightText']) + '\n\n'
+        yield '-'*40 + '\n\n'
 
-        licenses = ''
+        yield 'Licenses\n\n'
         for license in doc['licenses']:
-            licenses += license['name'] + '\n'
+            yield license['name'] + '\n'
             # component list
-            for index, package in enumerate(license['packages']):
-                if index == 0:
-                    licenses += '('
-                licenses += ' '.join(package).strip()
-
-                packages_len = len(license['packages'])
-                if index < packages_len - 1:
-                    licenses += ', '
-                if index == packages_len - 1:
-                    licenses += ')\n\n\n'
-            licenses += license['licenseText'].strip('\n') + '\n\n\n'
+            if license['packages']:
+                yield '(' + ', '.join(' '.join(package).strip() for package in license['packages']) + ')\n\n\n'
+            yield license['licenseText'].strip('\n') + '\n\n\n'
+        yield '-'*40 + '\n\n'
 
         writer = 'Offer of Source Code\n\n'
         email = doc['creationInfo']['email']
@@ -57,42 +58,48 @@ class Generator():
         if 'sourceDownloadUrl' in doc['creationInfo']:
             sourceDownloadUrl = doc['creationInfo']['sourceDownloadUrl']
             writer += 'You may also find the source code at ' + sourceDownloadUrl
+        yield writer + '\n\n'
 
         closing = 'If you have any questions regarding open source software contained in this product, please contact '
         closing += email + '.'
-
-        return title + '\n\n' + '='*40 + '\n\n' + \
-            intro + '\n\n' + \
-            components + '-'*40 + '\n\n' + \
-            'Copyright Data\n\n' + copyright_data + '-'*40 + '\n\n' + \
-            'Licenses\n\n' + licenses + '-'*40 + '\n\n' + \
-            writer + '\n\n' + closing + '\n\n' + '='*40 + '\n\n' + \
+        yield closing + '\n\n' + '='*40 + '\n\n' + \
             'Copyright ' + str(datetime.today().year) + ' SK TELECOM CO., LTD.'
 
-    def generate_text_file(self, doc, text):
-        now = datetime.now()
-        date_time = now.strftime("%Y%m%d_%H%M%S")
-        name = doc['name'].replace(' ', '_')
-
-        if "/Contents" in sys.executable:
-            current_path = os.path.dirname(sys.executable.split("/Contents")[0])
-            directory_name = os.path.join(current_path, "output")
-        else:
-            directory_name = os.path.abspath("output")
+    def make_text(self, doc):
+        return ''.join(self.iter_text(doc))
 
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
+    def write_text(self, doc, stream):
+        # write the notice to a writable text stream (a file, sys.stdout, io.StringIO, ...)
+        for chunk in self.iter_text(doc):
+            stream.write(chunk)
 
-        file_name = 'OSS_Notice_' + doc['name'].replace(' ', '_') + '_' + date_time + '.txt'
-        file_path_name = os.path.join(directory_name, file_name)
-        f = open(file_path_name, 'w', encoding='UTF-8')
-        f.write(text)
-        f.close()
+    def text_file_path(self, doc, tag=None):
+        # tag: added to the time, to tell apart notices of the same name written in the same second
+        now = datetime.now()
+        date_time = now.strftime("%Y%m%d_%H%M%S")
+        if tag:
+            date_time += '_' + str(tag)
+        return os.path.join(output.output_directory(), output.notice_file_name(doc, date_time, '.txt'))
+
+    def generate_text_file(self, doc, text=None, tag=None):
+        # text: the rendered notice; if None, the notice is rendered while it is written
+        file_path_name = self.text_file_path(doc, tag)
+        with open(file_path_name, 'w', encoding='UTF-8', buffering=WRITE_BUFFER_SIZE) as f, \
+                metrics.timed_writes(f, "write_seconds") as f:
+            if text is None:
+                self.write_text(doc, f)
+            else:
+                f.write(text)
+        metrics.count("output_bytes", os.path.getsize(file_path_name))
         logger.debug("output is here - " + str(file_path_name))
         return file_path_name
 
-    def generate(self, doc):
-        text = self.make_text(doc)
-        file_path_name = self.generate_text_file(doc, text)
+    def generate(self, doc, deterministic=False, tag=None):
+        # deterministic: name the notice after the hash of its contents and keep an identical one
+        # tag: see text_file_path; a content addressed name needs none
+        if deterministic:
+            file_path_name = output.write_content_addressed(doc, self.iter_text, '.txt')
+        else:
+            file_path_name = self.generate_text_file(doc, tag=tag)
         logger.debug("generate completed")
         return file_path_name
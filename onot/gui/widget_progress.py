@@ -13,6 +13,7 @@ from PyQt6.QtWidgets import QWidget, QGridLayout, QPushButton
 
 from onot.generating.generate import generate_notice
 from onot.parsing.parse import parse_file
+from onot.log import metrics
 
 logger = logging.getLogger("root")
 
@@ -32,24 +33,33 @@ class WidgetLogHandler(logging.Handler, QtCore.QObject):
 class CreateNoticeThread(QThread):
     signal_finish_job = QtCore.pyqtSignal(str)
     signal_exception = QtCore.pyqtSignal(Exception)
+    # name and seconds of every finished stage (see onot.log.metrics)
+    signal_stage = QtCore.pyqtSignal(str, float)
 
     def __init__(self, parent, input, output_format):
         super().__init__(parent)
         self.input = input
         self.output_format = output_format
 
+    def on_metrics_event(self, event):
+        if event["type"] == metrics.EVENT_STAGE_END:
+            self.signal_stage.emit(event["name"], event["wall"])
+
     def run(self):
+        metrics.add_listener(self.on_metrics_event)
         try:
             # parse excel file
             doc = parse_file(self.input)
 
             # generate html format oss notice
-            file_path_name = generate_notice(doc, self.output_format)
+            file_path_name = generate_notice(doc, self.output_format)[0]
             self.signal_finish_job.emit(file_path_name)
         except Exception as ex:
             logger.error(ex)
             logger.debug(traceback.format_exc())
             self.signal_exception.emit(ex)
+        finally:
+            metrics.remove_listener(self.on_metrics_event)
 
 
 class ProgressWidget(QWidget):
@@ -87,15 +97,22 @@ class ProgressWidget(QWidget):
         self.job = CreateNoticeThread(self, input, output_format)
         self.job.signal_finish_job.connect(self.finish_create_notice)
         self.job.signal_exception.connect(self.handle_exception)
+        self.job.signal_stage.connect(self.show_stage)
         self.job.start()
 
     def stop_job(self):
         self.job.terminate()
         self.job.signal_finish_job.disconnect()
         self.job.signal_exception.disconnect()
+        self.job.signal_stage.disconnect()
+        metrics.remove_listener(self.job.on_metrics_event)
         self.log_text_box.clear()
         self.signal_stop.emit("It has been stopped.")
 
+    @QtCore.pyqtSlot(str, float)
+    def show_stage(self, name, seconds):
+        self.log_text_box.appendPlainText("%s - %.2fs" % (name, seconds))
+
     @QtCore.pyqtSlot(str)
     def finish_create_notice(self, msg):
         self.log_text_box.clear()
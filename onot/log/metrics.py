@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows; the peak memory is not reported there
+    resource = None
+
+# Timings and counters of a run.
+#
+#   metrics.start()                  # record the following stages and counters
+#   with metrics.stage("parse"):     # wall and cpu time of a stage
+#       ...
+#   metrics.count("http.requests")   # add to a counter
+#   metrics.set_value("packages", n) # set a counter
+#   metrics.stop().write_json(path)  # or write_trace(path), a Chrome trace-event file
+#
+# Listeners (add_listener) are called with an event dict on every stage start, stage
+# end and counter change, also when nothing is recorded; the GUI shows the progress
+# with them. Listeners are called in the thread of the stage and must be quick.
+#
+# Without a recording and without listeners every call returns at once.
+
+EVENT_STAGE_START = "stage_start"
+EVENT_STAGE_END = "stage_end"
+EVENT_COUNTER = "counter"
+
+logger = logging.getLogger("root")
+
+# cpu time of the calling thread; before Python 3.7 the cpu time of the process,
+# which also counts the other threads
+thread_time = getattr(time, "thread_time", time.process_time)
+
+_current = None
+_listeners = []
+_lock = threading.Lock()
+
+class Stage():
+    def __init__(self, name, start, thread):
+        self.name = name
+        # seconds since the start of the recording
+        self.start = start
+        self.thread = thread
+        self.wall = None
+        self.cpu = None
+
+    def to_dict(self):
+        return {"name": self.name, "start": round(self.start, 6), "wall": round(self.wall, 6),
+                "cpu": round(self.cpu, 6), "thread": self.thread}
+
+class Metrics():
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        self.stopped = None
+        self.stopped_cpu = None
+        self.stages = []
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def elapsed(self):
+        return (self.stopped if self.stopped is not None else time.perf_counter()) - self.started
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "wall": round(self.elapsed(), 6),
+                "cpu": round((self.stopped_cpu if self.stopped_cpu is not None else time.process_time()) - self.started_cpu, 6),
+                "peak_rss_bytes": peak_rss(),
+                "stages": [stage.to_dict() for stage in self.stages],
+                "counters": dict(self.counters)
+            }
+
+    def to_trace(self):
+        # trace event format: stages are complete ("X") events, counters "C" events at the end.
+        # open it in chrome://tracing or https://ui.perfetto.dev
+        pid = os.getpid()
+        with self.lock:
+            events = [{"name": stage.name, "ph": "X", "pid": pid, "tid": stage.thread,
+                       "ts": round(stage.start * 1e6), "dur": round(stage.wall * 1e6),
+                       "args": {"cpu_ms": round(stage.cpu * 1e3, 3)}}
+                      for stage in self.stages]
+            end = round(self.elapsed() * 1e6)
+            events.extend({"name": name, "ph": "C", "pid": pid, "ts": end, "args": {name: value}}
+                          for name, value in self.counters.items())
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path):
+        with open(path, "w", encoding="UTF-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="UTF-8") as f:
+            json.dump(self.to_trace(), f)
+
+def peak_rss():
+    # peak resident memory of this process in bytes, or None if unknown
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+def start():
+    # start a new recording of this process and return it
+    global _current
+    _current = Metrics()
+    return _current
+
+def stop():
+    # end the recording and return it, or None if nothing was recorded
+    global _current
+    metrics, _current = _current, None
+    if metrics is not None:
+        metrics.stopped = time.perf_counter()
+        metrics.stopped_cpu = time.process_time()
+    return metrics
+
+def is_enabled():
+    return _current is not None or bool(_listeners)
+
+def add_listener(listener):
+    # listener(event): event is a dict with "type" (EVENT_*) and "name", and for
+    # EVENT_STAGE_END "wall" and "cpu", for EVENT_COUNTER "value"
+    with _lock:
+        _listeners.append(listener)
+
+def remove_listener(listener):
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+def emit(event):
+    for listener in list(_listeners):
+        try:
+            listener(event)
+        except Exception as ex:
+            logger.warning("metrics listener failed: " + str(ex))
+
+@contextmanager
+def stage(name):
+    if not is_enabled():
+        yield
+        return
+    metrics = _current
+    wall = time.perf_counter()
+    cpu = thread_time()
+    emit({"type": EVENT_STAGE_START, "name": name})
+    try:
+        yield
+    finally:
+        record = Stage(name, wall - (metrics.started if metrics is not None else wall), threading.get_ident())
+        record.wall = time.perf_counter() - wall
+        record.cpu = thread_time() - cpu
+        if metrics is not None:
+            with metrics.lock:
+                metrics.stages.append(record)
+        emit({"type": EVENT_STAGE_END, "name": name, "wall": record.wall, "cpu": record.cpu})
+
+def count(name, value=1):
+    if not is_enabled():
+        return
+    metrics = _current
+    if metrics is not None:
+        with metrics.lock:
+            value = metrics.counters[name] = metrics.counters.get(name, 0) + value
+    emit({"type": EVENT_COUNTER, "name": name, "value": value})
+
+def set_value(name, value):
+    if not is_enabled():
+        return
+    metrics = _current
+    if metrics is not None:
+        with metrics.lock:
+            metrics.counters[name] = value
+    emit({"type": EVENT_COUNTER, "name": name, "value": value})
+
+class TimedStream():
+    # a text stream which adds up the seconds spent in write
+    def __init__(self, stream):
+        self.stream = stream
+        self.seconds = 0.0
+
+    def write(self, data):
+        started = time.perf_counter()
+        result = self.stream.write(data)
+        self.seconds += time.perf_counter() - started
+        return result
+
+@contextmanager
+def timed_writes(stream, name):
+    # the seconds spent writing to the stream are added to the counter name, if the run is recorded
+    if _current is None:
+        yield stream
+        return
+    timed = TimedStream(stream)
+    try:
+        yield timed
+    finally:
+        count(name, timed.seconds)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import zlib
+import pickle
+import hashlib
+import tempfile
+import logging
+import onot
+from onot.parsing import spdx_license
+from onot.parsing import license_cache
+
+# On-disk cache of parsed documents.
+#
+# A parsed document (the doc returned by parse_file, with its resolved licenses) is
+# stored as a zlib compressed pickle. The key is the sha256 of the input file, the
+# onot version, the license list version and the merge policy, so a changed input,
+# a new onot or a new license list never hits an old entry.
+#
+# The cache is kept below max_size bytes by removing the least recently used
+# entries; a hit updates the modification time of its entry.
+#
+# Entries are pickles; the cache directory must only be writable by its user, like
+# the license cache next to it.
+
+# bump this when the layout of a doc changes
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".doc"
+HASH_BUFFER_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6
+
+logger = logging.getLogger("root")
+
+def hash_file(file):
+    sha256 = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+class DocCache():
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir if cache_dir else license_cache.default_cache_dir()
+        self.entry_dir = os.path.join(self.cache_dir, "docs", "v" + str(CACHE_FORMAT_VERSION))
+        self.max_size = max_size
+
+    def key(self, file, merge_policy):
+        license_list_version = spdx_license.get_registry().get_license_list_version()
+        parts = [hash_file(file), onot.__version__, str(license_list_version), merge_policy]
+        return hashlib.sha256("\0".join(parts).encode("UTF-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.entry_dir, key + ENTRY_SUFFIX)
+
+    def read(self, key):
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                doc = pickle.loads(zlib.decompress(f.read()))
+            # most recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as ex:
+            logger.warning("could not read the doc cache entry " + path + ": " + str(ex))
+            return None
+        logger.debug("doc cache hit - " + key)
+        return doc
+
+    def write(self, key, doc):
+        data = zlib.compress(pickle.dumps(doc, pickle.HIGHEST_PROTOCOL), COMPRESS_LEVEL)
+        if len(data) > self.max_size:
+            return
+        os.makedirs(self.entry_dir, exist_ok=True)
+        # write to a temporary file first so that readers never see a half written entry
+        fd, temp_path = tempfile.mkstemp(dir=self.entry_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.entry_path(key))
+        except OSError:
+            logger.warning("could not write the doc cache: " + self.entry_dir)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        # remove the least recently used entries until the cache fits in max_size
+        entries = []
+        try:
+            with os.scandir(self.entry_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(ENTRY_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        size = sum(entry[1] for entry in entries)
+        for mtime, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # another process removed it first
+                pass
+            size -= entry_size
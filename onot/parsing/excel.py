@@ -6,7 +6,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import openpyxl
-import pandas as pd
 import logging
 from onot.parsing import parser
 
@@ -37,10 +36,11 @@ logger = logging.getLogger("root")
 
 class Parser(parser.AbstractParser):
 
-    def __init__(self, file):
-        super().__init__()
+    def __init__(self, file, merge_policy=parser.MERGE_POLICY_FIRST_WINS):
+        super().__init__(merge_policy)
         logger.debug("excel Parser class")
-        self.wb = openpyxl.load_workbook(file)
+        # read-only mode streams the rows from the file instead of loading every cell
+        self.wb = openpyxl.load_workbook(file, read_only=True)
 
     def validate_file(self, file):
         # validate file contents : all necessary information should be in the file.
@@ -72,21 +72,41 @@ class Parser(parser.AbstractParser):
             if sheet not in ws_names:
                 raise ValueError("required sheet is not existed: " + sheet)  
 
+    def iter_rows(self, sheet_name, columns):
+        # yield the values of the given columns row by row. empty cells are ''.
+        # the first row of the sheet is the header; rows without any of the columns are skipped.
+        rows = self.wb[sheet_name].iter_rows(values_only=True)
+        header = next(rows, ())
+        column_indexes = {}
+        for index, column in enumerate(header):
+            column_indexes.setdefault(column, index)
+        # validate necessary columns are existed
+        for column in columns:
+            if column not in column_indexes:
+                raise ValueError("required column is not existed: " + column)
+        indexes = [column_indexes[column] for column in columns]
+
+        for row in rows:
+            values = [row[index] if index < len(row) else None for index in indexes]
+            if all(value is None for value in values):
+                continue
+            yield ['' if value is None else value for value in values]
+
     def document_info(self):
-        sheet = self.wb.get_sheet_by_name(SHEET_DOCUMENT_INFO)
-        df = pd.DataFrame(sheet.values)
-        df.columns = df.iloc[0, :]
-        df = df.iloc[1:, :]
-        
+        document_name = None
+        creator_info = []
+        for name, creator in self.iter_rows(SHEET_DOCUMENT_INFO, [COLUMN_DOCUMENT_NAME, COLUMN_CREATOR]):
+            if document_name is None:
+                document_name = name
+            creator_info.append(creator)
+
         # get document name
-        document_name = df.loc[:, COLUMN_DOCUMENT_NAME].values.tolist()
-        if document_name[0] is not None:
-            self.doc["name"] = document_name[0]
+        if document_name:
+            self.doc["name"] = document_name
         else:
             raise ValueError("required value is not existed: " + COLUMN_DOCUMENT_NAME) 
         
         # get organization & email 
-        creator_info = df.loc[:, COLUMN_CREATOR].values.tolist()
         creation_info = {}
         for creator in creator_info:
             if 'Organization' in creator:
@@ -103,84 +123,39 @@ class Parser(parser.AbstractParser):
         if "creationInfo" not in self.doc:
             raise ValueError("Organization info is not existed in the " + SHEET_DOCUMENT_INFO) 
 
-    def package_info(self):
-        sheet = self.wb.get_sheet_by_name(SHEET_PACKAGE_INFO)
-        df = pd.DataFrame(sheet.values)
-        df.columns = df.iloc[0, :]
-        df = df.iloc[1:, :]
-        
+    def iter_packages(self):
         # get package info
-        # validate necessary columns are existed
-        if COLUMN_PACKAGE_NAME not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_PACKAGE_NAME) 
-        if COLUMN_PACKAGE_VERSION not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_PACKAGE_VERSION) 
-        if COLUMN_LICENSE_CONCLUDED not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_LICENSE_CONCLUDED) 
-        if COLUMN_LICENSE_DECLARED not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_LICENSE_DECLARED) 
-        if COLUMN_PACKAGE_COPYRIGHT_TEXT not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_PACKAGE_COPYRIGHT_TEXT) 
-        if COLUMN_PACKAGE_DOWNLOAD_LOCATION not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_PACKAGE_DOWNLOAD_LOCATION) 
-
-        package_info_list = df.loc[:, 
-            [
+        for package_info in self.iter_rows(SHEET_PACKAGE_INFO, [
                 COLUMN_PACKAGE_NAME, 
                 COLUMN_PACKAGE_VERSION,
                 COLUMN_LICENSE_CONCLUDED,
                 COLUMN_LICENSE_DECLARED,
                 COLUMN_PACKAGE_COPYRIGHT_TEXT,
                 COLUMN_PACKAGE_DOWNLOAD_LOCATION,
-                ]].values.tolist()
-        self.packages = []
-        for package_info in package_info_list:
-            # None check
-            for index, value in enumerate(package_info):
-                if value is None:
-                    package_info[index] = ''
-            package = {
+                ]):
+            yield {
                 "name": package_info[0],
                 "versionInfo": str(package_info[1]),
                 "licenseConcluded": self.remove_enclosed_parentheses(package_info[2]),
                 "licenseDeclared": self.remove_enclosed_parentheses(package_info[3]),
                 "copyrightText": package_info[4],
-                "downloadLocation": package_info[5].replace("\"", ""),
+                "downloadLocation": str(package_info[5]).replace("\"", ""),
             }
+
+    def package_info(self):
+        for package in self.iter_packages():
             self.append_package(package)
 
-    def per_file_info(self):
-        sheet = self.wb.get_sheet_by_name(SHEET_PER_FILE_INFO)
-        df = pd.DataFrame(sheet.values)
-        df.columns = df.iloc[0, :]
-        df = df.iloc[1:, :]
-
-        if COLUMN_FILE_NAME not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_FILE_NAME)
-        if COLUMN_LICENSE_CONCLUDED not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_LICENSE_CONCLUDED)
-        if COLUMN_LICENSE_INFO_IN_FILE not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_LICENSE_INFO_IN_FILE)
-        if COLUMN_FILE_COPYRIGHT_TEXT not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_FILE_COPYRIGHT_TEXT)
-        if COLUMN_ARTIFACT_OF_HOMEPAGE not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_ARTIFACT_OF_HOMEPAGE)
-
-        per_file_info_list = df.loc[:,
-            [
+    def iter_file_packages(self):
+        for per_file_info in self.iter_rows(SHEET_PER_FILE_INFO, [
                 COLUMN_FILE_NAME,
                 COLUMN_LICENSE_CONCLUDED,
                 COLUMN_LICENSE_INFO_IN_FILE,
                 COLUMN_FILE_COPYRIGHT_TEXT,
                 COLUMN_ARTIFACT_OF_HOMEPAGE
-            ]].values.tolist()
-        for per_file_info in per_file_info_list:
-            for index, value in enumerate(per_file_info):
-                if value is None:
-                    per_file_info[index] = ''
-
+            ]):
             package_name, package_version = self.extract_package_name_and_package_version(per_file_info[0])
-            package = {
+            yield {
                 "name": package_name,
                 "versionInfo": str(package_version),
                 "licenseConcluded": self.remove_enclosed_parentheses(per_file_info[1]),
@@ -188,38 +163,27 @@ class Parser(parser.AbstractParser):
                 "copyrightText": per_file_info[3],
                 "downloadLocation": str(per_file_info[4]).replace("\"", "")
             }
+
+    def per_file_info(self):
+        for package in self.iter_file_packages():
             self.append_package(package)
 
     def extracted_license_info(self):
-        sheet = self.wb.get_sheet_by_name(SHEET_EXTRACTED_LICENSE_INFO)
-        df = pd.DataFrame(sheet.values)
-        df.columns = df.iloc[0, :]
-        df = df.iloc[1:, :]
-        
-        # get package info
-        # validate necessary columns are existed
-        if COLUMN_IDENTIFIER not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_IDENTIFIER) 
-        if COLUMN_EXTRACTED_TEXT not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_EXTRACTED_TEXT) 
-        if COLUMN_LICENSE_NAME not in df.columns:
-            raise ValueError("required column is not existed: " + COLUMN_LICENSE_NAME) 
-        
-        extracted_license_list = df.loc[:, 
-            [
+        for extracted_license_info in self.iter_rows(SHEET_EXTRACTED_LICENSE_INFO, [
                 COLUMN_IDENTIFIER, 
                 COLUMN_EXTRACTED_TEXT,
                 COLUMN_LICENSE_NAME,
-                ]].values.tolist()
-        self.extracted_licenses = []
-        for extracted_license_info in extracted_license_list:
-            for index, value in enumerate(extracted_license_info):
-                if value is None:
-                    extracted_license_info[index] = ''
-
+                ]):
             extracted_license = {
                 "identifier": extracted_license_info[0],
                 "extractedText": extracted_license_info[1],
                 "licenseName": extracted_license_info[2],
             }
             self.doc["extracted_license"].append(extracted_license)
+
+    def parse(self, file):
+        try:
+            return super().parse(file)
+        finally:
+            # a read-only workbook keeps the file open until it is closed
+            self.wb.close()
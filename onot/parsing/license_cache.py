@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import logging
+
+# bump this when the layout of a cache entry changes. entries of other versions are ignored.
+CACHE_FORMAT_VERSION = 1
+# seconds a cached document is used without asking spdx.org whether it has changed
+DEFAULT_TTL = 24 * 60 * 60
+
+logger = logging.getLogger("root")
+
+class LicenseNotCachedError(Exception):
+    # raised in offline mode when a document has never been downloaded
+    pass
+
+def default_cache_dir():
+    if os.environ.get("ONOT_CACHE_DIR"):
+        return os.environ["ONOT_CACHE_DIR"]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "onot")
+
+class LicenseCache():
+    # on-disk cache of the json documents downloaded from spdx.org
+    # (license list, exception list and the details of each license).
+    # one file per url: {"version", "url", "fetched_at", "etag", "last_modified", "body"}
+
+    def __init__(self, cache_dir=None, ttl=DEFAULT_TTL, offline=False):
+        self.cache_dir = cache_dir if cache_dir else default_cache_dir()
+        self.entry_dir = os.path.join(self.cache_dir, "v" + str(CACHE_FORMAT_VERSION))
+        self.ttl = ttl
+        self.offline = offline
+
+    def entry_path(self, url):
+        return os.path.join(self.entry_dir, hashlib.sha1(url.encode("UTF-8")).hexdigest() + ".json")
+
+    def read(self, url):
+        try:
+            with open(self.entry_path(url), "r", encoding="UTF-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_FORMAT_VERSION or entry.get("url") != url:
+            return None
+        return entry
+
+    def write(self, url, body, etag=None, last_modified=None):
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body
+        }
+        os.makedirs(self.entry_dir, exist_ok=True)
+        # write to a temporary file first so that readers never see a half written entry
+        fd, temp_path = tempfile.mkstemp(dir=self.entry_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="UTF-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self.entry_path(url))
+        except OSError:
+            logger.warning("could not write the license cache: " + self.entry_dir)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return entry
+
+    def touch(self, entry):
+        # the document has not changed on the server; start a new ttl period
+        return self.write(entry["url"], entry["body"], entry["etag"], entry["last_modified"])
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def validation_headers(self, entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def miss(self, url):
+        return LicenseNotCachedError(
+            "offline mode: " + url + " is not in the license cache (" + self.cache_dir + "). "
+            "Run onot once without --offline to fill the cache.")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+# Bundled snapshot of the SPDX license list for hosts which cannot reach spdx.org.
+#
+# The snapshot is a single binary file opened with mmap. Nothing is read at startup
+# except the header; a lookup binary-searches the fixed size index records and
+# decompresses only the license text it needs.
+#
+#   header  : magic, format version, record count, index offset, meta offset, meta length
+#   meta    : json {"licenseListVersion", "releaseDate"}
+#   index   : records sorted by key (lower-cased license id, NUL padded)
+#             key, data offset, data length, flags
+#   data    : zlib compressed json per license {"licenseId", "name", "licenseText"}
+
+import os
+import json
+import mmap
+import zlib
+import struct
+import logging
+
+MAGIC = b"ONOTLDB\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQI")
+KEY_SIZE = 64
+RECORD = struct.Struct("<" + str(KEY_SIZE) + "sQIB3x")
+
+FLAG_EXCEPTION = 1
+FLAG_DEPRECATED = 2
+
+BUNDLED_DATABASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "spdx_licenses.db")
+
+logger = logging.getLogger("root")
+
+def make_key(license_id):
+    key = str(license_id).lower().encode("UTF-8")
+    if len(key) > KEY_SIZE:
+        return None
+    return key.ljust(KEY_SIZE, b"\0")
+
+class LicenseDatabase():
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.index_offset, meta_offset, meta_length = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError("not a license database: " + path)
+        if version != FORMAT_VERSION:
+            raise ValueError("unsupported license database version " + str(version) + ": " + path)
+        meta = json.loads(self.mm[meta_offset:meta_offset + meta_length].decode("UTF-8"))
+        self.license_list_version = meta.get("licenseListVersion")
+        self.release_date = meta.get("releaseDate")
+
+    def find(self, license_id):
+        # binary search of the index; returns (offset, length, flags) or None
+        key = make_key(license_id)
+        if key is None:
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, offset, length, flags = RECORD.unpack_from(self.mm, self.index_offset + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return offset, length, flags
+        return None
+
+    def is_known(self, license_id):
+        return self.find(license_id) is not None
+
+    def is_exception(self, license_id):
+        record = self.find(license_id)
+        return record is not None and bool(record[2] & FLAG_EXCEPTION)
+
+    def is_deprecated(self, license_id):
+        record = self.find(license_id)
+        return record is not None and bool(record[2] & FLAG_DEPRECATED)
+
+    def get(self, license_id):
+        # the license details in the form of SPDX_License.get_spdx_license_details, or None
+        record = self.find(license_id)
+        if record is None:
+            return None
+        offset, length, flags = record
+        details = json.loads(zlib.decompress(self.mm[offset:offset + length]).decode("UTF-8"))
+        details["licenseTextHtml"] = None
+        details["isDeprecatedLicenseId"] = bool(flags & FLAG_DEPRECATED)
+        return details
+
+    def close(self):
+        self.mm.close()
+
+def open_bundled(path=BUNDLED_DATABASE_PATH):
+    # the license database shipped with onot, or None if this build has none
+    if not os.path.exists(path):
+        return None
+    try:
+        return LicenseDatabase(path)
+    except (OSError, ValueError) as ex:
+        logger.warning("could not open the bundled license database: " + str(ex))
+        return None
+
+def build(source, output):
+    # build the database from a checkout of https://github.com/spdx/license-list-data
+    json_dir = os.path.join(source, "json")
+    with open(os.path.join(json_dir, "licenses.json"), "r", encoding="UTF-8") as f:
+        license_list = json.load(f)
+    with open(os.path.join(json_dir, "exceptions.json"), "r", encoding="UTF-8") as f:
+        exception_list = json.load(f)
+
+    entries = []
+    for spdx_license in license_list["licenses"]:
+        license_id = spdx_license["licenseId"]
+        flags = FLAG_DEPRECATED if spdx_license.get("isDeprecatedLicenseId") else 0
+        entries.append((license_id, os.path.join(json_dir, "details", license_id + ".json"), "licenseText", flags))
+    for spdx_license_exception in exception_list["exceptions"]:
+        license_id = spdx_license_exception["licenseExceptionId"]
+        flags = FLAG_EXCEPTION | (FLAG_DEPRECATED if spdx_license_exception.get("isDeprecatedLicenseId") else 0)
+        entries.append((license_id, os.path.join(json_dir, "exceptions", license_id + ".json"), "licenseExceptionText", flags))
+
+    records = []
+    for license_id, details_path, text_key, flags in entries:
+        key = make_key(license_id)
+        if key is None:
+            raise ValueError("license id is too long for the license database: " + license_id)
+        with open(details_path, "r", encoding="UTF-8") as f:
+            details = json.load(f)
+        data = zlib.compress(json.dumps({
+            "licenseId": license_id,
+            "name": details["name"],
+            "licenseText": details[text_key]
+        }).encode("UTF-8"), 9)
+        records.append((key, data, flags))
+    records.sort(key=lambda record: record[0])
+
+    meta = json.dumps({
+        "licenseListVersion": license_list.get("licenseListVersion"),
+        "releaseDate": license_list.get("releaseDate")
+    }).encode("UTF-8")
+    meta_offset = HEADER.size
+    index_offset = meta_offset + len(meta)
+    data_offset = index_offset + len(records) * RECORD.size
+
+    output_dir = os.path.dirname(os.path.abspath(output))
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    temp_output = output + ".tmp"
+    with open(temp_output, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(records), index_offset, meta_offset, len(meta)))
+        f.write(meta)
+        offset = data_offset
+        for key, data, flags in records:
+            f.write(RECORD.pack(key, offset, len(data), flags))
+            offset += len(data)
+        for key, data, flags in records:
+            f.write(data)
+    os.replace(temp_output, output)
+    logger.debug("license database - " + str(len(records)) + " licenses, version " + str(license_list.get("licenseListVersion")))
+    return output
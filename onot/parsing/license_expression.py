@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+from functools import lru_cache
+
+# Parser of SPDX license expressions, e.g. "(MIT OR Apache-2.0) AND GPL-2.0-only WITH Classpath-exception-2.0".
+#
+#   expression := and ("OR" and)*
+#   and        := with ("AND" with)*
+#   with       := primary ("WITH" license)?
+#   primary    := "(" expression ")" | license
+#
+# Operators are whole upper case words, so license ids which merely contain them
+# (LicenseRef-CORE, ANDROID-SDK) are ids. Like the spdx tools, onot is lenient with
+# names which are not ids: words following each other without an operator are one
+# license ("Apache License 2.0").
+#
+# parse() is memoized; the expressions of a document are few and repeat across
+# thousands of packages. The returned objects are shared and must not be changed.
+
+OPERATOR_AND = "AND"
+OPERATOR_OR = "OR"
+OPERATOR_WITH = "WITH"
+OPERATORS = [OPERATOR_AND, OPERATOR_OR, OPERATOR_WITH]
+
+TOKEN_LEFT_PARENTHESIS = "("
+TOKEN_RIGHT_PARENTHESIS = ")"
+TOKEN_OPERATOR = "operator"
+TOKEN_WORD = "word"
+
+# distinct expressions kept by parse()
+CACHE_SIZE = 4096
+
+TOKEN = re.compile(r"\(|\)|[^\s()]+")
+
+class Token():
+    def __init__(self, kind, value, start, end):
+        self.kind = kind
+        self.value = value
+        # position in the expression
+        self.start = start
+        self.end = end
+        # the License of a word token
+        self.license = None
+
+class License():
+    # a license id; license refers to the tokens of its words
+    def __init__(self, id, tokens):
+        self.id = id
+        self.tokens = tokens
+
+    def __str__(self):
+        return self.id
+
+class With():
+    def __init__(self, license, exception):
+        self.license = license
+        self.exception = exception
+
+    def __str__(self):
+        return str(self.license) + " " + OPERATOR_WITH + " " + str(self.exception)
+
+class Compound():
+    # operands joined by AND or OR
+    def __init__(self, operator, operands):
+        self.operator = operator
+        self.operands = operands
+
+    def __str__(self):
+        return (" " + self.operator + " ").join(
+            "(" + str(operand) + ")" if isinstance(operand, Compound) else str(operand)
+            for operand in self.operands)
+
+class LicenseExpression():
+    def __init__(self, text, tokens, root):
+        self.text = text
+        self.tokens = tokens
+        self.root = root
+        # ids of the licenses and exceptions in the order of appearance, without duplicates
+        licenses = {}
+        for token in tokens:
+            if token.kind == TOKEN_WORD:
+                licenses.setdefault(token.license.id)
+        self.licenses = tuple(licenses)
+
+    def __str__(self):
+        return str(self.root)
+
+def tokenize(text):
+    tokens = []
+    for match in TOKEN.finditer(text):
+        value = match.group()
+        if value == TOKEN_LEFT_PARENTHESIS or value == TOKEN_RIGHT_PARENTHESIS:
+            kind = value
+        elif value in OPERATORS:
+            kind = TOKEN_OPERATOR
+        else:
+            kind = TOKEN_WORD
+        tokens.append(Token(kind, value, match.start(), match.end()))
+    return tokens
+
+class ExpressionParser():
+    # recursive descent over the tokens of one expression
+    def __init__(self, text, tokens):
+        self.text = text
+        self.tokens = tokens
+        self.pos = 0
+
+    def error(self, message):
+        return ValueError("invalid license expression (" + message + "): " + self.text)
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def accept_operator(self, operator):
+        token = self.peek()
+        if token is not None and token.kind == TOKEN_OPERATOR and token.value == operator:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        if not self.tokens:
+            raise self.error("empty")
+        root = self.expression()
+        token = self.peek()
+        if token is not None:
+            raise self.error("unexpected '" + token.value + "' at " + str(token.start))
+        return root
+
+    def expression(self):
+        return self.compound(OPERATOR_OR, self.conjunction)
+
+    def conjunction(self):
+        return self.compound(OPERATOR_AND, self.with_exception)
+
+    def compound(self, operator, operand):
+        operands = [operand()]
+        while self.accept_operator(operator):
+            operands.append(operand())
+        return operands[0] if len(operands) == 1 else Compound(operator, operands)
+
+    def with_exception(self):
+        license = self.primary()
+        if self.accept_operator(OPERATOR_WITH):
+            return With(license, self.license())
+        return license
+
+    def primary(self):
+        token = self.peek()
+        if token is not None and token.kind == TOKEN_LEFT_PARENTHESIS:
+            self.pos += 1
+            expression = self.expression()
+            token = self.peek()
+            if token is None or token.kind != TOKEN_RIGHT_PARENTHESIS:
+                raise self.error("')' is missing")
+            self.pos += 1
+            return expression
+        return self.license()
+
+    def license(self):
+        words = []
+        while self.peek() is not None and self.peek().kind == TOKEN_WORD:
+            words.append(self.peek())
+            self.pos += 1
+        if not words:
+            token = self.peek()
+            raise self.error("license is missing" + (" before '" + token.value + "' at " + str(token.start) if token is not None else " at the end"))
+        license = License(" ".join(word.value for word in words), words)
+        for word in words:
+            word.license = license
+        return license
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse(text):
+    # text -> LicenseExpression; raises ValueError if the text is not a license expression
+    tokens = tokenize(text)
+    return LicenseExpression(text, tokens, ExpressionParser(text, tokens).parse())
+
+def strip_enclosing_parentheses(text):
+    # "(MIT OR Apache-2.0)" -> "MIT OR Apache-2.0", but "(MIT) AND (Apache-2.0)" stays as it is
+    if not (text.startswith("(") and text.endswith(")")):
+        return text
+    depth = 0
+    for index, character in enumerate(text):
+        if character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+            if depth == 0:
+                # the first parenthesis closes here; it encloses everything only if this is the end
+                return text[1:-1] if index == len(text) - 1 else text
+    return text
@@ -3,23 +3,186 @@
 # SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import re
 import logging
-from onot.parsing import excel
-from onot.parsing import rdf_xml
+import importlib
+from onot.parsing import parser
+from onot.log import metrics
+
+# Registry of the input formats.
+#
+# A format is a module with a Parser(file, merge_policy) class (see parser.AbstractParser).
+# The module is imported only when a file of that format is parsed, so running onot
+# on an Excel file never imports rdflib and the other way round.
+#
+# The format of a file is detected from its first bytes (sniff) and, if no format
+# recognizes them, from its suffix. Formats of other packages are registered with
+# register_parser or with an entry point of the "onot.parsers" group, which names
+# a module with Parser and optionally SUFFIXES (list of file suffixes) and
+# sniff(head) (True if the first bytes of a file are of the format). They are tried
+# before the built-in formats, by contents and by suffix, so a plugin for e.g.
+# .cdx.json files is not shadowed by the generic JSON sniff.
+
+ENTRY_POINT_GROUP = "onot.parsers"
+
+# bytes read from the start of a file to detect its format
+SNIFF_SIZE = 4096
+
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+UTF8_BOM = b"\xef\xbb\xbf"
+RDF_NAMESPACE = b"http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+TAG_VALUE_VERSION = re.compile(rb"^SPDXVersion:", re.MULTILINE)
 
 logger = logging.getLogger("root")
 
-def parse_file(infile):
-    logger.debug("parse_file - " + infile)
-    if infile.endswith(".xls") or infile.endswith(".xlsx"):
-        parsing_module = excel
-    elif infile.endswith(".rdf") or infile.endswith(".rdf.xml"):
-        parsing_module = rdf_xml
-    else:
+def strip_head(head):
+    if head.startswith(UTF8_BOM):
+        head = head[len(UTF8_BOM):]
+    return head.lstrip()
+
+def sniff_excel(head):
+    # xlsx is a zip archive, xls an OLE compound document
+    return head.startswith(ZIP_MAGIC) or head.startswith(OLE_MAGIC)
+
+def sniff_rdf_xml(head):
+    head = strip_head(head)
+    return head.startswith(b"<") and (b"rdf:RDF" in head or RDF_NAMESPACE in head)
+
+def sniff_spdx_json(head):
+    return strip_head(head).startswith(b"{")
+
+def sniff_tag_value(head):
+    return TAG_VALUE_VERSION.search(strip_head(head)) is not None
+
+class ParserEntry():
+    def __init__(self, name, module, suffixes, sniff, builtin=False):
+        self.name = name
+        # module name, imported on first use, or the module itself
+        self.module = module
+        self.suffixes = list(suffixes)
+        self.sniff = sniff
+        self.builtin = builtin
+
+    def load(self):
+        if isinstance(self.module, str):
+            logger.debug("import parser - " + self.module)
+            self.module = importlib.import_module(self.module)
+        return self.module
+
+# the formats in the order they are tried
+_parsers = []
+_entry_points_loaded = False
+
+def register_parser(name, module, suffixes=(), sniff=None, builtin=False):
+    # module: module name or module with a Parser class
+    # suffixes: file suffixes of the format, e.g. [".cdx.json"]
+    # sniff: function of the first bytes of a file, True if they are of the format
+    # formats registered later are tried first, so a format can take over the files of another one.
+    unregister_parser(name)
+    _parsers.insert(0, ParserEntry(name, module, suffixes, sniff, builtin))
+
+def unregister_parser(name):
+    _parsers[:] = [entry for entry in _parsers if entry.name != name]
+
+def load_entry_points():
+    # formats installed by other packages; loaded once, before the first file is parsed
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return
+    eps = entry_points()
+    eps = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+    for ep in eps:
+        try:
+            module = ep.load()
+        except Exception as ex:
+            logger.warning("could not load the parser " + ep.name + ": " + str(ex))
+            continue
+        register_parser(ep.name, module, getattr(module, "SUFFIXES", ()), getattr(module, "sniff", None))
+
+def read_head(infile):
+    try:
+        with open(infile, "rb") as f:
+            return f.read(SNIFF_SIZE)
+    except OSError:
+        return None
+
+def find_parser(infile, head, entries):
+    if head is not None:
+        for entry in entries:
+            if entry.sniff is not None and entry.sniff(head):
+                return entry
+    name = os.path.basename(infile).lower()
+    for entry in entries:
+        for suffix in entry.suffixes:
+            if name.endswith(suffix):
+                return entry
+    return None
+
+def get_parser(infile):
+    # the format of the file, from its contents or else from its suffix;
+    # registered formats first, then the built-in ones
+    load_entry_points()
+    head = read_head(infile)
+    entry = find_parser(infile, head, [entry for entry in _parsers if not entry.builtin])
+    if entry is None:
+        entry = find_parser(infile, head, [entry for entry in _parsers if entry.builtin])
+    if entry is None:
         raise Exception("FileType Not Supported: " + str(infile))
+    logger.debug("parser - " + entry.name)
+    return entry.load()
+
+def load_parsers():
+    # import every registered format now instead of on first use, e.g. before a server takes requests
+    load_entry_points()
+    for entry in _parsers:
+        try:
+            entry.load()
+        except ImportError as ex:
+            logger.warning("could not load the parser " + entry.name + ": " + str(ex))
+
+def supported_suffixes():
+    # file suffixes of every registered format, e.g. to pick the inputs out of a directory
+    load_entry_points()
+    suffixes = []
+    for entry in _parsers:
+        for suffix in entry.suffixes:
+            if suffix not in suffixes:
+                suffixes.append(suffix)
+    return suffixes
 
-    p = parsing_module.Parser(infile)
-    return p.parse(infile)
+def parse_file(infile, merge_policy=parser.MERGE_POLICY_FIRST_WINS, doc_cache=None):
+    # doc_cache: doc_cache.DocCache; an unchanged file is not parsed again
+    logger.debug("parse_file - " + infile)
+    with metrics.stage("parse"):
+        doc = None
+        if doc_cache is not None:
+            with metrics.stage("doc_cache.read"):
+                key = doc_cache.key(infile, merge_policy)
+                doc = doc_cache.read(key)
+            metrics.count("doc_cache.hits" if doc is not None else "doc_cache.misses")
+        if doc is None:
+            parsing_module = get_parser(infile)
+            p = parsing_module.Parser(infile, merge_policy)
+            doc = p.parse(infile)
+            if doc_cache is not None:
+                with metrics.stage("doc_cache.write"):
+                    doc_cache.write(key, doc)
+    metrics.set_value("packages", len(doc["packages"]))
+    metrics.set_value("licenses", len(doc["licenses"]))
+    return doc
     # with open(infile) as f:
     #     return p.parse(f)
-    
\ No newline at end of file
+
+# built-in formats; the rdf/xml streaming parser falls back to the rdflib based rdf_xml.Parser
+# for serializations it does not read
+register_parser("tag-value", "onot.parsing.tag_value", [".spdx"], sniff_tag_value, builtin=True)
+register_parser("json", "onot.parsing.spdx_json", [".json"], sniff_spdx_json, builtin=True)
+register_parser("rdf-xml", "onot.parsing.rdf_xml_stream", [".rdf", ".rdf.xml"], sniff_rdf_xml, builtin=True)
+register_parser("excel", "onot.parsing.excel", [".xls", ".xlsx"], sniff_excel, builtin=True)
@@ -10,18 +10,38 @@ import re
 from abc import abstractmethod, ABC
 import logging
 from onot.parsing import spdx_license
+from onot.parsing import license_expression
+from onot.log import metrics
+
+# what append_package does with a package whose name and version were already appended
+MERGE_POLICY_FIRST_WINS = "first-wins"          # keep the first one, drop the later ones
+MERGE_POLICY_MERGE_LICENSES = "merge-licenses"  # keep the first one, AND the licenses of the later ones into it
+MERGE_POLICY_LAST_WINS = "last-wins"            # replace it with the later one, at the position of the first one
+MERGE_POLICIES = [MERGE_POLICY_FIRST_WINS, MERGE_POLICY_MERGE_LICENSES, MERGE_POLICY_LAST_WINS]
+
+# license values which name no license; a package with only these has no license text in the notice
+NO_LICENSES = ["NOASSERTION", "NONE"]
 
 logger = logging.getLogger("root")
 
 class AbstractParser(ABC):
 
-    def __init__(self):
+    def __init__(self, merge_policy=MERGE_POLICY_FIRST_WINS):
+        if merge_policy not in MERGE_POLICIES:
+            raise ValueError("unknown merge policy: " + str(merge_policy))
+        self.merge_policy = merge_policy
         self.doc = {
             "name": "",
             "creation_info": {},
             "packages": [],
             "extracted_license": []
         }
+        # (name, versionInfo) -> index of the package in self.doc["packages"]
+        self.package_index = {}
+        # (name, versionInfo) -> {license field: distinct license expressions merged so far}
+        self.merged_licenses = {}
+        # identifier -> extracted license (see get_extracted_license)
+        self.extracted_license_index = None
 
     @abstractmethod
     def validate_file(self):
@@ -49,9 +69,29 @@ class AbstractParser(ABC):
 
     def append_package(self, package_to_be_appended):
         # Check if there are duplicate packages already appended
-        if any(package["name"] == package_to_be_appended["name"] and package["versionInfo"] == package_to_be_appended["versionInfo"] for package in self.doc["packages"]):
-            return
-        self.doc["packages"].append(package_to_be_appended)
+        key = (str(package_to_be_appended["name"]), str(package_to_be_appended["versionInfo"]))
+        index = self.package_index.get(key)
+        if index is None:
+            self.package_index[key] = len(self.doc["packages"])
+            self.doc["packages"].append(package_to_be_appended)
+        elif self.merge_policy == MERGE_POLICY_LAST_WINS:
+            self.doc["packages"][index] = package_to_be_appended
+        elif self.merge_policy == MERGE_POLICY_MERGE_LICENSES:
+            self.merge_package_licenses(key, self.doc["packages"][index], package_to_be_appended)
+
+    def merge_package_licenses(self, key, package, package_to_be_merged):
+        merged = self.merged_licenses.setdefault(key, {})
+        for field in ["licenseConcluded", "licenseDeclared"]:
+            expressions = merged.setdefault(field, [package[field]] if package[field] else [])
+            expression = package_to_be_merged[field]
+            if not expression or expression in expressions:
+                continue
+            expressions.append(expression)
+            if len(expressions) == 1:
+                package[field] = expression
+            else:
+                # (A OR B) AND C
+                package[field] = " AND ".join("(" + e + ")" if " " in str(e) else str(e) for e in expressions)
 
     def extract_package_name_and_package_version(self, filename):
         def remove_meaningless_word(_filename):
@@ -71,104 +111,128 @@ class AbstractParser(ABC):
 
     def remove_enclosed_parentheses(self, expression):
         # if the overall expression is enclosed in parentheses, remove the parentheses.
-        if str(expression).startswith("(") and str(expression).endswith(")"):
-            return expression[1:len(expression)-1]
+        if isinstance(expression, str):
+            return license_expression.strip_enclosing_parentheses(expression)
         return expression
 
-    def parse_license_expression(self, license_expression):
-        license_names = re.split(r'OR|AND|WITH', str(license_expression))
-        # remove (, ), blank
-        return list(map(lambda license: license.replace("(", "").replace(")", "").strip(), license_names))
+    def parse_license_expression(self, expression):
+        # the licenses and exceptions of the expression
+        return list(license_expression.parse(str(expression)).licenses)
 
     def add_package_info_if_license_exist(self, license_name, package_name, package_version):
-        # then, update data just to add package info
-        for index, license in enumerate(self.licenses):
-            if license["licenseId"] == license_name:
-                # then, update data just to add package info
-                target_license = license
-                target_package = license['packages']
-                target_package.append((package_name, package_version))
-                target_license['packages'] = target_package
-                self.licenses[index] = target_license
-                return True
-        return False
+        license = self.license_index.get(license_name)
+        if license is None:
+            return False
+        # then, update data just to add package info (once per package, in the order of appearance)
+        self.license_packages[license["licenseId"]].setdefault((package_name, package_version))
+        return True
+
+    def get_extracted_license(self, identifier):
+        # identifier -> the first extracted license of that identifier
+        if self.extracted_license_index is None:
+            self.extracted_license_index = {}
+            for extracted_license in self.doc['extracted_license']:
+                self.extracted_license_index.setdefault(extracted_license['identifier'], extracted_license)
+        return self.extracted_license_index.get(identifier)
 
     def get_details_license(self, license_name):
-        sl = spdx_license.SPDX_License()
+        sl = spdx_license.get_registry()
 
         # check whether the licenseId is existed in the spdx license list
-        details_url = sl.get_spdx_license_detailsUrl(license_name)
-        logger.debug(str(details_url))
-        if details_url is not None:
-            # if so, get the license text from spdx repo : "https://spdx.org/licenses/[LICENSE_ID].json"
-            details_license = sl.get_spdx_license_details(details_url)
-        else:
+        # if so, get the license text from spdx repo : "https://spdx.org/licenses/[LICENSE_ID].json"
+        # (or from the license cache / the bundled license database)
+        details_license = sl.get_license(license_name)
+        if details_license is None:
             # check the license is in the Extracted License Info sheet
-            existed_in_extracted_license = False
-            for index, extracted_license in enumerate(self.doc['extracted_license']):
-                if extracted_license['identifier'] == license_name:
-                    details_license = {
-                        'licenseId': extracted_license['identifier'],
-                        'name': extracted_license['licenseName'],
-                        'licenseText': extracted_license['extractedText'],
-                        'licenseTextHtml': None
-                    }
-                    existed_in_extracted_license = True
-                    break
-            if existed_in_extracted_license is False:
+            extracted_license = self.get_extracted_license(license_name)
+            if extracted_license is None:
                 raise ValueError("This license is not in the spdx license list. then it should be in the Extracted License Info sheet: " + license_name)
-
-                # Check if there are duplicate licenses already appended
+            details_license = {
+                'licenseId': extracted_license['identifier'],
+                'name': extracted_license['licenseName'],
+                'licenseText': extracted_license['extractedText'],
+                'licenseTextHtml': None
+            }
         return details_license
 
-    def append_details_license(self, detalis_license, package_name, package_version):
-        packages = []
-        packages.append((package_name, package_version))
-        license = {
-            "name": detalis_license['name'],
-            "licenseId": detalis_license['licenseId'],
-            "packages": packages,
-            "licenseText": detalis_license['licenseText'],
-            "licenseTextHtml": detalis_license['licenseTextHtml']
-        }
-        self.licenses.append(license)
+    def append_details_license(self, detalis_license, package_name, package_version, license_name=None):
+        license_id = detalis_license['licenseId']
+        license = self.licenses_by_id.get(license_id)
+        if license is None:
+            license = {
+                "name": detalis_license['name'],
+                "licenseId": license_id,
+                "packages": [],
+                "licenseText": detalis_license['licenseText'],
+                "licenseTextHtml": detalis_license['licenseTextHtml']
+            }
+            self.licenses.append(license)
+            self.licenses_by_id[license_id] = license
+            self.license_packages[license_id] = {}
+        # license names are matched case-insensitively (e.g. "mit" and "MIT" are the same license)
+        self.license_index[license_id] = license
+        if license_name is not None:
+            self.license_index[license_name] = license
+        self.license_packages[license_id].setdefault((package_name, package_version))
 
     def license_info(self):
         self.licenses = []
-
-        # get necessary license info
+        # license name as written in the expressions / licenseId -> license in self.licenses
+        self.license_index = {}
+        self.licenses_by_id = {}
+        # licenseId -> packages of the license; a dict keeps the order and drops duplicates
+        self.license_packages = {}
+        self.extracted_license_index = None
+
+        # collect the licenses of every package first
+        package_licenses = []
+        unique_license_names = {}
         for package in self.doc["packages"]:
             package_name = package["name"]
             package_version = str(package["versionInfo"])
-            license_expression = package["licenseConcluded"]
-            if license_expression is None:
-                license_expression = package["licenseDeclared"]
+            expression = package["licenseConcluded"]
+            if expression is None or str(expression).strip() in NO_LICENSES:
+                expression = package["licenseDeclared"]
+
+            license_names = [license_name for license_name in self.parse_license_expression(expression)
+                             if license_name not in NO_LICENSES]
+            package_licenses.append((package_name, package_version, license_names))
+            unique_license_names.update(dict.fromkeys(license_names))
 
-            license_names = self.parse_license_expression(license_expression)
+        # download the details of the spdx licenses at once
+        spdx_license.get_registry().prefetch(unique_license_names)
+
+        # get necessary license info
+        for package_name, package_version, license_names in package_licenses:
             for license_name in license_names:
                 if self.add_package_info_if_license_exist(license_name, package_name, package_version) is False:
                     details_license = self.get_details_license(license_name)
-                    self.append_details_license(details_license, package_name, package_version)
+                    self.append_details_license(details_license, package_name, package_version, license_name)
 
+        for license in self.licenses:
+            license["packages"] = list(self.license_packages[license["licenseId"]])
         self.doc["licenses"] = self.licenses
 
 
     def load_doc(self, file):
 
-        # Document info
-        self.document_info()
+        # the streaming parsers read the whole document in document_info
+        with metrics.stage("read"):
+            # Document info
+            self.document_info()
 
-        # Package info
-        self.package_info()
+            # Package info
+            self.package_info()
 
-        # Per File Info
-        self.per_file_info()
+            # Per File Info
+            self.per_file_info()
 
-        # Extracted License Info
-        self.extracted_license_info()
+            # Extracted License Info
+            self.extracted_license_info()
 
         # License info
-        self.license_info()
+        with metrics.stage("resolve_licenses"):
+            self.license_info()
 
         return self.doc
 
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-FileCopyrightText: Copyright (c) 2022 Kakao Corp. https://www.kakaocorp.com
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# SPDX RDF vocabulary read by the RDF/XML parsers (rdf_xml, rdf_xml_stream)
+
+SUBJECT_DOCUMENT = "SpdxDocument"
+SUBJECT_PACKAGE = "Package"
+SUBJECT_FILE = "File"
+SUBJECT_EXTRACTED_LICENSE = "ExtractedLicensingInfo"
+
+PREDICATE_DOCUMENT_NAME = "name"
+PREDICATE_DOCUMENT_CREATOR = "creator"
+
+PREDICATE_PACKAGE_NAME = "name"
+PREDICATE_PACKAGE_VERSION_INFO = "versionInfo"
+PREDICATE_PACKAGE_LICENSE_CONCLUDED = "licenseConcluded"
+PREDICATE_PACKAGE_LICENSE_DECLARED = "licenseDeclared"
+PREDICATE_PACKAGE_COPYRIGHT_TEXT = "copyrightText"
+PREDICATE_PACKAGE_DOWNLOAD_LOCATION = "downloadLocation"
+
+PREDICATE_FILE_NAME = "fileName"
+PREDICATE_FILE_LICENSE_CONCLUDED = "licenseConcluded"
+PREDICATE_FILE_LICENSE_DECLARED = "licenseInfoInFile"
+PREDICATE_FILE_COPYRIGHT_TEXT = "copyrightText"
+PREDICATE_FILE_DOWNLOAD_LOCATION = ""
+
+PREDICATE_LICENSE_ID = "licenseId"
+PREDICATE_LICENSE_NAME = "name"
+PREDICATE_LICENSE_EXTRACTED_TEXT = "extractedText"
+
+LICENSE_COMPOSITE_OPERATORS = {
+    "DisjunctiveLicenseSet": " OR ",
+    "ConjunctiveLicenseSet": " AND ",
+    "WithExceptionOperator": " WITH "
+}
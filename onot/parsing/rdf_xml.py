@@ -10,46 +10,39 @@ from rdflib import Graph, Namespace, RDF
 from rdflib.term import Literal, URIRef, BNode
 import logging
 from onot.parsing import parser
-
-SUBJECT_DOCUMENT = "SpdxDocument"
-SUBJECT_PACKAGE = "Package"
-SUBJECT_FILE = "File"
-SUBJECT_EXTRACTED_LICENSE = "ExtractedLicensingInfo"
-
-PREDICATE_DOCUMENT_NAME = "name"
-PREDICATE_DOCUMENT_CREATOR = "creator"
-
-PREDICATE_PACKAGE_NAME = "name"
-PREDICATE_PACKAGE_VERSION_INFO = "versionInfo"
-PREDICATE_PACKAGE_LICENSE_CONCLUDED = "licenseConcluded"
-PREDICATE_PACKAGE_LICENSE_DECLARED = "licenseDeclared"
-PREDICATE_PACKAGE_COPYRIGHT_TEXT = "copyrightText"
-PREDICATE_PACKAGE_DOWNLOAD_LOCATION = "downloadLocation"
-
-PREDICATE_FILE_NAME = "fileName"
-PREDICATE_FILE_LICENSE_CONCLUDED = "licenseConcluded"
-PREDICATE_FILE_LICENSE_DECLARED = "licenseInfoInFile"
-PREDICATE_FILE_COPYRIGHT_TEXT = "copyrightText"
-PREDICATE_FILE_DOWNLOAD_LOCATION = ""
-
-PREDICATE_LICENSE_ID = "licenseId"
-PREDICATE_LICENSE_NAME = "name"
-PREDICATE_LICENSE_EXTRACTED_TEXT = "extractedText"
-
-LICENSE_COMPOSITE_OPERATORS = {
-    "DisjunctiveLicenseSet": " OR ",
-    "ConjunctiveLicenseSet": " AND ",
-    "WithExceptionOperator": " WITH "
-}
+from onot.parsing.rdf_terms import *
 
 logger = logging.getLogger("root")
 
 class Parser(parser.AbstractParser):
-    def __init__(self, file):
+    def __init__(self, file, merge_policy=parser.MERGE_POLICY_FIRST_WINS):
         logger.debug("RDF/XML Parser class")
-        super().__init__()
+        super().__init__(merge_policy)
         self.graph = Graph().parse(source=file, format="xml")
         self.spdx_namespace = Namespace("http://spdx.org/rdf/terms#")
+        # subject -> {predicate -> objects} and rdf:type -> subjects, built in one sweep over the graph
+        self.index = {}
+        self.type_index = {}
+        self.build_index()
+        # license set BNode -> license expression; spdx tools reuse the same sets across packages and files
+        self.license_expressions = {}
+
+    def build_index(self):
+        # walk the graph grouped by subject (and by type below) rather than triple by triple:
+        # the store keeps those groups in document order, which keeps the order of
+        # license set members and of packages the same as the per predicate queries did
+        for subject in self.graph.subjects(unique=True):
+            predicates = self.index[subject] = {}
+            for predicate, object in self.graph.predicate_objects(subject):
+                predicates.setdefault(predicate, []).append(object)
+        for subject, object in self.graph.subject_objects(RDF.type):
+            self.type_index.setdefault(object, []).append(subject)
+
+    def subjects_of_type(self, subject):
+        return self.type_index.get(self.spdx_namespace[subject], [])
+
+    def objects(self, subject, predicate):
+        return self.index.get(subject, {}).get(predicate, [])
 
     def validate_file(self, file):
         # validate file contents : all necessary information should be in the file.
@@ -77,13 +70,13 @@ class Parser(parser.AbstractParser):
             # SUBJECT_EXTRACTED_LICENSE
         ]
         for subject in required_subjects:
-            if not (None, RDF.type, self.spdx_namespace[subject]) in self.graph:
+            if not self.subjects_of_type(subject):
                 raise ValueError("required subject is not existed: " + subject)
 
     def validate_predicates_exist(self, subject, predicates):
         # validate necessary predicate are existed
         for predicate in predicates:
-            if not (subject, self.spdx_namespace[predicate], None) in self.graph:
+            if not self.objects(subject, self.spdx_namespace[predicate]):
                 raise ValueError("required predicate is not existed: " + self.spdx_namespace[predicate])
 
     def extract_license_expression(self, object):
@@ -97,24 +90,31 @@ class Parser(parser.AbstractParser):
         # https://rdflib.readthedocs.io/en/stable/rdf_terms.html#bnodes
         # This case means dual license.
         elif type(object) == BNode:
-            for _, _, tag_name in self.graph.triples((object, RDF.type, None)):
-                operator_tag = str(os.path.basename(tag_name)).split("#")[1]
-                operator = LICENSE_COMPOSITE_OPERATORS[operator_tag]
+            license_expression = self.license_expressions.get(object)
+            if license_expression is None:
+                license_expression = self.extract_composite_license_expression(object)
+                self.license_expressions[object] = license_expression
+            return license_expression
+
+    def extract_composite_license_expression(self, object):
+        for tag_name in self.objects(object, RDF.type):
+            operator_tag = str(os.path.basename(tag_name)).split("#")[1]
+            operator = LICENSE_COMPOSITE_OPERATORS[operator_tag]
 
-            license_expression = ""
-            for _, _, o in self.graph.triples((object, self.spdx_namespace["member"], None)):
-                license_expression = license_expression + self.extract_license_expression(o) + operator
+        license_expression = ""
+        for o in self.objects(object, self.spdx_namespace["member"]):
+            license_expression = license_expression + self.extract_license_expression(o) + operator
 
-            for _, _, o in self.graph.triples((object, self.spdx_namespace["licenseException"], None)):
-                license_expression = license_expression + self.extract_license_expression(o) + operator
+        for o in self.objects(object, self.spdx_namespace["licenseException"]):
+            license_expression = license_expression + self.extract_license_expression(o) + operator
 
-            return license_expression[:-len(operator)] if operator == " WITH " else "(" + license_expression[:-len(operator)] + ")"
+        return license_expression[:-len(operator)] if operator == " WITH " else "(" + license_expression[:-len(operator)] + ")"
 
     def extract(self, subject, predicates):
         extracted = {}
         for predicate in predicates:
             objects = []
-            for s, p, o in self.graph.triples((subject, self.spdx_namespace[predicate], None)):
+            for o in self.objects(subject, self.spdx_namespace[predicate]):
                 if predicate in [
                     PREDICATE_PACKAGE_LICENSE_CONCLUDED,
                     PREDICATE_PACKAGE_LICENSE_DECLARED,
@@ -138,13 +138,13 @@ class Parser(parser.AbstractParser):
 
     def document_info(self):
         # get document name
-        for subject, _, _ in self.graph.triples((None, RDF.type, self.spdx_namespace["SpdxDocument"])):
+        for subject in self.subjects_of_type("SpdxDocument"):
             self.validate_predicates_exist(subject, [PREDICATE_DOCUMENT_NAME])
             document_info = self.extract(subject, [PREDICATE_DOCUMENT_NAME])
             self.doc["name"] = document_info[PREDICATE_DOCUMENT_NAME]
 
         # get organization & email
-        for subject, _, _ in self.graph.triples((None, RDF.type, self.spdx_namespace["CreationInfo"])):
+        for subject in self.subjects_of_type("CreationInfo"):
             self.validate_predicates_exist(subject, [PREDICATE_DOCUMENT_CREATOR])
             creators = self.extract(subject, [PREDICATE_DOCUMENT_CREATOR])
             creation_info = {}
@@ -171,7 +171,7 @@ class Parser(parser.AbstractParser):
         ]
         non_required_predicates = []
 
-        for subject, _, _ in self.graph.triples((None, RDF.type, self.spdx_namespace["Package"])):
+        for subject in self.subjects_of_type("Package"):
             self.validate_predicates_exist(subject, required_predicates)
             package_info = self.extract(subject, required_predicates + non_required_predicates)
             package = {
@@ -195,7 +195,7 @@ class Parser(parser.AbstractParser):
             PREDICATE_FILE_DOWNLOAD_LOCATION
         ]
 
-        for subject, _, _ in self.graph.triples((None, RDF.type, self.spdx_namespace["File"])):
+        for subject in self.subjects_of_type("File"):
             self.validate_predicates_exist(subject, required_predicates)
             file_info = self.extract(subject, required_predicates + non_required_predicates)
 
@@ -219,7 +219,7 @@ class Parser(parser.AbstractParser):
             PREDICATE_LICENSE_NAME
         ]
 
-        for subject, _, _ in self.graph.triples((None, RDF.type, self.spdx_namespace["ExtractedLicensingInfo"])):
+        for subject in self.subjects_of_type("ExtractedLicensingInfo"):
             self.validate_predicates_exist(subject, required_predicates)
             license_info = self.extract(subject, required_predicates + non_required_predicates)
             extracted_license = {
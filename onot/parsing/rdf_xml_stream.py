@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import heapq
+import logging
+import xml.etree.ElementTree as ET
+from onot.parsing import parser
+from onot.parsing.rdf_terms import *
+
+# Streaming parser of RDF/XML SPDX documents.
+#
+# rdf_xml.Parser loads every triple of the document into an rdflib Graph first.
+# This parser reads the document with iterparse instead and builds one record per
+# Package, File and ExtractedLicensingInfo node as soon as the node element ends;
+# the element is cleared right after, so memory is bounded by the largest node
+# rather than by the document.
+#
+# Packages, including the ones made of File nodes, are appended in the order of
+# their opening tags, which is the order of rdf_xml.Parser. A node nested in a
+# Package or File ends before the node around it, so its record waits until the
+# outer node is appended. Unlike rdf_xml.Parser, which lists all File packages
+# after all Package nodes, File packages are appended in document order too, so
+# they are never held in memory.
+#
+# It understands the striped RDF/XML the SPDX tools write: typed node elements,
+# nested nodes, rdf:resource references and blank node license sets. Anything
+# else (rdf:nodeID references, rdf:parseType, containers, a node described in
+# several places) raises UnsupportedSerialization and the document is parsed
+# again with rdf_xml.Parser.
+
+RDF_NAMESPACE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+SPDX_NAMESPACE = "http://spdx.org/rdf/terms#"
+
+RDF_RDF = "{" + RDF_NAMESPACE + "}RDF"
+RDF_DESCRIPTION = "{" + RDF_NAMESPACE + "}Description"
+RDF_TYPE = "{" + RDF_NAMESPACE + "}type"
+RDF_ABOUT = "{" + RDF_NAMESPACE + "}about"
+RDF_RESOURCE = "{" + RDF_NAMESPACE + "}resource"
+RDF_NODE_ID = "{" + RDF_NAMESPACE + "}nodeID"
+RDF_ID = "{" + RDF_NAMESPACE + "}ID"
+RDF_PARSE_TYPE = "{" + RDF_NAMESPACE + "}parseType"
+
+SUBJECT_CREATION_INFO = "CreationInfo"
+
+# nodes whose properties are kept until the node element ends
+RECORDED_SUBJECTS = [
+    SUBJECT_DOCUMENT,
+    SUBJECT_CREATION_INFO,
+    SUBJECT_PACKAGE,
+    SUBJECT_FILE,
+    SUBJECT_EXTRACTED_LICENSE
+] + list(LICENSE_COMPOSITE_OPERATORS)
+
+LICENSE_PREDICATES = [
+    PREDICATE_PACKAGE_LICENSE_CONCLUDED,
+    PREDICATE_PACKAGE_LICENSE_DECLARED,
+    PREDICATE_FILE_LICENSE_CONCLUDED,
+    PREDICATE_FILE_LICENSE_DECLARED
+]
+
+# values of properties
+VALUE_LITERAL = "literal"
+VALUE_URI = "uri"
+VALUE_EXPRESSION = "expression"
+VALUE_NODE = "node"
+
+logger = logging.getLogger("root")
+
+class UnsupportedSerialization(Exception):
+    pass
+
+class Node():
+    def __init__(self, tag, about, order):
+        self.tag = tag
+        self.about = about
+        # position of the opening tag in the document
+        self.order = order
+        self.types = []
+        if tag.startswith("{" + SPDX_NAMESPACE):
+            self.types.append(tag[len(SPDX_NAMESPACE) + 2:])
+        # spdx predicate -> list of (value kind, value)
+        self.properties = {}
+
+    def subject(self):
+        for subject in self.types:
+            if subject in RECORDED_SUBJECTS:
+                return subject
+        return None
+
+    def is_recorded(self):
+        # untyped nodes (rdf:Description) may still get their type from an rdf:type property
+        return not self.types or self.subject() is not None
+
+    def add(self, predicate, value):
+        self.properties.setdefault(predicate, []).append(value)
+
+    def may_be_package(self):
+        # untyped nodes may still turn out to be a Package or File
+        return not self.types or self.subject() in (SUBJECT_PACKAGE, SUBJECT_FILE)
+
+class Property():
+    def __init__(self, tag, resource):
+        self.tag = tag
+        self.resource = resource
+        self.value = None
+
+class Parser(parser.AbstractParser):
+    def __init__(self, file, merge_policy=parser.MERGE_POLICY_FIRST_WINS):
+        logger.debug("RDF/XML streaming Parser class")
+        super().__init__(merge_policy)
+        self.file = file
+        self.subjects = set()
+        # about of the recorded nodes seen so far, to detect nodes described in several places
+        self.described = set()
+        self.stack = []
+        self.order = 0
+        # heap of (order, package) which wait for the packages around them
+        self.pending = []
+
+    def validate_file(self, file):
+        # the document should be RDF/XML; the required subjects are checked after reading it
+        for _, elem in ET.iterparse(file, events=("start",)):
+            if elem.tag != RDF_RDF:
+                raise UnsupportedSerialization("root element is not rdf:RDF: " + elem.tag)
+            break
+
+    def validate_subjects(self):
+        required_subjects = [
+            SUBJECT_DOCUMENT,
+            SUBJECT_PACKAGE,
+            # SUBJECT_EXTRACTED_LICENSE
+        ]
+        for subject in required_subjects:
+            if subject not in self.subjects:
+                raise ValueError("required subject is not existed: " + subject)
+
+    def validate_predicates_exist(self, node, predicates):
+        # validate necessary predicate are existed
+        for predicate in predicates:
+            if predicate not in node.properties:
+                raise ValueError("required predicate is not existed: " + SPDX_NAMESPACE + predicate)
+
+    def license_expression(self, value):
+        kind, value = value
+        if kind == VALUE_URI:
+            # parse license name from url
+            basename = os.path.basename(value)
+            return basename.split("#")[1] if "#" in basename else basename
+        return str(value)
+
+    def composite_license_expression(self, node, subject):
+        operator = LICENSE_COMPOSITE_OPERATORS[subject]
+        members = node.properties.get("member", []) + node.properties.get("licenseException", [])
+        license_expression = operator.join(self.license_expression(member) for member in members)
+        return license_expression if operator == " WITH " else "(" + license_expression + ")"
+
+    def extract(self, node, predicates):
+        extracted = {}
+        for predicate in predicates:
+            objects = []
+            for kind, value in node.properties.get(predicate, []):
+                if predicate in LICENSE_PREDICATES:
+                    license_expression = self.license_expression((kind, value))
+                    objects.append(self.remove_enclosed_parentheses(license_expression))
+                elif kind == VALUE_LITERAL or kind == VALUE_URI:
+                    objects.append(str(value).replace("\n", "").strip())
+                else:
+                    objects.append(value)
+
+            if len(objects) == 0:
+                extracted[predicate] = ""
+            elif len(objects) == 1:
+                extracted[predicate] = objects[0]
+            else:
+                extracted[predicate] = objects
+        return extracted
+
+    def start_node(self, elem):
+        # rdf:nodeID on a node element only labels it; references to it are rejected in start_property
+        for attribute in [RDF_ID, RDF_PARSE_TYPE]:
+            if attribute in elem.attrib:
+                raise UnsupportedSerialization("node element with " + attribute)
+        self.order += 1
+        node = Node(elem.tag, elem.get(RDF_ABOUT), self.order)
+        # property attributes
+        for name, value in elem.attrib.items():
+            if name.startswith("{" + SPDX_NAMESPACE):
+                node.add(name[len(SPDX_NAMESPACE) + 2:], (VALUE_LITERAL, value))
+        return node
+
+    def start_property(self, elem):
+        if elem.tag.startswith("{" + RDF_NAMESPACE) and elem.tag != RDF_TYPE:
+            raise UnsupportedSerialization("rdf property element: " + elem.tag)
+        for attribute in [RDF_NODE_ID, RDF_PARSE_TYPE]:
+            if attribute in elem.attrib:
+                raise UnsupportedSerialization("property element with " + attribute)
+        return Property(elem.tag, elem.get(RDF_RESOURCE))
+
+    def end_property(self, node, prop, elem):
+        if prop.value is not None:
+            value = prop.value
+        elif prop.resource is not None:
+            value = (VALUE_URI, prop.resource)
+        else:
+            value = (VALUE_LITERAL, elem.text if elem.text is not None else "")
+
+        if prop.tag == RDF_TYPE:
+            if value[0] == VALUE_URI and value[1].startswith(SPDX_NAMESPACE):
+                node.types.append(value[1][len(SPDX_NAMESPACE):])
+        elif prop.tag.startswith("{" + SPDX_NAMESPACE) and node.is_recorded():
+            node.add(prop.tag[len(SPDX_NAMESPACE) + 2:], value)
+
+    def end_node(self, node):
+        # returns the value of the node for the property it is nested in
+        subject = node.subject()
+        if subject is None:
+            return (VALUE_URI, node.about) if node.about is not None else (VALUE_NODE, None)
+
+        if subject in LICENSE_COMPOSITE_OPERATORS:
+            return (VALUE_EXPRESSION, self.composite_license_expression(node, subject))
+
+        if node.properties:
+            if node.about is not None:
+                if node.about in self.described:
+                    raise UnsupportedSerialization("node is described in several places: " + node.about)
+                self.described.add(node.about)
+            self.subjects.add(subject)
+            self.record(subject, node)
+        return (VALUE_URI, node.about) if node.about is not None else (VALUE_NODE, None)
+
+    def record(self, subject, node):
+        if subject == SUBJECT_DOCUMENT:
+            # get document name
+            self.validate_predicates_exist(node, [PREDICATE_DOCUMENT_NAME])
+            self.doc["name"] = self.extract(node, [PREDICATE_DOCUMENT_NAME])[PREDICATE_DOCUMENT_NAME]
+        elif subject == SUBJECT_CREATION_INFO:
+            self.creation_info(node)
+        elif subject == SUBJECT_PACKAGE:
+            heapq.heappush(self.pending, (node.order, self.package(node)))
+        elif subject == SUBJECT_FILE:
+            heapq.heappush(self.pending, (node.order, self.file_package(node)))
+        elif subject == SUBJECT_EXTRACTED_LICENSE:
+            self.doc["extracted_license"].append(self.extracted_license(node))
+
+    def creation_info(self, node):
+        # get organization & email
+        self.validate_predicates_exist(node, [PREDICATE_DOCUMENT_CREATOR])
+        creators = node.properties[PREDICATE_DOCUMENT_CREATOR]
+        creation_info = {}
+        for _, creator in creators:
+            creator = str(creator).replace("\n", "").strip()
+            if 'Organization' in creator:
+                if '@' in creator:
+                    organization_email = creator.replace('Organization: ', '').split('(')
+                    creation_info['organization'] = organization_email[0].strip()
+                    creation_info['email'] = organization_email[1].replace(')', '')
+                else:
+                    raise ValueError("email info is not existed.")
+            elif 'SourceDownloadUrl' in creator:
+                creation_info['sourceDownloadUrl'] = creator.replace('SourceDownloadUrl:', '').strip()
+        self.doc["creationInfo"] = creation_info
+
+    def package(self, node):
+        required_predicates = [
+            PREDICATE_PACKAGE_NAME,
+            PREDICATE_PACKAGE_VERSION_INFO,
+            PREDICATE_PACKAGE_LICENSE_CONCLUDED,
+            PREDICATE_PACKAGE_LICENSE_DECLARED,
+            PREDICATE_PACKAGE_COPYRIGHT_TEXT,
+            PREDICATE_PACKAGE_DOWNLOAD_LOCATION
+        ]
+        self.validate_predicates_exist(node, required_predicates)
+        package_info = self.extract(node, required_predicates)
+        return {
+            "name": package_info[PREDICATE_PACKAGE_NAME],
+            "versionInfo": package_info[PREDICATE_PACKAGE_VERSION_INFO],
+            "licenseConcluded": package_info[PREDICATE_PACKAGE_LICENSE_CONCLUDED],
+            "licenseDeclared": package_info[PREDICATE_PACKAGE_LICENSE_DECLARED],
+            "copyrightText": package_info[PREDICATE_PACKAGE_COPYRIGHT_TEXT],
+            "downloadLocation": package_info[PREDICATE_PACKAGE_DOWNLOAD_LOCATION]
+        }
+
+    def file_package(self, node):
+        required_predicates = [
+            PREDICATE_FILE_NAME,
+            PREDICATE_FILE_LICENSE_CONCLUDED,
+            PREDICATE_FILE_LICENSE_DECLARED,
+            PREDICATE_FILE_COPYRIGHT_TEXT,
+        ]
+        self.validate_predicates_exist(node, required_predicates)
+        file_info = self.extract(node, required_predicates)
+
+        package_name, package_version = self.extract_package_name_and_package_version(file_info[PREDICATE_FILE_NAME])
+        return {
+            "name": package_name,
+            "versionInfo": package_version,
+            "licenseConcluded": file_info[PREDICATE_FILE_LICENSE_CONCLUDED],
+            "licenseDeclared": file_info[PREDICATE_FILE_LICENSE_DECLARED],
+            "copyrightText": file_info[PREDICATE_FILE_COPYRIGHT_TEXT],
+            "downloadLocation": ""
+        }
+
+    def extracted_license(self, node):
+        required_predicates = [
+            PREDICATE_LICENSE_ID,
+            PREDICATE_LICENSE_EXTRACTED_TEXT
+        ]
+        self.validate_predicates_exist(node, required_predicates)
+        license_info = self.extract(node, required_predicates + [PREDICATE_LICENSE_NAME])
+        return {
+            "identifier": license_info[PREDICATE_LICENSE_ID],
+            "licenseName":  license_info[PREDICATE_LICENSE_NAME],
+            "extractedText": license_info[PREDICATE_LICENSE_EXTRACTED_TEXT]
+        }
+
+    def append_pending(self):
+        # append the waiting packages which no open Package or File node comes before
+        limit = min((frame.order for frame in self.stack if isinstance(frame, Node) and frame.may_be_package()), default=None)
+        while self.pending and (limit is None or self.pending[0][0] < limit):
+            self.append_package(heapq.heappop(self.pending)[1])
+
+    def stream(self):
+        # read the document once. node elements and property elements alternate (striped syntax).
+        stack = self.stack
+        root = None
+        for event, elem in ET.iterparse(self.file, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                    stack.append(None)
+                elif isinstance(stack[-1], Node):
+                    stack.append(self.start_property(elem))
+                else:
+                    stack.append(self.start_node(elem))
+                continue
+
+            frame = stack.pop()
+            if isinstance(frame, Node):
+                value = self.end_node(frame)
+                if isinstance(stack[-1], Property):
+                    stack[-1].value = value
+                if self.pending:
+                    self.append_pending()
+            elif isinstance(frame, Property):
+                self.end_property(stack[-1], frame, elem)
+            # the record has been taken; drop the element and its text
+            elem.clear()
+            if len(stack) == 1:
+                root.clear()
+
+    def document_info(self):
+        # Package, File and ExtractedLicensingInfo nodes are all read in this single pass
+        self.stream()
+        self.validate_subjects()
+
+    def package_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def per_file_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def extracted_license_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def parse(self, file):
+        try:
+            return super().parse(file)
+        except UnsupportedSerialization as ex:
+            logger.debug("use rdflib - " + str(ex))
+            from onot.parsing import rdf_xml
+            return rdf_xml.Parser(file, self.merge_policy).parse(file)
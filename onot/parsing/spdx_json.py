@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+import json
+import logging
+from onot.parsing import parser
+
+# Parser of SPDX 2.x JSON documents.
+#
+# The document is read with JsonStream, a pull reader over the file: the top level
+# object and the packages / files / hasExtractedLicensingInfos arrays are walked
+# member by member, and only one array element at a time is decoded into python
+# objects. Everything else (relationships, snippets, annotations, ...) is skipped
+# the same way, so memory is bounded by the largest element rather than the document.
+# Packages made of files are appended as they are read, so when "files" comes before
+# "packages" in the document, its packages come first in the notice too.
+#
+# Only the name and download location of a package and the name of a file are
+# required. SPDX 2.3 makes the rest optional: a missing license is NOASSERTION,
+# a missing version or copyright text is empty, as with the other formats.
+
+# members of the document
+FIELD_DOCUMENT_NAME = "name"
+FIELD_CREATION_INFO = "creationInfo"
+FIELD_CREATORS = "creators"
+FIELD_PACKAGES = "packages"
+FIELD_FILES = "files"
+FIELD_EXTRACTED_LICENSES = "hasExtractedLicensingInfos"
+
+# members of a package
+FIELD_PACKAGE_NAME = "name"
+FIELD_PACKAGE_VERSION_INFO = "versionInfo"
+FIELD_PACKAGE_LICENSE_CONCLUDED = "licenseConcluded"
+FIELD_PACKAGE_LICENSE_DECLARED = "licenseDeclared"
+FIELD_PACKAGE_COPYRIGHT_TEXT = "copyrightText"
+FIELD_PACKAGE_DOWNLOAD_LOCATION = "downloadLocation"
+
+# members of a file
+FIELD_FILE_NAME = "fileName"
+FIELD_FILE_LICENSE_CONCLUDED = "licenseConcluded"
+FIELD_FILE_LICENSE_INFO_IN_FILES = "licenseInfoInFiles"
+FIELD_FILE_COPYRIGHT_TEXT = "copyrightText"
+
+# members of an extracted license
+FIELD_LICENSE_ID = "licenseId"
+FIELD_LICENSE_NAME = "name"
+FIELD_LICENSE_EXTRACTED_TEXT = "extractedText"
+
+NOASSERTION = "NOASSERTION"
+
+# characters read from the file at once
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+logger = logging.getLogger("root")
+
+class JsonStream():
+    # pull reader of a json text file.
+    # members() and items() walk an object / an array without decoding it; the caller
+    # reads each member or item with value(), members(), items() or skip() before
+    # asking for the next one.
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size):
+        # read more of the file into the buffer; False at the end of the file
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer += data
+        return True
+
+    def peek(self):
+        # the next character which is not a whitespace, '' at the end of the file
+        while True:
+            if self.pos < len(self.buffer) and self.buffer[self.pos] not in " \t\n\r":
+                return self.buffer[self.pos]
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill(self.chunk_size):
+                return ""
+
+    def expect(self, characters):
+        character = self.peek()
+        if character == "" or character not in characters:
+            raise ValueError("invalid json: expected " + " or ".join(repr(c) for c in characters) + ", got " + repr(character))
+        self.pos += 1
+        return character
+
+    def value(self):
+        # decode the next value
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may go on in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as ex:
+                if self.eof:
+                    raise ValueError("invalid json: " + str(ex))
+            # the value goes on after the buffer; read twice as much each time so a long value is read in linear time
+            self.fill(size)
+            size *= 2
+
+    def members(self):
+        # yield the keys of the object
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("invalid json: object key is not a string: " + repr(key))
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def items(self):
+        # yield once per item of the array
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.expect(",]") == "]":
+                return
+
+    def skip(self):
+        # the top level arrays may be huge, their items are not: skip an array item by item
+        if self.peek() == "[":
+            for _ in self.items():
+                self.value()
+        else:
+            self.value()
+
+class Parser(parser.AbstractParser):
+    def __init__(self, file, merge_policy=parser.MERGE_POLICY_FIRST_WINS):
+        logger.debug("SPDX JSON Parser class")
+        super().__init__(merge_policy)
+        self.file = file
+        self.fields = set()
+
+    def validate_file(self, file):
+        # validate file contents : all necessary information should be in the file.
+        # the document should be a json object; its members are checked after reading it
+        # 1. document
+        # - name
+        # - creationInfo.creators (Organization / Email)
+        # 2. packages
+        # - name
+        # - downloadLocation
+        # 3. files
+        # - fileName
+        with open(file, "r", encoding="utf-8-sig") as f:
+            if JsonStream(f).peek() != "{":
+                raise ValueError("not a SPDX JSON document: " + file)
+
+    def validate_fields(self):
+        required_fields = [
+            FIELD_DOCUMENT_NAME,
+            FIELD_CREATION_INFO,
+            FIELD_PACKAGES
+        ]
+        for field in required_fields:
+            if field not in self.fields:
+                raise ValueError("required field is not existed: " + field)
+
+    def validate_fields_exist(self, element, fields, prefix):
+        # validate necessary fields are existed
+        if not isinstance(element, dict):
+            raise ValueError("invalid element of " + prefix + ": " + repr(element))
+        for field in fields:
+            if field not in element:
+                raise ValueError("required field is not existed: " + prefix + "." + field)
+
+    def license_expression(self, value):
+        # licenseInfoInFiles is a list of licenses
+        if isinstance(value, list):
+            value = " AND ".join(str(license) for license in value)
+        return self.remove_enclosed_parentheses(str(value))
+
+    def creation_info(self, creation_info):
+        # get organization & email
+        self.validate_fields_exist(creation_info, [FIELD_CREATORS], FIELD_CREATION_INFO)
+        creators = creation_info[FIELD_CREATORS]
+        creation_info = {}
+        for creator in creators:
+            creator = str(creator)
+            if 'Organization' in creator:
+                if '@' in creator:
+                    organization_email = creator.replace('Organization: ', '').split('(')
+                    creation_info['organization'] = organization_email[0].strip()
+                    creation_info['email'] = organization_email[1].replace(')', '')
+                else:
+                    raise ValueError("email info is not existed.")
+            elif 'SourceDownloadUrl' in creator:
+                creation_info['sourceDownloadUrl'] = creator.replace('SourceDownloadUrl:', '').strip()
+        self.doc["creationInfo"] = creation_info
+
+    def package(self, element):
+        self.validate_fields_exist(element, [
+            FIELD_PACKAGE_NAME,
+            FIELD_PACKAGE_DOWNLOAD_LOCATION
+        ], FIELD_PACKAGES)
+        return {
+            "name": element[FIELD_PACKAGE_NAME],
+            "versionInfo": str(element.get(FIELD_PACKAGE_VERSION_INFO, "")),
+            "licenseConcluded": self.license_expression(element.get(FIELD_PACKAGE_LICENSE_CONCLUDED, NOASSERTION)),
+            "licenseDeclared": self.license_expression(element.get(FIELD_PACKAGE_LICENSE_DECLARED, NOASSERTION)),
+            "copyrightText": element.get(FIELD_PACKAGE_COPYRIGHT_TEXT, ""),
+            "downloadLocation": element[FIELD_PACKAGE_DOWNLOAD_LOCATION]
+        }
+
+    def file_package(self, element):
+        self.validate_fields_exist(element, [
+            FIELD_FILE_NAME
+        ], FIELD_FILES)
+        package_name, package_version = self.extract_package_name_and_package_version(element[FIELD_FILE_NAME])
+        return {
+            "name": package_name,
+            "versionInfo": package_version,
+            "licenseConcluded": self.license_expression(element.get(FIELD_FILE_LICENSE_CONCLUDED, NOASSERTION)),
+            "licenseDeclared": self.license_expression(element.get(FIELD_FILE_LICENSE_INFO_IN_FILES) or NOASSERTION),
+            "copyrightText": element.get(FIELD_FILE_COPYRIGHT_TEXT, ""),
+            "downloadLocation": ""
+        }
+
+    def extracted_license(self, element):
+        self.validate_fields_exist(element, [
+            FIELD_LICENSE_ID,
+            FIELD_LICENSE_EXTRACTED_TEXT
+        ], FIELD_EXTRACTED_LICENSES)
+        return {
+            "identifier": element[FIELD_LICENSE_ID],
+            "licenseName": element.get(FIELD_LICENSE_NAME, ""),
+            "extractedText": element[FIELD_LICENSE_EXTRACTED_TEXT]
+        }
+
+    def stream(self):
+        # read the document once, one element of the arrays at a time
+        with open(self.file, "r", encoding="utf-8-sig") as f:
+            reader = JsonStream(f)
+            for field in reader.members():
+                self.fields.add(field)
+                if field == FIELD_DOCUMENT_NAME:
+                    self.doc["name"] = reader.value()
+                elif field == FIELD_CREATION_INFO:
+                    self.creation_info(reader.value())
+                elif field == FIELD_PACKAGES:
+                    for _ in reader.items():
+                        self.append_package(self.package(reader.value()))
+                elif field == FIELD_FILES:
+                    for _ in reader.items():
+                        self.append_package(self.file_package(reader.value()))
+                elif field == FIELD_EXTRACTED_LICENSES:
+                    for _ in reader.items():
+                        self.doc["extracted_license"].append(self.extracted_license(reader.value()))
+                else:
+                    reader.skip()
+
+    def document_info(self):
+        # packages, files and extracted licenses are all read in this single pass
+        self.stream()
+        self.validate_fields()
+
+    def package_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def per_file_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def extracted_license_info(self):
+        # appended while streaming (see document_info)
+        pass
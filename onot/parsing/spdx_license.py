@@ -5,49 +5,191 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from onot.parsing import license_cache
+from onot.parsing import license_db
+from onot.log import metrics
 
 SPDX_LICENSE_URL_PREFIX = "https://spdx.org/licenses/"
 SPDX_LICENSE_JSON_URL = "https://spdx.org/licenses/licenses.json"
 SPDX_LICENSE_EXCEPTION_JSON_URL = "https://spdx.org/licenses/exceptions.json"
 
+# limits of the license details download
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS = [429, 500, 502, 503, 504]
+
 logger = logging.getLogger("root")
 
+# process-wide registry shared by every parser and generator (see get_registry)
+_registry = None
+_registry_lock = threading.Lock()
+# keyword arguments of the SPDX_License created by get_registry (see configure)
+_registry_options = {}
+
 class SPDX_License():
 
-    def __init__(self):
+    def __init__(self, url_prefix=SPDX_LICENSE_URL_PREFIX, cache=None, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, database=None):
         logger.debug("SPDX_License")
+        # url_prefix can point to a mirror of https://spdx.org/licenses/
+        self.url_prefix = url_prefix
+        # license_cache.LicenseCache, or None to always download
+        self.cache = cache
+        # license_db.LicenseDatabase used when spdx.org and the cache cannot answer, or None
+        self.database = database
+        # set once spdx.org turned out to be unreachable; from then on only the database is used
+        self.use_database = False
+        # number of license details downloaded at the same time (see prefetch)
+        self.max_workers = max_workers
+        # seconds to wait for spdx.org per request
+        self.timeout = timeout
+        self.retries = retries
+        # keep-alive session shared by all downloads; one pooled connection per worker
+        self.session = self.make_session()
         self.spdx_license_list = []
         self.spdx_license_exception_list = []
+        # license list entries keyed by lower-cased licenseId / licenseExceptionId.
+        # SPDX license identifiers are matched case-insensitively.
+        self.license_index = {}
+        self.exception_index = {}
+        # license details already fetched, keyed by detailsUrl
+        self.spdx_license_details = {}
+        self.lock = threading.RLock()
+
+    def make_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.max_workers, 1),
+            max_retries=Retry(total=self.retries, backoff_factor=RETRY_BACKOFF_FACTOR, status_forcelist=RETRY_STATUS, allowed_methods=["GET"]))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def reset_session(self):
+        # open new connections; the pooled ones belong to the process that opened them.
+        # the old session is not closed, that would shut the sockets of that process too.
+        self.session = self.make_session()
+
+    def request(self, url, headers=None):
+        r = self.session.get(url, headers=headers, timeout=self.timeout)
+        if metrics.is_enabled():
+            metrics.count("http.requests")
+            metrics.count("http.bytes", len(r.content))
+        return r
+
+    def get_json(self, url):
+        if self.cache is None:
+            r = self.request(url)
+            r.raise_for_status()
+            return r.json()
+
+        entry = self.cache.read(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            metrics.count("license_cache.hits")
+            return entry["body"]
+        if self.cache.offline:
+            if entry is None:
+                raise self.cache.miss(url)
+            logger.debug("offline - use expired cache: " + url)
+            return entry["body"]
+
+        # revalidate with ETag / Last-Modified, if the document has been downloaded before
+        try:
+            r = self.request(url, self.cache.validation_headers(entry))
+        except requests.exceptions.RequestException:
+            if entry is None:
+                raise
+            logger.warning("could not revalidate, use expired cache: " + url)
+            return entry["body"]
+        if r.status_code == 304 and entry is not None:
+            logger.debug("not modified - " + url)
+            return self.cache.touch(entry)["body"]
+        r.raise_for_status()
+        body = r.json()
+        self.cache.write(url, body, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        return body
 
     def get_spdx_license_list(self):
-        r = requests.get(SPDX_LICENSE_JSON_URL)
-        self.spdx_license_list = r.json()
+        spdx_license_list = self.get_json(self.url_prefix + "licenses.json")
+        # build the index before publishing the list; load() checks the list without the lock
+        self.license_index = {
+            str(spdx_license['licenseId']).lower(): spdx_license
+            for spdx_license in spdx_license_list['licenses']
+        }
+        self.spdx_license_list = spdx_license_list
 
     def get_spdx_license_exception_list(self):
-        r = requests.get(SPDX_LICENSE_EXCEPTION_JSON_URL)
-        self.spdx_license_exception_list = r.json()
-    
+        spdx_license_exception_list = self.get_json(self.url_prefix + "exceptions.json")
+        self.exception_index = {
+            str(spdx_license_exception['licenseExceptionId']).lower(): spdx_license_exception
+            for spdx_license_exception in spdx_license_exception_list['exceptions']
+        }
+        self.spdx_license_exception_list = spdx_license_exception_list
+
+    def load(self):
+        # download the license list and the exception list only once.
+        # double-checked so that concurrent callers do not download them twice.
+        if self.spdx_license_list and self.spdx_license_exception_list:
+            return
+        with self.lock:
+            if not self.spdx_license_list: # list is empty
+                self.get_spdx_license_list()
+            if not self.spdx_license_exception_list: # list is empty
+                self.get_spdx_license_exception_list()
+
+    def get_license_list_version(self):
+        # version of the license list the licenses are resolved with
+        if not self.use_database:
+            try:
+                self.load()
+            except (license_cache.LicenseNotCachedError, requests.exceptions.RequestException) as ex:
+                self.fall_back_to_database(ex)
+        if self.use_database:
+            return self.database.license_list_version
+        return self.spdx_license_list.get('licenseListVersion')
+
     def get_spdx_license_detailsUrl(self, license_id):
         logger.debug("licenseid - " + license_id)
-        if not self.spdx_license_list: # list is empty
-            self.get_spdx_license_list()
-        if not self.spdx_license_exception_list: # list is empty
-            self.get_spdx_license_exception_list()
-
-        for spdx_license in self.spdx_license_list['licenses']:
-            if spdx_license['licenseId'] == license_id:
-                return spdx_license['detailsUrl']
-        for spdx_license_exception in self.spdx_license_exception_list['exceptions']:
-            if spdx_license_exception['licenseExceptionId'] == license_id:
-                return SPDX_LICENSE_URL_PREFIX + str(spdx_license_exception['reference']).replace("./", "")
+        self.load()
+
+        key = str(license_id).lower()
+        if key in self.license_index:
+            return self.license_index[key]['detailsUrl']
+        if key in self.exception_index:
+            return self.url_prefix + str(self.exception_index[key]['reference']).replace("./", "")
 
         return None
-    
+
+    def is_known(self, license_id):
+        # True if license_id is a license or a license exception in the spdx license list
+        self.load()
+        key = str(license_id).lower()
+        return key in self.license_index or key in self.exception_index
+
+    def is_exception(self, license_id):
+        self.load()
+        return str(license_id).lower() in self.exception_index
+
+    def is_deprecated(self, license_id):
+        self.load()
+        key = str(license_id).lower()
+        entry = self.license_index.get(key) or self.exception_index.get(key)
+        return entry is not None and bool(entry.get('isDeprecatedLicenseId', False))
+
     def get_spdx_license_details(self, details_url):
-        r = requests.get(details_url)
-        detalis_license = r.json()
+        with self.lock:
+            if details_url in self.spdx_license_details:
+                return self.spdx_license_details[details_url]
+
+        detalis_license = self.get_json(details_url)
 
         # convert to license form if detalis_license is license exception
         if "licenseId" not in detalis_license:
@@ -57,4 +199,112 @@ class SPDX_License():
         if 'licenseTextHtml' not in detalis_license:
             detalis_license['licenseTextHtml'] = detalis_license['exceptionTextHtml']
 
-        return detalis_license
\ No newline at end of file
+        with self.lock:
+            # another thread may have fetched the same license in the meantime; keep the first one
+            return self.spdx_license_details.setdefault(details_url, detalis_license)
+
+    def fall_back_to_database(self, ex):
+        # spdx.org (or the offline cache) could not answer. use the bundled database if there is one.
+        if self.database is None:
+            raise ex
+        if not self.use_database:
+            logger.warning(str(ex))
+            logger.warning("use the bundled license database - license list version " + str(self.database.license_list_version))
+            self.use_database = True
+
+    def get_license(self, license_id):
+        # the license details of license_id, or None if it is not in the spdx license list
+        if not self.use_database:
+            try:
+                details_url = self.get_spdx_license_detailsUrl(license_id)
+                if details_url is None:
+                    return None
+                return self.get_spdx_license_details(details_url)
+            except (license_cache.LicenseNotCachedError, requests.exceptions.RequestException) as ex:
+                self.fall_back_to_database(ex)
+        return self.database.get(license_id)
+
+    def prefetch(self, license_ids):
+        # download the details of the given licenses concurrently, so that the following
+        # get_spdx_license_details calls are answered from memory.
+        # ids which are not in the spdx license list (e.g. LicenseRef-) are skipped.
+        if self.use_database:
+            # reading the database is cheap; texts are paged in when they are needed
+            return
+        try:
+            self.download(license_ids)
+        except (license_cache.LicenseNotCachedError, requests.exceptions.RequestException) as ex:
+            self.fall_back_to_database(ex)
+
+    def download(self, license_ids):
+        details_urls = []
+        for license_id in license_ids:
+            details_url = self.get_spdx_license_detailsUrl(license_id)
+            if details_url is None or details_url in details_urls:
+                continue
+            with self.lock:
+                if details_url in self.spdx_license_details:
+                    continue
+            details_urls.append(details_url)
+        if not details_urls:
+            return
+
+        logger.debug("prefetch " + str(len(details_urls)) + " licenses")
+        with ThreadPoolExecutor(max_workers=max(min(self.max_workers, len(details_urls)), 1)) as executor:
+            # list() re-raises the first download error, if any
+            list(executor.map(self.get_spdx_license_details, details_urls))
+
+    def clear(self):
+        # drop everything loaded so far. the next lookup downloads the lists again.
+        with self.lock:
+            self.spdx_license_list = []
+            self.spdx_license_exception_list = []
+            self.license_index = {}
+            self.exception_index = {}
+            self.spdx_license_details = {}
+            self.use_database = False
+
+
+def configure(url_prefix=SPDX_LICENSE_URL_PREFIX, cache_dir=None, cache_ttl=license_cache.DEFAULT_TTL, offline=False, use_cache=True,
+              max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, use_database=True):
+    # set up the shared registry. call this before parsing; the current registry is dropped.
+    # offline: never touch the network, fail with license_cache.LicenseNotCachedError on a cache miss
+    # use_database: fall back to the bundled license database when spdx.org or the cache cannot answer
+    global _registry, _registry_options
+    if offline and not use_cache:
+        raise ValueError("offline mode needs the license cache")
+    with _registry_lock:
+        _registry_options = {
+            "url_prefix": url_prefix,
+            "cache": license_cache.LicenseCache(cache_dir, cache_ttl, offline) if use_cache else None,
+            "max_workers": max_workers,
+            "timeout": timeout,
+            "retries": retries,
+            "database": license_db.open_bundled() if use_database else None
+        }
+        _registry = None
+
+def get_registry():
+    # return the SPDX_License instance shared by the whole process.
+    # the license lists and the license details are loaded once and reused
+    # by every parser and generator, across runs in the same process.
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                options = _registry_options if _registry_options else {
+                    "cache": license_cache.LicenseCache(),
+                    "database": license_db.open_bundled()
+                }
+                _registry = SPDX_License(**options)
+    return _registry
+
+def reset_connections():
+    # call in a process forked from one which used the registry (e.g. a batch worker).
+    # the loaded license lists and details are kept, only the connections are replaced.
+    # returns False if there is no registry yet.
+    with _registry_lock:
+        if _registry is None:
+            return False
+        _registry.reset_session()
+        return True
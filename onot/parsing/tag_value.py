@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+from onot.parsing import parser
+
+# Parser of SPDX 2.x tag-value documents (.spdx).
+#
+# The file is read line by line in a single pass. A package, file or extracted
+# license starts with its first tag (PackageName, FileName, LicenseID) and ends where
+# the next one starts; each is turned into a record as soon as it ends, so only
+# the tags of one element are held at a time. Values may span several lines
+# inside <text>...</text>. Packages made of files are appended where their file
+# comes in the document, not after all packages.
+#
+# Only the name and download location of a package and the name of a file are
+# required. SPDX 2.3 makes the rest optional: a missing license is NOASSERTION,
+# a missing version or copyright text is empty, as with the other formats.
+
+# document
+TAG_DOCUMENT_NAME = "DocumentName"
+TAG_CREATOR = "Creator"
+
+# package
+TAG_PACKAGE_NAME = "PackageName"
+TAG_PACKAGE_VERSION = "PackageVersion"
+TAG_PACKAGE_DOWNLOAD_LOCATION = "PackageDownloadLocation"
+TAG_PACKAGE_LICENSE_CONCLUDED = "PackageLicenseConcluded"
+TAG_PACKAGE_LICENSE_DECLARED = "PackageLicenseDeclared"
+TAG_PACKAGE_COPYRIGHT_TEXT = "PackageCopyrightText"
+
+# file
+TAG_FILE_NAME = "FileName"
+TAG_FILE_LICENSE_CONCLUDED = "LicenseConcluded"
+TAG_FILE_LICENSE_INFO_IN_FILE = "LicenseInfoInFile"
+TAG_FILE_COPYRIGHT_TEXT = "FileCopyrightText"
+
+# extracted license
+TAG_LICENSE_ID = "LicenseID"
+TAG_LICENSE_EXTRACTED_TEXT = "ExtractedText"
+TAG_LICENSE_NAME = "LicenseName"
+
+# snippet; read only to tell its tags from the tags of the file before it
+TAG_SNIPPET_SPDX_ID = "SnippetSPDXID"
+
+SECTION_PACKAGE = "package"
+SECTION_FILE = "file"
+SECTION_EXTRACTED_LICENSE = "extracted license"
+SECTION_SNIPPET = "snippet"
+
+# tags which start a section
+SECTION_TAGS = {
+    TAG_PACKAGE_NAME: SECTION_PACKAGE,
+    TAG_FILE_NAME: SECTION_FILE,
+    TAG_LICENSE_ID: SECTION_EXTRACTED_LICENSE,
+    TAG_SNIPPET_SPDX_ID: SECTION_SNIPPET
+}
+
+# tags handed to the sections; the others (SPDXID, checksums, external refs, ...) are dropped while reading
+RECORDED_TAGS = set(SECTION_TAGS) | {
+    TAG_DOCUMENT_NAME,
+    TAG_CREATOR,
+    TAG_PACKAGE_VERSION,
+    TAG_PACKAGE_DOWNLOAD_LOCATION,
+    TAG_PACKAGE_LICENSE_CONCLUDED,
+    TAG_PACKAGE_LICENSE_DECLARED,
+    TAG_PACKAGE_COPYRIGHT_TEXT,
+    TAG_FILE_LICENSE_CONCLUDED,
+    TAG_FILE_LICENSE_INFO_IN_FILE,
+    TAG_FILE_COPYRIGHT_TEXT,
+    TAG_LICENSE_EXTRACTED_TEXT,
+    TAG_LICENSE_NAME
+}
+
+NOASSERTION = "NOASSERTION"
+
+TEXT_START = "<text>"
+TEXT_END = "</text>"
+
+logger = logging.getLogger("root")
+
+class Section():
+    def __init__(self, kind, line_number):
+        self.kind = kind
+        self.line_number = line_number
+        # tag -> values
+        self.tags = {}
+
+class Parser(parser.AbstractParser):
+    def __init__(self, file, merge_policy=parser.MERGE_POLICY_FIRST_WINS):
+        logger.debug("SPDX tag-value Parser class")
+        super().__init__(merge_policy)
+        self.file = file
+        self.document_name = None
+        self.creators = []
+        self.sections = set()
+
+    def validate_file(self, file):
+        # validate file contents : all necessary information should be in the file.
+        # the tags are checked while reading the file
+        # 1. document
+        # - DocumentName
+        # - Creator (Organization / Email)
+        # 2. package
+        # - PackageName
+        # - PackageDownloadLocation
+        # 3. file
+        # - FileName
+        # (the other package and file tags are optional)
+        with open(file, "r", encoding="utf-8-sig") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    if ":" not in line:
+                        raise ValueError("not a SPDX tag-value document: " + file)
+                    return
+
+    def validate_sections(self):
+        if not self.document_name:
+            raise ValueError("required tag is not existed: " + TAG_DOCUMENT_NAME)
+        if SECTION_PACKAGE not in self.sections:
+            raise ValueError("required tag is not existed: " + TAG_PACKAGE_NAME)
+
+    def validate_tags_exist(self, section, tags):
+        # validate necessary tags are existed
+        for tag in tags:
+            if tag not in section.tags:
+                raise ValueError("required tag is not existed: " + tag + " (" + section.kind + " at line " + str(section.line_number) + ")")
+
+    def iter_tags(self, f):
+        # yield (line number, tag, value) of the recorded tags of the document
+        # (the hot loop of the parser: one partition and one set lookup for most lines)
+        line_number = 0
+        for line in f:
+            line_number += 1
+            tag, separator, value = line.partition(":")
+            if not separator:
+                if line.isspace() or line.startswith("#"):
+                    continue
+                raise ValueError("invalid tag-value line " + str(line_number) + ": " + line.strip())
+            if tag not in RECORDED_TAGS:
+                if TEXT_START in value and not value.rstrip().endswith(TEXT_END):
+                    # still read over the text of the dropped tag
+                    line_number += self.read_text(f, tag, line_number, "")[1]
+                continue
+            value = value.strip()
+            if value.startswith(TEXT_START):
+                if value.endswith(TEXT_END) and len(value) >= len(TEXT_START) + len(TEXT_END):
+                    value = value[len(TEXT_START):-len(TEXT_END)].strip()
+                else:
+                    tag_line_number = line_number
+                    value, line_count = self.read_text(f, tag, line_number, value[len(TEXT_START):])
+                    line_number += line_count
+                    yield tag_line_number, tag, value
+                    continue
+            yield line_number, tag, value
+
+    def read_text(self, f, tag, line_number, first_line):
+        # <text> goes on over the next lines until </text>; returns the text and the number of lines read
+        text = [first_line, "\n"]
+        line_count = 0
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("</text> is not existed for the " + tag + " of line " + str(line_number))
+            line_count += 1
+            text.append(line)
+            if line.rstrip().endswith(TEXT_END):
+                return "".join(text).rstrip()[:-len(TEXT_END)].strip(), line_count
+
+    def value(self, section, tag):
+        values = section.tags.get(tag)
+        return values[0] if values else ""
+
+    def license_expression(self, section, tag):
+        # tags like LicenseInfoInFile are repeated once per license
+        values = section.tags.get(tag)
+        if not values:
+            return NOASSERTION
+        return self.remove_enclosed_parentheses(" AND ".join(values))
+
+    def creation_info(self):
+        # get organization & email
+        if not self.creators:
+            raise ValueError("required tag is not existed: " + TAG_CREATOR)
+        creation_info = {}
+        for creator in self.creators:
+            if 'Organization' in creator:
+                if '@' in creator:
+                    organization_email = creator.replace('Organization: ', '').split('(')
+                    creation_info['organization'] = organization_email[0].strip()
+                    creation_info['email'] = organization_email[1].replace(')', '')
+                else:
+                    raise ValueError("email info is not existed.")
+            elif 'SourceDownloadUrl' in creator:
+                creation_info['sourceDownloadUrl'] = creator.replace('SourceDownloadUrl:', '').strip()
+        self.doc["creationInfo"] = creation_info
+
+    def package(self, section):
+        self.validate_tags_exist(section, [
+            TAG_PACKAGE_NAME,
+            TAG_PACKAGE_DOWNLOAD_LOCATION
+        ])
+        return {
+            "name": self.value(section, TAG_PACKAGE_NAME),
+            "versionInfo": self.value(section, TAG_PACKAGE_VERSION),
+            "licenseConcluded": self.license_expression(section, TAG_PACKAGE_LICENSE_CONCLUDED),
+            "licenseDeclared": self.license_expression(section, TAG_PACKAGE_LICENSE_DECLARED),
+            "copyrightText": self.value(section, TAG_PACKAGE_COPYRIGHT_TEXT),
+            "downloadLocation": self.value(section, TAG_PACKAGE_DOWNLOAD_LOCATION)
+        }
+
+    def file_package(self, section):
+        self.validate_tags_exist(section, [
+            TAG_FILE_NAME
+        ])
+        package_name, package_version = self.extract_package_name_and_package_version(self.value(section, TAG_FILE_NAME))
+        return {
+            "name": package_name,
+            "versionInfo": package_version,
+            "licenseConcluded": self.license_expression(section, TAG_FILE_LICENSE_CONCLUDED),
+            "licenseDeclared": self.license_expression(section, TAG_FILE_LICENSE_INFO_IN_FILE),
+            "copyrightText": self.value(section, TAG_FILE_COPYRIGHT_TEXT),
+            "downloadLocation": ""
+        }
+
+    def extracted_license(self, section):
+        self.validate_tags_exist(section, [
+            TAG_LICENSE_ID,
+            TAG_LICENSE_EXTRACTED_TEXT
+        ])
+        return {
+            "identifier": self.value(section, TAG_LICENSE_ID),
+            "licenseName": self.value(section, TAG_LICENSE_NAME),
+            "extractedText": self.value(section, TAG_LICENSE_EXTRACTED_TEXT)
+        }
+
+    def end_section(self, section):
+        if section is None:
+            return
+        self.sections.add(section.kind)
+        if section.kind == SECTION_PACKAGE:
+            self.append_package(self.package(section))
+        elif section.kind == SECTION_FILE:
+            self.append_package(self.file_package(section))
+        elif section.kind == SECTION_EXTRACTED_LICENSE:
+            self.doc["extracted_license"].append(self.extracted_license(section))
+
+    def stream(self):
+        # read the document once, one section at a time
+        section = None
+        with open(self.file, "r", encoding="utf-8-sig") as f:
+            for line_number, tag, value in self.iter_tags(f):
+                kind = SECTION_TAGS.get(tag)
+                if kind is not None:
+                    self.end_section(section)
+                    section = Section(kind, line_number)
+                elif tag == TAG_DOCUMENT_NAME:
+                    self.document_name = value
+                    continue
+                elif tag == TAG_CREATOR:
+                    self.creators.append(value)
+                    continue
+                elif section is None:
+                    continue
+                section.tags.setdefault(tag, []).append(value)
+            self.end_section(section)
+
+    def document_info(self):
+        # packages, files and extracted licenses are all read in this single pass
+        self.stream()
+        self.validate_sections()
+        self.doc["name"] = self.document_name
+        self.creation_info()
+
+    def package_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def per_file_info(self):
+        # appended while streaming (see document_info)
+        pass
+
+    def extracted_license_info(self):
+        # appended while streaming (see document_info)
+        pass
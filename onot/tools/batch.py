@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import click
+import requests
+from onot.parsing.parse import parse_file, supported_suffixes
+from onot.parsing import parser
+from onot.parsing import spdx_license
+from onot.parsing import license_cache
+from onot.parsing import doc_cache
+from onot.generating.output import output_directory
+from onot.generating.generate import generate_notice, parse_output_formats
+
+# Notices of many SPDX documents in one run.
+#
+# The inputs are spread over a pool of processes. The license lists are loaded once,
+# before the pool starts; forked workers inherit them with the rest of the registry
+# and share the license details through the license cache on disk. Spawned workers
+# (where fork is not available) load the lists from that cache.
+#
+# Every input is parsed and generated on its own; a failing input is recorded in the
+# report and the batch goes on.
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+logger = logging.getLogger("root")
+
+def collect_inputs(inputs, manifest=None):
+    # files, directories (the files of a supported format in them) and glob patterns,
+    # then the files listed in the manifest, one per line. relative paths in the manifest
+    # are relative to the manifest. duplicates are dropped, the order is kept.
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            suffixes = tuple(supported_suffixes())
+            files.extend(os.path.join(item, name) for name in sorted(os.listdir(item))
+                         if name.lower().endswith(suffixes) and os.path.isfile(os.path.join(item, name)))
+        elif glob.has_magic(item):
+            files.extend(path for path in sorted(glob.glob(item, recursive=True)) if os.path.isfile(path))
+        else:
+            files.append(item)
+    if manifest is not None:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, "r", encoding="UTF-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    files.append(os.path.join(base, line))
+    unique = []
+    seen = set()
+    for file in files:
+        key = os.path.abspath(file)
+        if key not in seen:
+            seen.add(key)
+            unique.append(file)
+    return unique
+
+def init_worker(options):
+    # forked workers already have the registry of the batch, with the license lists loaded
+    if not spdx_license.reset_connections():
+        spdx_license.configure(**options)
+
+def run_one(infile, output_formats, merge_policy, cache=None, deterministic=False, tag=None):
+    # parse one input and generate its notices; never raises
+    # tag: added to the names of the notices, unique per input, as documents of
+    #      the same name are processed at the same time
+    started = time.perf_counter()
+    result = {"input": infile, "status": STATUS_OK, "error": None, "outputs": [], "packages": 0, "licenses": 0}
+    try:
+        doc = parse_file(infile, merge_policy, cache)
+        result["packages"] = len(doc["packages"])
+        result["licenses"] = len(doc["licenses"])
+        result["outputs"] = generate_notice(doc, output_formats, deterministic=deterministic, tag=tag)
+    except Exception as ex:
+        logger.warning("failed - " + infile + ": " + str(ex))
+        result["status"] = STATUS_FAILED
+        result["error"] = type(ex).__name__ + ": " + str(ex)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+def get_context():
+    # fork shares the loaded registry with the workers; not available on Windows
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def run_batch(inputs, output_formats, processes=None, options=None, merge_policy=parser.MERGE_POLICY_FIRST_WINS, on_result=None, cache=None, deterministic=False):
+    # inputs: list of files
+    # options: keyword arguments of spdx_license.configure
+    # cache: doc_cache.DocCache shared by the workers, or None
+    # deterministic: see generate_notice
+    # on_result: called with each result as soon as its input is done
+    # returns the results in the order of the inputs
+    options = options or {}
+    spdx_license.configure(**options)
+    try:
+        spdx_license.get_registry().load()
+    except (license_cache.LicenseNotCachedError, requests.exceptions.RequestException) as ex:
+        # the workers fall back to the bundled database, or report the error per input
+        logger.warning("could not load the spdx license list: " + str(ex))
+
+    processes = max(min(processes or os.cpu_count() or 1, len(inputs)), 1)
+    results = [None] * len(inputs)
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context(),
+                             initializer=init_worker, initargs=(options,)) as executor:
+        futures = {executor.submit(run_one, infile, output_formats, merge_policy, cache, deterministic, index + 1): index
+                   for index, infile in enumerate(inputs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as ex:
+                # the worker itself died (e.g. killed or out of memory)
+                result = {"input": inputs[index], "status": STATUS_FAILED, "error": type(ex).__name__ + ": " + str(ex),
+                          "outputs": [], "packages": 0, "licenses": 0, "seconds": None}
+            results[index] = result
+            if on_result is not None:
+                on_result(result)
+    return results
+
+def make_report(results, output_formats, processes, seconds):
+    failed = sum(1 for result in results if result["status"] != STATUS_OK)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "output_formats": output_formats,
+        "processes": processes,
+        "seconds": round(seconds, 3),
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results
+    }
+
+def report_file_path():
+    date_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_directory(), "onot_batch_report_" + date_time + ".json")
+
+def write_report(report, path):
+    directory_name = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(directory_name):
+        os.makedirs(directory_name)
+    with open(path, "w", encoding="UTF-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+def echo_result(result):
+    seconds = "-" if result["seconds"] is None else "%.2fs" % result["seconds"]
+    line = "%-6s %8s  %s" % (result["status"], seconds, result["input"])
+    if result["error"]:
+        line += "  (" + result["error"] + ")"
+    click.echo(line)
+
+@click.command(context_settings=CONTEXT_SETTINGS, help="This creates the OSS Notices of many SPDX documents at once.\n ex) onot batch sboms/ 'release/**/*.rdf.xml' -o html,text -j 8")
+@click.argument('inputs', nargs=-1, type=click.STRING)
+@click.option('-m', '--manifest', type=click.Path(exists=True, dir_okay=False), default=None, help="File listing the input files, one per line.")
+@click.option('-o', '--output_format', type=click.STRING, required=True, help="Write the output file format. Several formats are separated by commas (html,text).")
+@click.option('-j', '--processes', type=click.IntRange(min=1), default=None, help="Number of documents processed at the same time. (default: number of CPUs)")
+@click.option('--report', type=click.STRING, default=None, help="Path of the JSON summary report. (default: output/onot_batch_report_<time>.json)")
+@click.option('--deterministic', is_flag=True, default=False, help="Name the notices after the hash of their contents instead of the time, and keep identical notices which are already there.")
+@click.option('--offline', is_flag=True, default=False, help="Never access spdx.org. Licenses must already be in the license cache.")
+@click.option('--cache_dir', type=click.STRING, default=None, help="Directory of the license cache. (default: $ONOT_CACHE_DIR or ~/.cache/onot)")
+@click.option('--cache_ttl', type=click.INT, default=license_cache.DEFAULT_TTL, show_default=True, help="Seconds a cached license is used before it is revalidated with spdx.org.")
+@click.option('--max_workers', type=click.IntRange(min=1), default=spdx_license.DEFAULT_MAX_WORKERS, show_default=True, help="Number of licenses downloaded from spdx.org at the same time, per process.")
+@click.option('--timeout', type=click.FLOAT, default=spdx_license.DEFAULT_TIMEOUT, show_default=True, help="Seconds to wait for spdx.org per request.")
+@click.option('--retries', type=click.IntRange(min=0), default=spdx_license.DEFAULT_RETRIES, show_default=True, help="Number of retries of a failed request to spdx.org.")
+@click.option('--no_doc_cache', is_flag=True, default=False, help="Parse the input even if it has not changed since the last run.")
+@click.option('--doc_cache_size', type=click.IntRange(min=0), default=doc_cache.DEFAULT_MAX_SIZE // (1024 * 1024), show_default=True, help="Megabytes of parsed documents kept in the cache directory.")
+@click.option('--merge_policy', type=click.Choice(parser.MERGE_POLICIES), default=parser.MERGE_POLICY_FIRST_WINS, show_default=True, help="What to do with packages of the same name and version.")
+def main(inputs, manifest, output_format, processes, report, deterministic, offline, cache_dir, cache_ttl, max_workers, timeout, retries, no_doc_cache, doc_cache_size, merge_policy):
+    """
+    This creates the oss notices of several spdx documents with a pool of processes.
+
+    Params
+    ----------
+    inputs: tuple
+        input files, directories and glob patterns
+    manifest: str
+        file listing more input files, one per line
+    output_format: str
+        html, text or both (html,text)
+    processes: int
+        number of worker processes
+    report: str
+        path of the json report with the status, the timings and the notices of every input
+    deterministic: bool
+        if True, the notices are named after the hash of their contents and not written again if they are unchanged
+    (the other options are the ones of create)
+    """
+    try:
+        output_formats = parse_output_formats(output_format)
+    except ValueError:
+        raise click.UsageError("Sorry! Current version only supports html,text type output.")
+    files = collect_inputs(inputs, manifest)
+    if not files:
+        raise click.UsageError("no input files")
+
+    options = dict(cache_dir=cache_dir, cache_ttl=cache_ttl, offline=offline,
+                   max_workers=max_workers, timeout=timeout, retries=retries)
+    processes = processes or os.cpu_count() or 1
+    started = time.perf_counter()
+    cache = None if no_doc_cache else doc_cache.DocCache(cache_dir, doc_cache_size * 1024 * 1024)
+    results = run_batch(files, output_formats, processes, options, merge_policy, on_result=echo_result, cache=cache, deterministic=deterministic)
+    summary = make_report(results, output_formats, processes, time.perf_counter() - started)
+
+    report = report or report_file_path()
+    write_report(summary, report)
+    click.echo("%d succeeded, %d failed in %.2fs - report: %s" % (summary["succeeded"], summary["failed"], summary["seconds"], report))
+    if summary["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import click
+from onot.parsing import license_db
+from onot.log import log_setting
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+@click.command(context_settings=CONTEXT_SETTINGS, help="This refreshes the bundled SPDX license database from a license-list-data checkout.\n ex) onot-license-db -s ~/license-list-data")
+@click.option('-s', '--source', type=click.Path(exists=True, file_okay=False), required=True, help="Checkout of https://github.com/spdx/license-list-data")
+@click.option('-o', '--output', type=click.Path(dir_okay=False), default=license_db.BUNDLED_DATABASE_PATH, show_default=True, help="Write the license database file name.")
+def main(source, output):
+    log_setting.init()
+    license_db.build(source, output)
+    database = license_db.LicenseDatabase(output)
+    click.echo("license list version " + str(database.license_list_version) + ", " + str(database.count) + " licenses - " + output)
+    database.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib
+
+import click
+from onot.tools import create_notice
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+DEFAULT_COMMAND = "create"
+
+# commands imported only when they run, so "onot create" does not load the
+# process pool and the server
+LAZY_COMMANDS = {
+    "batch": "onot.tools.batch",
+    "serve": "onot.tools.serve",
+}
+
+class DefaultCommandGroup(click.Group):
+    # runs the default command if the first argument is not a command,
+    # so "onot -i sbom.xlsx -o html" keeps working next to "onot batch ..."
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.list_commands(ctx) and args[0] not in self.get_help_option_names(ctx):
+            args = [DEFAULT_COMMAND] + list(args)
+        return super().parse_args(ctx, args)
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(LAZY_COMMANDS))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in LAZY_COMMANDS and cmd_name not in self.commands:
+            self.add_command(importlib.import_module(LAZY_COMMANDS[cmd_name]).main, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+@click.group(cls=DefaultCommandGroup, context_settings=CONTEXT_SETTINGS, help="This creates OSS Notices from SPDX documents.\n ex) onot -i sample/SPDXRdfExample-v2.1.xlsx -o html")
+def main():
+    pass
+
+main.add_command(create_notice.main, DEFAULT_COMMAND)
+
+if __name__ == "__main__":
+    main()
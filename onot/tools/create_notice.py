@@ -6,7 +6,12 @@ import logging
 
 import click
 from onot.parsing.parse import parse_file
-from onot.generating.generate import generate_notice
+from onot.parsing import parser
+from onot.parsing import spdx_license
+from onot.parsing import license_cache
+from onot.parsing import doc_cache
+from onot.log import metrics
+from onot.generating.generate import generate_notice, write_notice, parse_output_formats
 
 # override the help option so that you can also see help with -h
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
@@ -14,8 +19,21 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 @click.command(context_settings=CONTEXT_SETTINGS, help="This creates an OSS Notice file based don the excel format SPDX document.\n ex) onot -i sample/SPDXRdfExample-v2.1.xlsx -o html")
 # @click.argument('input')
 @click.option('-i', '--input', type=click.STRING, required=True, help="Write the input file name.")
-@click.option('-o', '--output_format', type=click.STRING, required=True, help="Write the output file format.")
-def main(input, output_format):
+@click.option('-o', '--output_format', type=click.STRING, required=True, help="Write the output file format. Several formats are separated by commas (html,text).")
+@click.option('--offline', is_flag=True, default=False, help="Never access spdx.org. Licenses must already be in the license cache.")
+@click.option('--cache_dir', type=click.STRING, default=None, help="Directory of the license cache. (default: $ONOT_CACHE_DIR or ~/.cache/onot)")
+@click.option('--cache_ttl', type=click.INT, default=license_cache.DEFAULT_TTL, show_default=True, help="Seconds a cached license is used before it is revalidated with spdx.org.")
+@click.option('--max_workers', type=click.IntRange(min=1), default=spdx_license.DEFAULT_MAX_WORKERS, show_default=True, help="Number of licenses downloaded from spdx.org at the same time.")
+@click.option('--timeout', type=click.FLOAT, default=spdx_license.DEFAULT_TIMEOUT, show_default=True, help="Seconds to wait for spdx.org per request.")
+@click.option('--retries', type=click.IntRange(min=0), default=spdx_license.DEFAULT_RETRIES, show_default=True, help="Number of retries of a failed request to spdx.org.")
+@click.option('--no_doc_cache', is_flag=True, default=False, help="Parse the input even if it has not changed since the last run.")
+@click.option('--doc_cache_size', type=click.IntRange(min=0), default=doc_cache.DEFAULT_MAX_SIZE // (1024 * 1024), show_default=True, help="Megabytes of parsed documents kept in the cache directory.")
+@click.option('--deterministic', is_flag=True, default=False, help="Name the notice after the hash of its contents instead of the time, and keep an identical notice which is already there.")
+@click.option('--stdout', is_flag=True, default=False, help="Write the notice to the standard output instead of a file in the output directory.")
+@click.option('--metrics', 'metrics_path', type=click.STRING, default=None, help="Write the time of every stage, the downloads, the counts and the peak memory of the run to this JSON file.")
+@click.option('--profile', 'profile_path', type=click.STRING, default=None, help="Write the stages of the run to this Chrome trace-event file (chrome://tracing, Perfetto).")
+@click.option('--merge_policy', type=click.Choice(parser.MERGE_POLICIES), default=parser.MERGE_POLICY_FIRST_WINS, show_default=True, help="What to do with packages of the same name and version.")
+def main(input, output_format, offline, cache_dir, cache_ttl, max_workers, timeout, retries, no_doc_cache, doc_cache_size, deterministic, stdout, metrics_path, profile_path, merge_policy):
     """
     This creates the packages of the spdx document as oss notice.
 
@@ -23,22 +41,80 @@ def main(input, output_format):
     ----------
     input: str
         excel format spdx document file name
-    html_format: bool
-        if True, only create html format oss notice
-    text_format: bool
-        if True, only create text format oss notice
+    output_format: str
+        html, text or both (html,text); the document is parsed once for all of them
+    offline: bool
+        if True, spdx.org is never accessed and only the license cache is used
+    cache_dir: str
+        directory of the license cache
+    cache_ttl: int
+        seconds a cached license is used without revalidation
+    max_workers: int
+        number of concurrent license downloads
+    timeout: float
+        seconds to wait for spdx.org per request
+    retries: int
+        number of retries of a failed request
+    no_doc_cache: bool
+        if True, the input is parsed even if its parsed document is in the cache
+    doc_cache_size: int
+        megabytes of parsed documents kept in the cache
+    deterministic: bool
+        if True, the notice is named after the hash of its contents and not written again if it is unchanged
+    stdout: bool
+        if True, write the notice to the standard output (e.g. to pipe it) instead of a file
+    metrics_path: str
+        json file of the timings and counters of the run
+    profile_path: str
+        chrome trace-event file of the stages of the run
+    merge_policy: str
+        first-wins, merge-licenses or last-wins for packages of the same name and version
     """
     logger = logging.getLogger()
     logger.debug('called create')
     logger.debug("input - " + input)
     logger.debug("output - " + output_format)
 
-    if output_format == 'html' or output_format == 'text':
+    if metrics_path is not None or profile_path is not None:
+        metrics.start()
+    try:
+        create(input, output_format, offline, cache_dir, cache_ttl, max_workers, timeout, retries,
+               no_doc_cache, doc_cache_size, deterministic, stdout, merge_policy)
+    finally:
+        recorded = metrics.stop()
+        if recorded is not None:
+            if metrics_path is not None:
+                recorded.write_json(metrics_path)
+                logger.debug("metrics are here - " + metrics_path)
+            if profile_path is not None:
+                recorded.write_trace(profile_path)
+                logger.debug("profile is here - " + profile_path)
+
+def create(input, output_format, offline, cache_dir, cache_ttl, max_workers, timeout, retries,
+           no_doc_cache, doc_cache_size, deterministic, stdout, merge_policy):
+    logger = logging.getLogger()
+    spdx_license.configure(cache_dir=cache_dir, cache_ttl=cache_ttl, offline=offline,
+                           max_workers=max_workers, timeout=timeout, retries=retries)
+
+    try:
+        output_formats = parse_output_formats(output_format)
+    except ValueError:
+        output_formats = None
+    if output_formats:
+        if stdout and len(output_formats) > 1:
+            raise click.UsageError("--stdout takes a single output format")
+
         # parse excel,xml file
-        doc = parse_file(input)
+        cache = None if no_doc_cache else doc_cache.DocCache(cache_dir, doc_cache_size * 1024 * 1024)
+        doc = parse_file(input, merge_policy, cache)
 
         # generate html,text format oss notice
-        generate_notice(doc, output_format)
+        if stdout:
+            stream = click.get_text_stream('stdout', encoding='UTF-8')
+            write_notice(doc, output_formats[0], stream)
+            stream.flush()
+        else:
+            generate_notice(doc, output_formats, deterministic=deterministic)
     else:
         logger.warning("Sorry! Current version only supports html,text type output.")
 
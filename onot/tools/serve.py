@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import os
+import json
+import queue
+import logging
+import tempfile
+import threading
+import socketserver
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import click
+import requests
+from onot.parsing.parse import parse_file, load_parsers
+from onot.parsing import parser
+from onot.parsing import spdx_license
+from onot.parsing import license_cache
+from onot.parsing import doc_cache
+from onot.generating.generate import write_notice, OUTPUT_FORMATS
+
+# Long-running notice service.
+#
+#   POST /notice?format=html|text[&filename=sbom.rdf.xml][&merge_policy=...]
+#        body: the SPDX document; the response is the notice
+#   GET  /health
+#
+# The parsers are imported and the license lists loaded once at start; the license
+# details stay in the registry between requests. Connections are handled by a fixed
+# number of worker threads. Connections which arrive while all workers are busy wait
+# in a bounded queue; when the queue is full they are answered with 503 at once.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_MAX_UPLOAD_SIZE = 512 * 1024 * 1024
+# seconds a worker waits for a slow client
+REQUEST_TIMEOUT = 60
+COPY_BUFFER_SIZE = 1024 * 1024
+
+CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "text": "text/plain; charset=utf-8"
+}
+
+SERVICE_UNAVAILABLE = (b"HTTP/1.0 503 Service Unavailable\r\n"
+                       b"Content-Type: text/plain; charset=utf-8\r\n"
+                       b"Retry-After: 1\r\n"
+                       b"Connection: close\r\n\r\n"
+                       b"too many requests\n")
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+logger = logging.getLogger("root")
+
+class WorkerPoolMixIn():
+    # handle the connections with `workers` threads; at most `queue_size` connections wait
+    def start_workers(self, workers, queue_size):
+        self.jobs = queue.Queue(queue_size)
+        self.active = 0
+        self.active_lock = threading.Lock()
+        self.workers = [threading.Thread(target=self.work, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def process_request(self, request, client_address):
+        try:
+            self.jobs.put_nowait((request, client_address))
+        except queue.Full:
+            logger.warning("queue is full, reject a request")
+            try:
+                request.sendall(SERVICE_UNAVAILABLE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            request, client_address = job
+            with self.active_lock:
+                self.active += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self.active_lock:
+                    self.active -= 1
+
+    def stop_workers(self):
+        for _ in self.workers:
+            self.jobs.put(None)
+        for worker in self.workers:
+            worker.join()
+
+class NoticeHTTPServer(WorkerPoolMixIn, HTTPServer):
+    pass
+
+# unix sockets are not available on Windows
+if hasattr(socketserver, "UnixStreamServer"):
+    class NoticeUnixServer(WorkerPoolMixIn, socketserver.UnixStreamServer):
+        pass
+else:
+    NoticeUnixServer = None
+
+class NoticeRequestHandler(BaseHTTPRequestHandler):
+    server_version = "onot"
+    timeout = REQUEST_TIMEOUT
+
+    def log_message(self, format, *args):
+        # client_address is empty on a unix socket
+        logger.debug("serve - " + format % args)
+
+    def send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, document):
+        self.send_body(status, json.dumps(document).encode("UTF-8"), "application/json")
+
+    def send_failure(self, status, message):
+        self.send_json(status, {"error": message})
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            self.send_failure(404, "not found: " + self.path)
+            return
+        self.send_json(200, {
+            "status": "ok",
+            "workers": len(self.server.workers),
+            "active": self.server.active,
+            "queued": self.server.jobs.qsize()
+        })
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/notice":
+            self.send_failure(404, "not found: " + self.path)
+            return
+        query = parse_qs(url.query)
+        output_format = query.get("format", ["html"])[0]
+        if output_format not in OUTPUT_FORMATS:
+            self.send_failure(400, "unsupported output format: " + output_format)
+            return
+        merge_policy = query.get("merge_policy", [self.server.merge_policy])[0]
+        if merge_policy not in parser.MERGE_POLICIES:
+            self.send_failure(400, "unknown merge policy: " + merge_policy)
+            return
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self.send_failure(411, "Content-Length is required")
+            return
+        length = int(length)
+        if length > self.server.max_upload_size:
+            self.send_failure(413, "the document is larger than " + str(self.server.max_upload_size) + " bytes")
+            return
+
+        # the parsers read files; the suffix of the uploaded name helps if the contents are not recognized
+        name = os.path.basename(query.get("filename", [""])[0])
+        fd, path = tempfile.mkstemp(prefix="onot_", suffix="_" + name if name else "")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                remaining = length
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, COPY_BUFFER_SIZE))
+                    if not chunk:
+                        self.send_failure(400, "the document ended after " + str(length - remaining) + " bytes")
+                        return
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            try:
+                doc = parse_file(path, merge_policy, self.server.doc_cache)
+            except (license_cache.LicenseNotCachedError, requests.exceptions.RequestException) as ex:
+                self.send_failure(503, str(ex))
+                return
+            except Exception as ex:
+                logger.warning("could not parse the document: " + str(ex))
+                self.send_failure(400, "could not parse the document: " + str(ex))
+                return
+        finally:
+            os.remove(path)
+
+        stream = io.StringIO()
+        write_notice(doc, output_format, stream)
+        self.send_body(200, stream.getvalue().encode("UTF-8"), CONTENT_TYPES[output_format])
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                max_upload_size=DEFAULT_MAX_UPLOAD_SIZE, merge_policy=parser.MERGE_POLICY_FIRST_WINS, cache=None):
+    # the server listens on socket_path if it is given, else on host:port.
+    # cache: doc_cache.DocCache for documents posted again, or None
+    # configure spdx_license before; call serve_forever to take requests.
+    if socket_path is not None:
+        if NoticeUnixServer is None:
+            raise ValueError("unix sockets are not supported on this platform")
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = NoticeUnixServer(socket_path, NoticeRequestHandler)
+    else:
+        server = NoticeHTTPServer((host, port), NoticeRequestHandler)
+    server.max_upload_size = max_upload_size
+    server.merge_policy = merge_policy
+    server.doc_cache = cache
+    server.start_workers(workers, queue_size)
+    return server
+
+def warm_up():
+    # everything a request would otherwise load first
+    load_parsers()
+    try:
+        spdx_license.get_registry().load()
+    except (license_cache.LicenseNotCachedError, requests.exceptions.RequestException) as ex:
+        logger.warning("could not load the spdx license list: " + str(ex))
+
+@click.command(context_settings=CONTEXT_SETTINGS, help="This runs onot as a local service which returns the OSS Notice of a posted SPDX document.\n ex) onot serve --port 8080 --offline")
+@click.option('--host', type=click.STRING, default=DEFAULT_HOST, show_default=True, help="Address to listen on.")
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=DEFAULT_PORT, show_default=True, help="Port to listen on.")
+@click.option('--socket', 'socket_path', type=click.STRING, default=None, help="Listen on this unix socket instead of host and port.")
+@click.option('--workers', type=click.IntRange(min=1), default=DEFAULT_WORKERS, show_default=True, help="Number of requests handled at the same time.")
+@click.option('--queue_size', type=click.IntRange(min=1), default=DEFAULT_QUEUE_SIZE, show_default=True, help="Number of requests waiting for a worker; more are answered with 503.")
+@click.option('--max_upload_size', type=click.IntRange(min=1), default=DEFAULT_MAX_UPLOAD_SIZE, show_default=True, help="Largest accepted document in bytes.")
+@click.option('--offline', is_flag=True, default=False, help="Never access spdx.org. Licenses must already be in the license cache.")
+@click.option('--cache_dir', type=click.STRING, default=None, help="Directory of the license cache. (default: $ONOT_CACHE_DIR or ~/.cache/onot)")
+@click.option('--cache_ttl', type=click.INT, default=license_cache.DEFAULT_TTL, show_default=True, help="Seconds a cached license is used before it is revalidated with spdx.org.")
+@click.option('--max_workers', type=click.IntRange(min=1), default=spdx_license.DEFAULT_MAX_WORKERS, show_default=True, help="Number of licenses downloaded from spdx.org at the same time.")
+@click.option('--timeout', type=click.FLOAT, default=spdx_license.DEFAULT_TIMEOUT, show_default=True, help="Seconds to wait for spdx.org per request.")
+@click.option('--retries', type=click.IntRange(min=0), default=spdx_license.DEFAULT_RETRIES, show_default=True, help="Number of retries of a failed request to spdx.org.")
+@click.option('--no_doc_cache', is_flag=True, default=False, help="Parse the input even if it has not changed since the last run.")
+@click.option('--doc_cache_size', type=click.IntRange(min=0), default=doc_cache.DEFAULT_MAX_SIZE // (1024 * 1024), show_default=True, help="Megabytes of parsed documents kept in the cache directory.")
+@click.option('--merge_policy', type=click.Choice(parser.MERGE_POLICIES), default=parser.MERGE_POLICY_FIRST_WINS, show_default=True, help="Default of what to do with packages of the same name and version.")
+def main(host, port, socket_path, workers, queue_size, max_upload_size, offline, cache_dir, cache_ttl, max_workers, timeout, retries, no_doc_cache, doc_cache_size, merge_policy):
+    """
+    This serves oss notices over http until it is interrupted.
+
+    Params
+    ----------
+    host, port: str, int
+        address of the http server
+    socket_path: str
+        unix socket to listen on instead of host and port
+    workers: int
+        number of worker threads
+    queue_size: int
+        number of connections waiting for a worker
+    max_upload_size: int
+        largest accepted document in bytes
+    (the other options are the ones of create)
+    """
+    if socket_path is not None and NoticeUnixServer is None:
+        raise click.UsageError("--socket is not supported on this platform; use --host and --port")
+    spdx_license.configure(cache_dir=cache_dir, cache_ttl=cache_ttl, offline=offline,
+                           max_workers=max_workers, timeout=timeout, retries=retries)
+    warm_up()
+
+    cache = None if no_doc_cache else doc_cache.DocCache(cache_dir, doc_cache_size * 1024 * 1024)
+    server = make_server(host, port, socket_path, workers, queue_size, max_upload_size, merge_policy, cache)
+    click.echo("onot serves on " + (socket_path if socket_path is not None else "http://%s:%d/" % server.server_address[:2]), err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.stop_workers()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import os
+import sys
+import time
+import random
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+import click
+
+# Synthetic SPDX documents for load tests and benchmarks.
+#
+# The documents look like the ones onot gets from scanners: most packages have a
+# single license, some a compound expression or an extracted license (LicenseRef-),
+# some are listed more than once and some come from the Per File Info sheet.
+# Everything is derived from the seed, so the same options give the same document.
+#
+# The writers stream: the Excel sheets and the RDF/XML are written row by row,
+# so the size of a document is not limited by memory.
+
+FORMAT_EXCEL = "excel"
+FORMAT_RDF_XML = "rdf-xml"
+FORMATS = [FORMAT_EXCEL, FORMAT_RDF_XML]
+SUFFIXES = {".xlsx": FORMAT_EXCEL, ".rdf": FORMAT_RDF_XML, ".xml": FORMAT_RDF_XML}
+
+LICENSE_IDS = ["MIT", "Apache-2.0", "BSD-3-Clause", "BSD-2-Clause", "GPL-2.0-only", "GPL-3.0-only",
+               "LGPL-2.1-only", "MPL-2.0", "ISC", "MIT-0"]
+EXCEPTION_IDS = ["Classpath-exception-2.0"]
+
+LICENSE_URL_PREFIX = "http://spdx.org/licenses/"
+DOCUMENT_NAMESPACE = "http://example.com/spdxdocs/"
+ORGANIZATION = "Organization: ExampleCodeInspect (opensource@email.com)"
+
+# distinct license expressions of a document; real documents repeat a few expressions
+EXPRESSION_POOL_SIZE = 64
+# share of the expressions with a single license
+SINGLE_LICENSE_RATIO = 0.7
+WITH_EXCEPTION_RATIO = 0.1
+EXTRACTED_TEXT_LINE = "Permission is hereby granted to use, copy and distribute the {name} software. "
+
+RDF_OPERATORS = {"OR": "DisjunctiveLicenseSet", "AND": "ConjunctiveLicenseSet"}
+
+class SyntheticDocument():
+    # packages: rows of the Package Info sheet
+    # files: rows of the Per File Info sheet; each is another package
+    # license_complexity: largest number of licenses in an expression
+    # duplicate_ratio: share of the packages which repeat the name and version of an earlier one
+    # extracted_licenses: number of extracted licenses (LicenseRef-)
+    # extracted_ratio: share of the packages and files licensed under an extracted license
+    # extracted_text_size: characters of the text of an extracted license
+    def __init__(self, packages=1000, files=0, license_complexity=3, duplicate_ratio=0.05,
+                 extracted_licenses=10, extracted_ratio=0.02, extracted_text_size=1000,
+                 license_ids=LICENSE_IDS, exception_ids=EXCEPTION_IDS, seed=0, name=None):
+        for ratio in [duplicate_ratio, extracted_ratio]:
+            if not 0 <= ratio <= 1:
+                raise ValueError("a ratio is between 0 and 1: " + str(ratio))
+        if license_complexity < 1:
+            raise ValueError("license_complexity is at least 1: " + str(license_complexity))
+        if not license_ids:
+            raise ValueError("license_ids is empty")
+        self.packages = packages
+        self.files = files
+        self.license_complexity = license_complexity
+        self.duplicate_ratio = duplicate_ratio
+        self.extracted_licenses = extracted_licenses if extracted_ratio > 0 else 0
+        self.extracted_ratio = extracted_ratio if extracted_licenses > 0 else 0
+        self.extracted_text_size = extracted_text_size
+        self.license_ids = list(license_ids)
+        self.exception_ids = list(exception_ids)
+        self.seed = seed
+        self.name = name if name else "synthetic-%d" % packages
+        self.expressions = self.make_expressions(random.Random(seed))
+
+    def make_expressions(self, rng):
+        # license expressions as trees: an id, or (operator, operand, operand)
+        # the licenses of one expression are all different, as in real documents
+        expressions = []
+        for _ in range(EXPRESSION_POOL_SIZE):
+            count = 1
+            if self.license_complexity > 1 and rng.random() >= SINGLE_LICENSE_RATIO:
+                count = min(rng.randint(2, self.license_complexity), len(self.license_ids))
+            license_ids = rng.sample(self.license_ids, count)
+            expression = self.make_license(rng, license_ids[0])
+            for license_id in license_ids[1:]:
+                expression = (rng.choice(["AND", "OR"]), expression, self.make_license(rng, license_id))
+            expressions.append(expression)
+        return expressions
+
+    def make_license(self, rng, license_id):
+        # exceptions go with the GPL family, as in real documents
+        if self.exception_ids and "GPL" in license_id and rng.random() < WITH_EXCEPTION_RATIO:
+            return ("WITH", license_id, rng.choice(self.exception_ids))
+        return license_id
+
+    def license_of(self, rng):
+        if self.extracted_licenses and rng.random() < self.extracted_ratio:
+            return "LicenseRef-%d" % rng.randrange(self.extracted_licenses)
+        return self.expressions[rng.randrange(len(self.expressions))]
+
+    def iter_packages(self):
+        # (name, version, license, copyright, download location)
+        rng = random.Random(self.seed + 1)
+        for index in range(self.packages):
+            original = index
+            if index > 0 and rng.random() < self.duplicate_ratio:
+                original = rng.randrange(index)
+            # the attributes of a package depend only on its index, so a duplicate repeats them
+            package_rng = random.Random(self.seed * 1000003 + original)
+            name = "package-%d" % original
+            yield (name, "%d.%d.%d" % (original % 7, original % 13, original % 5), self.license_of(package_rng),
+                   "Copyright (c) %d The %s Authors" % (2000 + original % 23, name),
+                   "https://example.com/%s.tar.gz" % name)
+
+    def iter_files(self):
+        # (file name, license, copyright, homepage)
+        rng = random.Random(self.seed + 2)
+        for index in range(self.files):
+            # the name and version of the package are taken from the file name; the name has no digits
+            name = "lib" + letters(index)
+            yield ("./lib/%s-%d.%d.%d.jar" % (name, index % 3, index % 11, index % 7), self.license_of(rng),
+                   "Copyright %s" % name, "https://example.com/" + name)
+
+    def iter_extracted_licenses(self):
+        # (identifier, name, text)
+        for index in range(self.extracted_licenses):
+            name = "Extracted License %d" % index
+            line = EXTRACTED_TEXT_LINE.format(name=name)
+            text = (line * (self.extracted_text_size // len(line) + 1))[:self.extracted_text_size]
+            yield ("LicenseRef-%d" % index, name, text)
+
+def letters(number):
+    # 0 -> a, 25 -> z, 26 -> ba, ...
+    text = ""
+    while True:
+        number, digit = divmod(number, 26)
+        text = chr(ord("a") + digit) + text
+        if number == 0:
+            return text
+
+def expression_text(expression, top=True):
+    if isinstance(expression, str):
+        return expression
+    operator, left, right = expression
+    text = expression_text(left, False) + " " + operator + " " + expression_text(right, False)
+    return text if top or operator == "WITH" else "(" + text + ")"
+
+# a workbook of inline strings, written straight into the zip: openpyxl, even in
+# write-only mode, writes fewer than 20k rows a second, too slow for millions of rows
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{sheets}</Types>')
+XLSX_CONTENT_TYPE_SHEET = ('<Override PartName="/xl/worksheets/sheet{index}.xml" '
+                           'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>')
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>{sheets}</sheets></workbook>')
+XLSX_WORKBOOK_SHEET = '<sheet name={name} sheetId="{index}" r:id="rId{index}"/>'
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{sheets}</Relationships>')
+XLSX_WORKBOOK_REL_SHEET = ('<Relationship Id="rId{index}" Target="worksheets/sheet{index}.xml" '
+                           'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>')
+XLSX_SHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+def xlsx_row(number, values):
+    cells = ''.join('<c r="%s%d" t="inlineStr"><is><t xml:space="preserve">%s</t></is></c>' % (
+        chr(ord("A") + column), number, escape(value)) for column, value in enumerate(values))
+    return '<row r="%d">%s</row>' % (number, cells)
+
+def write_sheet(archive, index, header, rows):
+    with archive.open("xl/worksheets/sheet%d.xml" % index, "w", force_zip64=True) as raw:
+        f = io.TextIOWrapper(raw, encoding="UTF-8", write_through=False)
+        f.write(XLSX_SHEET_START)
+        f.write(xlsx_row(1, header))
+        for number, values in enumerate(rows, 2):
+            f.write(xlsx_row(number, values))
+        f.write(XLSX_SHEET_END)
+        f.flush()
+        f.detach()
+
+def write_excel(document, path):
+    # imported here so that the excel columns are not needed for RDF/XML
+    from onot.parsing import excel
+
+    # expressions are few; render each once
+    texts = {}
+    def text_of(expression):
+        text = texts.get(expression)
+        if text is None:
+            text = texts[expression] = expression_text(expression)
+        return text
+
+    sheets = [
+        (excel.SHEET_DOCUMENT_INFO, [excel.COLUMN_DOCUMENT_NAME, excel.COLUMN_CREATOR],
+         [[document.name, ORGANIZATION]]),
+        (excel.SHEET_PACKAGE_INFO,
+         [excel.COLUMN_PACKAGE_NAME, excel.COLUMN_PACKAGE_VERSION, excel.COLUMN_PACKAGE_DOWNLOAD_LOCATION,
+          excel.COLUMN_LICENSE_CONCLUDED, excel.COLUMN_LICENSE_DECLARED, excel.COLUMN_PACKAGE_COPYRIGHT_TEXT],
+         ([name, version, download_location, text_of(license), text_of(license), copyright]
+          for name, version, license, copyright, download_location in document.iter_packages())),
+        (excel.SHEET_PER_FILE_INFO,
+         [excel.COLUMN_FILE_NAME, excel.COLUMN_LICENSE_CONCLUDED, excel.COLUMN_LICENSE_INFO_IN_FILE,
+          excel.COLUMN_FILE_COPYRIGHT_TEXT, excel.COLUMN_ARTIFACT_OF_HOMEPAGE],
+         ([file_name, text_of(license), text_of(license), copyright, homepage]
+          for file_name, license, copyright, homepage in document.iter_files())),
+        (excel.SHEET_EXTRACTED_LICENSE_INFO,
+         [excel.COLUMN_IDENTIFIER, excel.COLUMN_EXTRACTED_TEXT, excel.COLUMN_LICENSE_NAME],
+         ([identifier, text, name] for identifier, name, text in document.iter_extracted_licenses())),
+    ]
+    indexes = range(1, len(sheets) + 1)
+    # the fastest compression; the level can be chosen since Python 3.7
+    options = {"compresslevel": 1} if sys.version_info >= (3, 7) else {}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, **options) as archive:
+        archive.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES.format(
+            sheets=''.join(XLSX_CONTENT_TYPE_SHEET.format(index=index) for index in indexes)))
+        archive.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", XLSX_WORKBOOK.format(
+            sheets=''.join(XLSX_WORKBOOK_SHEET.format(name=quoteattr(sheet[0]), index=index)
+                           for index, sheet in zip(indexes, sheets))))
+        archive.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS.format(
+            sheets=''.join(XLSX_WORKBOOK_REL_SHEET.format(index=index) for index in indexes)))
+        for index, (_, header, rows) in zip(indexes, sheets):
+            write_sheet(archive, index, header, rows)
+
+def license_uri(document, license_id):
+    if license_id.startswith("LicenseRef-"):
+        return DOCUMENT_NAMESPACE + document.name + "#" + license_id
+    return LICENSE_URL_PREFIX + license_id
+
+def rdf_license(document, predicate, expression, indent):
+    if isinstance(expression, str):
+        return '%s<spdx:%s rdf:resource=%s/>\n' % (indent, predicate, quoteattr(license_uri(document, expression)))
+    operator, left, right = expression
+    lines = ['%s<spdx:%s>\n' % (indent, predicate)]
+    if operator == "WITH":
+        lines.append('%s  <spdx:WithExceptionOperator>\n' % indent)
+        lines.append(rdf_license(document, "member", left, indent + "    "))
+        lines.append('%s    <spdx:licenseException>\n' % indent)
+        lines.append('%s      <spdx:ListedLicenseException rdf:about=%s/>\n' % (indent, quoteattr(license_uri(document, right))))
+        lines.append('%s    </spdx:licenseException>\n' % indent)
+        lines.append('%s  </spdx:WithExceptionOperator>\n' % indent)
+    else:
+        lines.append('%s  <spdx:%s>\n' % (indent, RDF_OPERATORS[operator]))
+        lines.append(rdf_license(document, "member", left, indent + "    "))
+        lines.append(rdf_license(document, "member", right, indent + "    "))
+        lines.append('%s  </spdx:%s>\n' % (indent, RDF_OPERATORS[operator]))
+    lines.append('%s</spdx:%s>\n' % (indent, predicate))
+    return ''.join(lines)
+
+def write_rdf_xml(document, path):
+    namespace = DOCUMENT_NAMESPACE + document.name
+    # the concluded and declared licenses of a package are the same expression; render each once
+    elements = {}
+    def licenses_of(expression, predicates):
+        key = (expression, predicates)
+        element = elements.get(key)
+        if element is None:
+            element = elements[key] = ''.join(rdf_license(document, predicate, expression, "    ") for predicate in predicates)
+        return element
+
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:spdx="http://spdx.org/rdf/terms#">\n')
+        f.write('  <spdx:SpdxDocument rdf:about=%s>\n' % quoteattr(namespace + "#SPDXRef-DOCUMENT"))
+        f.write('    <spdx:name>%s</spdx:name>\n' % escape(document.name))
+        f.write('    <spdx:creationInfo>\n      <spdx:CreationInfo>\n')
+        f.write('        <spdx:creator>%s</spdx:creator>\n' % escape(ORGANIZATION))
+        f.write('      </spdx:CreationInfo>\n    </spdx:creationInfo>\n')
+        for identifier, name, text in document.iter_extracted_licenses():
+            f.write('    <spdx:hasExtractedLicensingInfo>\n')
+            f.write('      <spdx:ExtractedLicensingInfo rdf:about=%s>\n' % quoteattr(license_uri(document, identifier)))
+            f.write('        <spdx:licenseId>%s</spdx:licenseId>\n' % escape(identifier))
+            f.write('        <spdx:name>%s</spdx:name>\n' % escape(name))
+            f.write('        <spdx:extractedText>%s</spdx:extractedText>\n' % escape(text))
+            f.write('      </spdx:ExtractedLicensingInfo>\n')
+            f.write('    </spdx:hasExtractedLicensingInfo>\n')
+        f.write('  </spdx:SpdxDocument>\n')
+
+        package_licenses = ("licenseConcluded", "licenseDeclared")
+        for index, (name, version, license, copyright, download_location) in enumerate(document.iter_packages()):
+            f.write('  <spdx:Package rdf:about=%s>\n'
+                    '    <spdx:name>%s</spdx:name>\n'
+                    '    <spdx:versionInfo>%s</spdx:versionInfo>\n'
+                    '%s'
+                    '    <spdx:copyrightText>%s</spdx:copyrightText>\n'
+                    '    <spdx:downloadLocation>%s</spdx:downloadLocation>\n'
+                    '  </spdx:Package>\n' % (
+                        quoteattr(namespace + "#SPDXRef-Package-%d" % index), escape(name), escape(version),
+                        licenses_of(license, package_licenses), escape(copyright), escape(download_location)))
+
+        file_licenses = ("licenseConcluded", "licenseInfoInFile")
+        for index, (file_name, license, copyright, homepage) in enumerate(document.iter_files()):
+            f.write('  <spdx:File rdf:about=%s>\n'
+                    '    <spdx:fileName>%s</spdx:fileName>\n'
+                    '%s'
+                    '    <spdx:copyrightText>%s</spdx:copyrightText>\n'
+                    '  </spdx:File>\n' % (
+                        quoteattr(namespace + "#SPDXRef-File-%d" % index), escape(file_name),
+                        licenses_of(license, file_licenses), escape(copyright)))
+        f.write('</rdf:RDF>\n')
+
+def format_of(path):
+    for suffix, file_format in SUFFIXES.items():
+        if path.lower().endswith(suffix):
+            return file_format
+    return None
+
+def write(document, path, file_format=None):
+    file_format = file_format or format_of(path)
+    if file_format == FORMAT_EXCEL:
+        write_excel(document, path)
+    elif file_format == FORMAT_RDF_XML:
+        write_rdf_xml(document, path)
+    else:
+        raise ValueError("unknown format of " + path + "; use .xlsx, .rdf or .rdf.xml")
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+@click.command(context_settings=CONTEXT_SETTINGS, help="This writes a synthetic SPDX document for load tests.\n ex) onot-synth -o sbom.xlsx --packages 1000000 --files 100000")
+@click.option('-o', '--output', type=click.STRING, required=True, help="Output file (.xlsx, .rdf or .rdf.xml).")
+@click.option('-f', '--format', 'file_format', type=click.Choice(FORMATS), default=None, help="Format of the output. (default: from the suffix of the output)")
+@click.option('--packages', type=click.IntRange(min=0), default=1000, show_default=True, help="Number of packages.")
+@click.option('--files', type=click.IntRange(min=0), default=0, show_default=True, help="Number of files (Per File Info), each another package.")
+@click.option('--license_complexity', type=click.IntRange(min=1), default=3, show_default=True, help="Largest number of licenses in a license expression.")
+@click.option('--duplicate_ratio', type=click.FloatRange(0, 1), default=0.05, show_default=True, help="Share of the packages which repeat an earlier package.")
+@click.option('--extracted_licenses', type=click.IntRange(min=0), default=10, show_default=True, help="Number of extracted licenses (LicenseRef-).")
+@click.option('--extracted_ratio', type=click.FloatRange(0, 1), default=0.02, show_default=True, help="Share of the packages and files under an extracted license.")
+@click.option('--extracted_text_size', type=click.IntRange(min=0), default=1000, show_default=True, help="Characters of the text of an extracted license.")
+@click.option('--seed', type=click.INT, default=0, show_default=True, help="Seed of the random choices; the same seed gives the same document.")
+@click.option('--name', type=click.STRING, default=None, help="Document name. (default: synthetic-<packages>)")
+def main(output, file_format, packages, files, license_complexity, duplicate_ratio, extracted_licenses, extracted_ratio, extracted_text_size, seed, name):
+    file_format = file_format or format_of(output)
+    if file_format is None:
+        raise click.UsageError("the format of " + output + " is unknown; use --format")
+    document = SyntheticDocument(packages, files, license_complexity, duplicate_ratio, extracted_licenses,
+                                 extracted_ratio, extracted_text_size, seed=seed, name=name)
+    started = time.perf_counter()
+    write(document, output, file_format)
+    click.echo("%s - %d packages, %d files, %d extracted licenses, %.1f MB in %.1fs" % (
+        output, packages, files, document.extracted_licenses, os.path.getsize(output) / 1e6, time.perf_counter() - started))
+
+if __name__ == "__main__":
+    main()
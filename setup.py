@@ -3,9 +3,12 @@
 # SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
 # SPDX-License-Identifier: Apache-2.0
 
+import re
 import setuptools
 
-VERSION = '1.0.0'
+# the version is kept in onot/__init__.py; onot uses it at run time
+with open("onot/__init__.py", "r", encoding="utf-8") as fh:
+    VERSION = re.search(r"^__version__ = '([^']+)'", fh.read(), re.MULTILINE).group(1)
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -19,16 +22,20 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/sktelecom/onot",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*", "test", "test.*"]),
+    package_data={
+        "onot.parsing": ["data/*.db"]
+    },
     install_requires=[
         'click',
         'openpyxl',
-        'pandas',
         'requests',
     ],
     entry_points={
         "console_scripts": [
-            "onot=onot.__main__:main"
+            "onot=onot.__main__:main",
+            "onot-license-db=onot.tools.build_license_db:main",
+            "onot-synth=onot.tools.synth:main"
         ]
     },
     classifiers=[
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+# local stand-in for https://spdx.org/licenses/ used by the tests.
+# it serves a small license list, an exception list and the details of each license,
+# answers conditional requests (If-None-Match) with 304 and counts the requests per path.
+
+import json
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+LICENSES = {
+    'MIT': 'MIT License\nPermission is hereby granted, free of charge, ...',
+    'MIT-0': 'MIT No Attribution\nPermission is hereby granted, free of charge, ...',
+    'Apache-2.0': 'Apache License\nVersion 2.0, January 2004',
+    'BSD-3-Clause': 'BSD 3-Clause License\nRedistribution and use in source and binary forms, ...',
+    'GPL-2.0-only': 'GNU GENERAL PUBLIC LICENSE\nVersion 2, June 1991',
+    'LGPL-2.1-only': 'GNU LESSER GENERAL PUBLIC LICENSE\nVersion 2.1, February 1999',
+}
+EXCEPTIONS = {
+    'Classpath-exception-2.0': 'Linking this library statically or dynamically with other modules ...',
+}
+
+class SPDXServer():
+
+    def __init__(self, licenses=LICENSES, exceptions=EXCEPTIONS):
+        self.requests = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests[self.path] = server.requests.get(self.path, 0) + 1
+                document = server.documents.get(self.path)
+                if document is None:
+                    self.send_error(404)
+                    return
+                body = json.dumps(document).encode('UTF-8')
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url_prefix = 'http://127.0.0.1:%d/licenses/' % self.httpd.server_address[1]
+        self.documents = self.make_documents(licenses, exceptions)
+
+    def make_documents(self, licenses, exceptions):
+        documents = {
+            '/licenses/licenses.json': {'licenseListVersion': 'test', 'licenses': [
+                {'licenseId': license_id, 'name': license_id + ' License', 'isDeprecatedLicenseId': False,
+                 'reference': './' + license_id + '.html', 'detailsUrl': self.url_prefix + license_id + '.json'}
+                for license_id in licenses]},
+            '/licenses/exceptions.json': {'licenseListVersion': 'test', 'exceptions': [
+                {'licenseExceptionId': exception_id, 'name': exception_id, 'isDeprecatedLicenseId': False,
+                 'reference': './' + exception_id + '.json', 'detailsUrl': './' + exception_id + '.html'}
+                for exception_id in exceptions]},
+        }
+        for license_id, text in licenses.items():
+            documents['/licenses/' + license_id + '.json'] = {
+                'licenseId': license_id, 'name': license_id + ' License',
+                'licenseText': text, 'licenseTextHtml': '<p>' + text + '</p>', 'isDeprecatedLicenseId': False}
+        for exception_id, text in exceptions.items():
+            documents['/licenses/' + exception_id + '.json'] = {
+                'licenseExceptionId': exception_id, 'name': exception_id,
+                'licenseExceptionText': text, 'exceptionTextHtml': '<p>' + text + '</p>', 'isDeprecatedLicenseId': False}
+        return documents
+
+    def request_count(self):
+        with self.lock:
+            return sum(self.requests.values())
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from onot.parsing import spdx_license
+from onot.tools import batch
+from test.spdx_server import SPDXServer
+from test.test_parsing_spdx_json import DOCUMENT
+
+class TestBatchCase(unittest.TestCase):
+    def setUp(self):
+        self.server = SPDXServer().start()
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        # notices are written to ./output
+        os.chdir(self.temp_dir)
+        # run_batch configures the registry of this process
+        patcher = mock.patch.multiple(spdx_license, _registry=None, _registry_options={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir)
+        self.server.stop()
+
+    def write(self, name, data):
+        file = os.path.join(self.temp_dir, "sboms", name)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(file, "w", encoding="UTF-8") as f:
+            f.write(data)
+        return file
+
+    def test_collect_inputs(self):
+        self.write("a.spdx.json", "{}")
+        self.write("b.rdf.xml", "")
+        self.write("readme.md", "")
+        manifest = os.path.join(self.temp_dir, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("# inputs\nsboms/a.spdx.json\n\nsboms/c.xlsx\n")
+        self.assertEqual(batch.collect_inputs(["sboms", "sboms/*.json"], manifest),
+                         [os.path.join("sboms", "a.spdx.json"), os.path.join("sboms", "b.rdf.xml"),
+                          os.path.join(self.temp_dir, "sboms", "c.xlsx")])
+
+    def test_failed_input_does_not_abort(self):
+        inputs = []
+        for name in ["a", "b"]:
+            inputs.append(self.write(name + ".spdx.json", json.dumps(dict(DOCUMENT, name=name))))
+        inputs.insert(1, self.write("broken.spdx.json", '{"name": "broken", "packages": [{"name": "foo"}]}'))
+        options = dict(url_prefix=self.server.url_prefix, cache_dir=os.path.join(self.temp_dir, "cache"))
+        results = batch.run_batch(inputs, ["html", "text"], 2, options)
+
+        self.assertEqual([result["input"] for result in results], inputs)
+        self.assertEqual([result["status"] for result in results], [batch.STATUS_OK, batch.STATUS_FAILED, batch.STATUS_OK])
+        self.assertIn("downloadLocation", results[1]["error"])
+        self.assertEqual(results[0]["packages"], 3)
+        for result in [results[0], results[2]]:
+            self.assertEqual(len(result["outputs"]), 2)
+            self.assertTrue(all(os.path.exists(path) for path in result["outputs"]))
+        # the workers got the license lists from this process
+        self.assertEqual(self.server.requests.get("/licenses/licenses.json"), 1)
+
+    def test_same_document_name(self):
+        # two documents of the same name, processed in the same second
+        inputs = [self.write("a.spdx.json", json.dumps(DOCUMENT)),
+                  self.write(os.path.join("re-export", "a.spdx.json"), json.dumps(DOCUMENT))]
+        options = dict(url_prefix=self.server.url_prefix, cache_dir=os.path.join(self.temp_dir, "cache"))
+        results = batch.run_batch(inputs, ["html"], 2, options)
+
+        self.assertEqual([result["status"] for result in results], [batch.STATUS_OK, batch.STATUS_OK])
+        outputs = [result["outputs"][0] for result in results]
+        self.assertNotEqual(outputs[0], outputs[1])
+        self.assertEqual(sorted(os.listdir("output")), sorted(os.path.basename(path) for path in outputs))
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest import mock
+
+from onot.parsing import spdx_license
+from benchmarks import run
+
+class TestBenchmarksCase(unittest.TestCase):
+    def setUp(self):
+        # the benchmarks configure the registry of this process
+        patcher = mock.patch.multiple(spdx_license, _registry=None, _registry_options={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_run(self):
+        results = run.run_benchmarks([20], repeat=1)
+        self.assertEqual(sorted(results), sorted(stage + "@20" for stage in run.STAGES))
+        for result in results.values():
+            self.assertGreater(result["peak_memory_bytes"], 0)
+
+    def test_compare(self):
+        baseline = {"excel.Parser@100": {"packages_per_second": 1000.0, "peak_memory_bytes": 1000}}
+        same = {"excel.Parser@100": {"packages_per_second": 950.0, "peak_memory_bytes": 1050}}
+        self.assertEqual(run.compare(baseline, same), [])
+        slower = {"excel.Parser@100": {"packages_per_second": 500.0, "peak_memory_bytes": 2000}}
+        self.assertEqual(len(run.compare(baseline, slower)), 2)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import onot
+from onot.parsing import parse
+from onot.parsing import doc_cache
+from onot.parsing import spdx_license
+from test.spdx_server import SPDXServer
+from test.test_parsing_spdx_json import DOCUMENT
+
+class TestDocCacheCase(unittest.TestCase):
+    def setUp(self):
+        self.server = SPDXServer().start()
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.multiple(spdx_license, _registry=None, _registry_options={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        spdx_license.configure(url_prefix=self.server.url_prefix, cache_dir=self.temp_dir)
+        self.file = os.path.join(self.temp_dir, "sbom.spdx.json")
+        with open(self.file, "w", encoding="UTF-8") as f:
+            json.dump(DOCUMENT, f)
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_hit(self):
+        cache = doc_cache.DocCache(self.temp_dir)
+        doc = parse.parse_file(self.file)
+        self.assertEqual(parse.parse_file(self.file, doc_cache=cache), doc)
+        with mock.patch.object(parse, "get_parser") as get_parser:
+            self.assertEqual(parse.parse_file(self.file, doc_cache=cache), doc)
+            get_parser.assert_not_called()
+
+    def test_key(self):
+        cache = doc_cache.DocCache(self.temp_dir)
+        key = cache.key(self.file, "first-wins")
+        self.assertEqual(cache.key(self.file, "first-wins"), key)
+        self.assertNotEqual(cache.key(self.file, "last-wins"), key)
+        with mock.patch.object(onot, "__version__", "0.0.0"):
+            self.assertNotEqual(cache.key(self.file, "first-wins"), key)
+        with open(self.file, "a") as f:
+            f.write(" ")
+        self.assertNotEqual(cache.key(self.file, "first-wins"), key)
+
+    def test_evict_least_recently_used(self):
+        cache = doc_cache.DocCache(self.temp_dir, max_size=10 ** 6)
+        doc = {"name": "x" * 1000}
+        for index, key in enumerate(["a", "b", "c"]):
+            cache.write(key, doc)
+            os.utime(cache.entry_path(key), (index, index))
+        # a is used again, b is the least recently used now
+        self.assertEqual(cache.read("a"), doc)
+        cache.max_size = os.path.getsize(cache.entry_path("a")) * 2
+        cache.evict()
+        self.assertEqual([key for key in "abc" if os.path.exists(cache.entry_path(key))], ["a", "c"])
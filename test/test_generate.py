@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from onot.generating import generate
+from test.test_generating_html import DOC
+
+class TestGenerateNoticeCase(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        # notices are written to ./output
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_format(self):
+        paths = generate.generate_notice(DOC, 'html')
+        self.assertEqual(len(paths), 1)
+        self.assertTrue(paths[0].endswith('.html'))
+        self.assertTrue(os.path.exists(paths[0]))
+
+    def test_several_formats(self):
+        paths = generate.generate_notice(DOC, 'text, html')
+        self.assertEqual([os.path.splitext(path)[1] for path in paths], ['.txt', '.html'])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    def test_unsupported_format(self):
+        with self.assertRaisesRegex(ValueError, "unsupported output format: pdf"):
+            generate.generate_notice(DOC, 'html,pdf')
+        # nothing is written before the formats are checked
+        self.assertFalse(os.path.exists('output') and os.listdir('output'))
+        self.assertRaises(ValueError, lambda: generate.parse_output_formats(' , '))
+        self.assertEqual(generate.parse_output_formats(['text', 'html', 'text']), ['text', 'html'])
+
+    def test_deterministic(self):
+        paths = generate.generate_notice(DOC, 'html,text', deterministic=True)
+        mtimes = [os.stat(path).st_mtime_ns for path in paths]
+        time.sleep(0.01)
+        # same contents: same names, nothing is written
+        self.assertEqual(generate.generate_notice(DOC, 'html,text', deterministic=True), paths)
+        self.assertEqual([os.stat(path).st_mtime_ns for path in paths], mtimes)
+
+        changed = dict(DOC, creationInfo={"organization": "Other", "email": "other@email.com"})
+        self.assertNotEqual(generate.generate_notice(changed, 'html', deterministic=True), paths[:1])
+        self.assertEqual(len(os.listdir('output')), 3)
+
+    def test_deterministic_no_write(self):
+        path, = generate.generate_notice(DOC, 'html', deterministic=True)
+        stat = os.stat(path)
+        time.sleep(0.01)
+        # an unchanged notice is only hashed: no temporary file, no write
+        with mock.patch('tempfile.mkstemp', side_effect=AssertionError("written again")):
+            self.assertEqual(generate.generate_notice(DOC, 'html', deterministic=True), [path])
+        again = os.stat(path)
+        self.assertEqual((again.st_ino, again.st_mtime_ns), (stat.st_ino, stat.st_mtime_ns))
+        self.assertEqual(os.listdir('output'), [os.path.basename(path)])
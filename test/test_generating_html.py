@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import unittest
+
+from onot.generating import html
+
+DOC = {
+    "name": "notice",
+    "creationInfo": {"organization": "ExampleCodeInspect", "email": "opensource@email.com"},
+    "packages": [{
+        "name": "foo",
+        "versionInfo": "1.0",
+        "licenseConcluded": "MIT OR Apache-2.0",
+        "copyrightText": "Copyright foo",
+        "downloadLocation": "http://example.com/foo"
+    }],
+    "licenses": [{
+        "name": "MIT License",
+        "licenseId": "MIT",
+        "packages": [("foo", "1.0")],
+        "licenseText": "MIT text\nline 2",
+        "licenseTextHtml": None
+    }]
+}
+
+class TestConvertLicenseExpressionCase(unittest.TestCase):
+    def setUp(self):
+        self.instance = html.Generator()
+
+    def test_link(self):
+        self.assertEqual(
+            self.instance.convert_license_expression("(MIT-0 OR MIT) AND GPL-2.0-only WITH Classpath-exception-2.0"),
+            '(<a href="#MIT-0">MIT-0</a> OR <a href="#MIT">MIT</a>) AND '
+            '<a href="#GPL-2.0-only">GPL-2.0-only</a> WITH <a href="#Classpath-exception-2.0">Classpath-exception-2.0</a>')
+
+    def test_cached(self):
+        first = self.instance.convert_license_expression("MIT OR Apache-2.0")
+        self.assertIs(self.instance.convert_license_expression("MIT OR Apache-2.0"), first)
+
+class TestWriteHtmlCase(unittest.TestCase):
+    def test_stream(self):
+        instance = html.Generator()
+        stream = io.StringIO()
+        instance.write_html(DOC, stream)
+        self.assertEqual(stream.getvalue(), instance.make_html_code(DOC))
+        self.assertIn('<a href = "#foo_1.0">foo 1.0</a>', stream.getvalue())
+        self.assertIn('MIT text<br>line 2', stream.getvalue())
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import unittest
+
+from onot.generating import text
+from test.test_generating_html import DOC
+
+class TestWriteTextCase(unittest.TestCase):
+    def test_stream(self):
+        instance = text.Generator()
+        stream = io.StringIO()
+        instance.write_text(DOC, stream)
+        self.assertEqual(stream.getvalue(), instance.make_text(DOC))
+        self.assertIn('MIT License\n(foo 1.0)\n\n\nMIT text\nline 2\n\n\n', stream.getvalue())
@@ -4,8 +4,11 @@
 # SPDX-FileCopyrightText: Copyright (c) 2022 Kakao Corp. https://www.kakaocorp.com
 #
 # SPDX-License-Identifier: Apache-2.0
+import threading
 import unittest
+from unittest import mock
 from onot.parsing import spdx_license
+from test.spdx_server import SPDXServer
 
 class TestGetSPDXLicenseCase(unittest.TestCase):
     # license and license exception from spdx-spec/v2.3
@@ -28,3 +31,62 @@ class TestGetSPDXLicenseCase(unittest.TestCase):
                 license_details = self.instance.get_spdx_license_details(details_url)
                 self.assertTrue(license_details['licenseId'] is not None or license_details['licenseExceptionId'] is not None)
 
+
+class TestSPDXLicenseRegistryCase(unittest.TestCase):
+    def test_shared_instance(self):
+        registries = []
+        threads = [threading.Thread(target=lambda: registries.append(spdx_license.get_registry())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(registry is spdx_license.get_registry() for registry in registries))
+
+class TestSPDXLicenseIndexCase(unittest.TestCase):
+    license_list = {'licenses': [
+        {'licenseId': 'MIT', 'detailsUrl': 'https://spdx.org/licenses/MIT.json', 'isDeprecatedLicenseId': False},
+        {'licenseId': 'GPL-2.0', 'detailsUrl': 'https://spdx.org/licenses/GPL-2.0.json', 'isDeprecatedLicenseId': True},
+    ]}
+    exception_list = {'exceptions': [
+        {'licenseExceptionId': 'Classpath-exception-2.0', 'reference': './Classpath-exception-2.0.json', 'isDeprecatedLicenseId': False},
+    ]}
+
+    def setUp(self):
+        def get(url, *args, **kwargs):
+            body = self.exception_list if url == spdx_license.SPDX_LICENSE_EXCEPTION_JSON_URL else self.license_list
+            return mock.Mock(status_code=200, json=mock.Mock(return_value=body))
+        self.instance = spdx_license.SPDX_License()
+        patcher = mock.patch.object(self.instance.session, 'get', side_effect=get)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lookup(self):
+        self.assertEqual(self.instance.get_spdx_license_detailsUrl('mit'), 'https://spdx.org/licenses/MIT.json')
+        self.assertEqual(self.instance.get_spdx_license_detailsUrl('CLASSPATH-exception-2.0'), 'https://spdx.org/licenses/Classpath-exception-2.0.json')
+        self.assertIsNone(self.instance.get_spdx_license_detailsUrl('LicenseRef-1'))
+        self.assertTrue(self.instance.is_known('MIT'))
+        self.assertTrue(self.instance.is_exception('Classpath-exception-2.0'))
+        self.assertFalse(self.instance.is_exception('MIT'))
+        self.assertTrue(self.instance.is_deprecated('GPL-2.0'))
+        self.assertFalse(self.instance.is_deprecated('MIT'))
+        # the lists are downloaded once, not per lookup
+        self.assertEqual(self.get.call_count, 2)
+
+class TestSPDXLicensePrefetchCase(unittest.TestCase):
+    def setUp(self):
+        self.server = SPDXServer().start()
+        self.instance = spdx_license.SPDX_License(url_prefix=self.server.url_prefix, max_workers=4)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_prefetch(self):
+        license_ids = ['MIT', 'Apache-2.0', 'BSD-3-Clause', 'Classpath-exception-2.0', 'MIT', 'LicenseRef-1']
+        self.instance.prefetch(license_ids)
+        # 2 lists + 4 unique spdx licenses
+        self.assertEqual(self.server.request_count(), 6)
+
+        for license_id in ['MIT', 'Apache-2.0', 'BSD-3-Clause', 'Classpath-exception-2.0']:
+            details = self.instance.get_spdx_license_details(self.instance.get_spdx_license_detailsUrl(license_id))
+            self.assertEqual(details['licenseId'], license_id)
+        self.assertEqual(self.server.request_count(), 6)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+import shutil
+import tempfile
+import unittest
+from onot.parsing import spdx_license
+from onot.parsing import license_cache
+from test.spdx_server import SPDXServer
+
+class TestLicenseCacheCase(unittest.TestCase):
+    def setUp(self):
+        self.server = SPDXServer().start()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.cache_dir)
+
+    def new_instance(self, ttl=license_cache.DEFAULT_TTL, offline=False):
+        cache = license_cache.LicenseCache(self.cache_dir, ttl, offline)
+        return spdx_license.SPDX_License(url_prefix=self.server.url_prefix, cache=cache)
+
+    def get_details(self, instance, license_id):
+        return instance.get_spdx_license_details(instance.get_spdx_license_detailsUrl(license_id))
+
+    def test_cached_between_runs(self):
+        self.assertEqual(self.get_details(self.new_instance(), 'MIT')['licenseId'], 'MIT')
+        self.assertEqual(self.server.request_count(), 3)
+
+        # a new instance (a new run) reads everything from the disk cache
+        self.assertEqual(self.get_details(self.new_instance(), 'MIT')['licenseId'], 'MIT')
+        self.assertEqual(self.server.request_count(), 3)
+
+    def test_revalidate_expired(self):
+        self.get_details(self.new_instance(), 'Classpath-exception-2.0')
+        self.assertEqual(self.server.request_count(), 3)
+
+        details = self.get_details(self.new_instance(ttl=0), 'Classpath-exception-2.0')
+        self.assertEqual(details['licenseId'], 'Classpath-exception-2.0')
+        # every document is revalidated and answered with 304
+        self.assertEqual(self.server.request_count(), 6)
+
+    def test_offline(self):
+        with self.assertRaises(license_cache.LicenseNotCachedError):
+            self.new_instance(offline=True).get_spdx_license_detailsUrl('MIT')
+        self.assertEqual(self.server.request_count(), 0)
+
+        self.get_details(self.new_instance(), 'MIT')
+        details = self.get_details(self.new_instance(ttl=0, offline=True), 'MIT')
+        self.assertEqual(details['licenseId'], 'MIT')
+        self.assertEqual(self.server.request_count(), 3)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from onot.parsing import license_db
+from onot.parsing import license_cache
+from onot.parsing import spdx_license
+
+def write_json(path, document):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='UTF-8') as f:
+        json.dump(document, f)
+
+class TestLicenseDatabaseCase(unittest.TestCase):
+    licenses = {'MIT': False, 'Apache-2.0': False, 'GPL-2.0': True, 'BSD-3-Clause': False}
+    exceptions = {'Classpath-exception-2.0': False}
+
+    def setUp(self):
+        # a minimal license-list-data checkout
+        self.directory = tempfile.mkdtemp()
+        source = os.path.join(self.directory, 'license-list-data')
+        write_json(os.path.join(source, 'json', 'licenses.json'), {
+            'licenseListVersion': '3.19',
+            'releaseDate': '2022-11-30',
+            'licenses': [{'licenseId': license_id, 'isDeprecatedLicenseId': deprecated} for license_id, deprecated in self.licenses.items()]})
+        write_json(os.path.join(source, 'json', 'exceptions.json'), {
+            'licenseListVersion': '3.19',
+            'exceptions': [{'licenseExceptionId': license_id, 'isDeprecatedLicenseId': deprecated} for license_id, deprecated in self.exceptions.items()]})
+        for license_id in self.licenses:
+            write_json(os.path.join(source, 'json', 'details', license_id + '.json'), {
+                'licenseId': license_id, 'name': license_id + ' License', 'licenseText': license_id + ' text', 'licenseTextHtml': '<p/>'})
+        for license_id in self.exceptions:
+            write_json(os.path.join(source, 'json', 'exceptions', license_id + '.json'), {
+                'licenseExceptionId': license_id, 'name': license_id, 'licenseExceptionText': license_id + ' text', 'exceptionTextHtml': '<p/>'})
+
+        self.path = license_db.build(source, os.path.join(self.directory, 'data', 'spdx_licenses.db'))
+        self.database = license_db.LicenseDatabase(self.path)
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.directory)
+
+    def test_lookup(self):
+        self.assertEqual(self.database.license_list_version, '3.19')
+        self.assertEqual(self.database.count, 5)
+        for license_id in list(self.licenses) + list(self.exceptions):
+            with self.subTest(license=license_id):
+                details = self.database.get(license_id.lower())
+                self.assertEqual(details['licenseId'], license_id)
+                self.assertEqual(details['licenseText'], license_id + ' text')
+        self.assertIsNone(self.database.get('LicenseRef-1'))
+        self.assertTrue(self.database.is_exception('Classpath-exception-2.0'))
+        self.assertFalse(self.database.is_exception('MIT'))
+        self.assertTrue(self.database.is_deprecated('GPL-2.0'))
+        self.assertFalse(self.database.is_known('MIT-0'))
+
+    def test_offline_fallback(self):
+        cache = license_cache.LicenseCache(os.path.join(self.directory, 'cache'), offline=True)
+        instance = spdx_license.SPDX_License(cache=cache, database=self.database)
+        instance.prefetch(['MIT', 'Apache-2.0'])
+        self.assertEqual(instance.get_license('Apache-2.0')['licenseText'], 'Apache-2.0 text')
+        self.assertIsNone(instance.get_license('LicenseRef-1'))
+
+        # without a database, the cache miss is an error
+        with self.assertRaises(license_cache.LicenseNotCachedError):
+            spdx_license.SPDX_License(cache=cache).get_license('MIT')
+
+    def test_bundled(self):
+        # the database is built by the release workflow, which sets ONOT_REQUIRE_BUNDLED_DB
+        if not os.path.exists(license_db.BUNDLED_DATABASE_PATH) and not os.environ.get('ONOT_REQUIRE_BUNDLED_DB'):
+            self.skipTest('no bundled license database in this checkout; build it with onot-license-db')
+        database = license_db.open_bundled()
+        self.assertIsNotNone(database)
+        try:
+            self.assertIsNotNone(database.license_list_version)
+            self.assertEqual(database.get('mit')['licenseId'], 'MIT')
+            self.assertTrue(database.is_exception('Classpath-exception-2.0'))
+        finally:
+            database.close()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+from onot.parsing import license_expression
+
+class TestLicenseExpressionCase(unittest.TestCase):
+    def test_licenses(self):
+        cases = {
+            "MIT": ("MIT",),
+            "(MIT OR Apache-2.0) AND GPL-2.0-only WITH Classpath-exception-2.0": ("MIT", "Apache-2.0", "GPL-2.0-only", "Classpath-exception-2.0"),
+            # ids containing the operators
+            "LicenseRef-CORE OR ANDROID-SDK AND MIT": ("LicenseRef-CORE", "ANDROID-SDK", "MIT"),
+            "MIT AND MIT-0 AND MIT": ("MIT", "MIT-0"),
+            "GPL-2.0+ OR DocumentRef-spdx-tool-1.2:LicenseRef-MIT-Style-2": ("GPL-2.0+", "DocumentRef-spdx-tool-1.2:LicenseRef-MIT-Style-2"),
+            # names which are not ids
+            "Apache License 2.0 OR MIT": ("Apache License 2.0", "MIT"),
+        }
+        for text, licenses in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(license_expression.parse(text).licenses, licenses)
+
+    def test_tree(self):
+        expression = license_expression.parse("MIT OR Apache-2.0 AND (BSD-3-Clause OR GPL-2.0-only WITH Classpath-exception-2.0)")
+        root = expression.root
+        self.assertIsInstance(root, license_expression.Compound)
+        self.assertEqual(root.operator, license_expression.OPERATOR_OR)
+        # AND binds tighter than OR, WITH tighter than AND
+        self.assertEqual(root.operands[1].operator, license_expression.OPERATOR_AND)
+        self.assertIsInstance(root.operands[1].operands[1].operands[1], license_expression.With)
+        self.assertEqual(str(expression), "MIT OR (Apache-2.0 AND (BSD-3-Clause OR GPL-2.0-only WITH Classpath-exception-2.0))")
+
+    def test_cached(self):
+        self.assertIs(license_expression.parse("MIT OR Apache-2.0"), license_expression.parse("MIT OR Apache-2.0"))
+
+    def test_invalid(self):
+        for text in ["", "MIT OR", "(MIT OR Apache-2.0", "MIT)", "AND MIT", "MIT WITH"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    license_expression.parse(text)
+
+    def test_strip_enclosing_parentheses(self):
+        self.assertEqual(license_expression.strip_enclosing_parentheses("(MIT OR Apache-2.0)"), "MIT OR Apache-2.0")
+        self.assertEqual(license_expression.strip_enclosing_parentheses("(MIT) AND (Apache-2.0)"), "(MIT) AND (Apache-2.0)")
+        self.assertEqual(license_expression.strip_enclosing_parentheses("MIT"), "MIT")
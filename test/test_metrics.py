@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from onot.log import metrics
+from onot.parsing import parse
+from onot.parsing import spdx_license
+from onot.generating import generate
+from test.spdx_server import SPDXServer
+from test.test_parsing_spdx_json import DOCUMENT
+
+class TestMetricsCase(unittest.TestCase):
+    def setUp(self):
+        self.server = SPDXServer().start()
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        # notices are written to ./output
+        os.chdir(self.temp_dir)
+        patcher = mock.patch.multiple(spdx_license, _registry=None, _registry_options={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        spdx_license.configure(url_prefix=self.server.url_prefix, use_cache=False)
+        self.file = os.path.join(self.temp_dir, "sbom.spdx.json")
+        with open(self.file, "w", encoding="UTF-8") as f:
+            json.dump(DOCUMENT, f)
+
+    def tearDown(self):
+        metrics.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir)
+        self.server.stop()
+
+    def test_record(self):
+        metrics.start()
+        generate.generate_notice(parse.parse_file(self.file), "html,text")
+        recorded = metrics.stop().to_dict()
+
+        stages = [stage["name"] for stage in recorded["stages"]]
+        for name in ["read", "resolve_licenses", "parse", "generate.html", "generate.text"]:
+            self.assertIn(name, stages)
+        self.assertEqual(recorded["counters"]["packages"], 3)
+        self.assertEqual(recorded["counters"]["http.requests"], self.server.request_count())
+        self.assertGreater(recorded["counters"]["http.bytes"], 0)
+        self.assertGreater(recorded["counters"]["output_bytes"], 0)
+
+    def test_trace(self):
+        metrics.start()
+        parse.parse_file(self.file)
+        path = os.path.join(self.temp_dir, "trace.json")
+        metrics.stop().write_trace(path)
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+        parse_event = [event for event in events if event["name"] == "parse"][0]
+        self.assertEqual(parse_event["ph"], "X")
+        self.assertGreaterEqual(parse_event["dur"], 0)
+
+    def test_listener_without_recording(self):
+        events = []
+        metrics.add_listener(events.append)
+        try:
+            parse.parse_file(self.file)
+        finally:
+            metrics.remove_listener(events.append)
+        self.assertIn({"type": metrics.EVENT_STAGE_START, "name": "parse"}, events)
+        self.assertEqual(events[-1]["name"], "licenses")
+        # nothing is recorded and nothing is called without listeners
+        self.assertIsNone(metrics.stop())
+        self.assertFalse(metrics.is_enabled())
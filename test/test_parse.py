@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import types
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from onot.parsing import parse
+
+class TestParserRegistryCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        parse.unregister_parser("test")
+
+    def write(self, name, data):
+        file = os.path.join(self.temp_dir, name)
+        with open(file, "wb") as f:
+            f.write(data)
+        return file
+
+    def test_sniff(self):
+        # the contents decide, not the suffix
+        self.assertEqual(parse.get_parser(self.write("a.txt", b"SPDXVersion: SPDX-2.3\n")).__name__, "onot.parsing.tag_value")
+        self.assertEqual(parse.get_parser(self.write("a.spdx", b'\xef\xbb\xbf{"spdxVersion": "SPDX-2.3"}')).__name__, "onot.parsing.spdx_json")
+        self.assertEqual(parse.get_parser('sample/SPDXRdfExample-v2.3.rdf.xml').__name__, "onot.parsing.rdf_xml_stream")
+        with open('sample/SPDXRdfExample-v2.3.xlsx', "rb") as f:
+            self.assertEqual(parse.get_parser(self.write("a.bin", f.read())).__name__, "onot.parsing.excel")
+        # unknown contents: the suffix
+        self.assertEqual(parse.get_parser(self.write("a.rdf", b"")).__name__, "onot.parsing.rdf_xml_stream")
+        with self.assertRaises(Exception):
+            parse.get_parser(self.write("a.txt", b"unknown"))
+
+    def test_register_parser(self):
+        module = types.ModuleType("test_format")
+        module.Parser = object
+        parse.register_parser("test", module, [".test"], lambda head: head.startswith(b"TEST"))
+        self.assertIs(parse.get_parser(self.write("a.spdx", b"TEST\nSPDXVersion: SPDX-2.3\n")), module)
+        self.assertIs(parse.get_parser(self.write("a.test", b"")), module)
+        # a plugin known only by its suffix wins over the generic json sniff
+        parse.register_parser("test", module, [".cdx.json"])
+        self.assertIs(parse.get_parser(self.write("a.cdx.json", b'{"bomFormat": "CycloneDX"}')), module)
+        self.assertEqual(parse.get_parser(self.write("a.json", b'{"spdxVersion": "SPDX-2.3"}')).__name__, "onot.parsing.spdx_json")
+
+    def test_lazy_import(self):
+        code = "import sys; import onot.parsing.parse; print(' '.join(m for m in ['openpyxl', 'rdflib', 'onot.parsing.excel'] if m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE, check=True).stdout
+        self.assertEqual(output.strip(), b"")
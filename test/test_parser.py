@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+import unittest
+from unittest import mock
+from onot.parsing import parser
+
+class PackageListParser(parser.AbstractParser):
+    # parser of an in-memory package list
+    def __init__(self, packages, merge_policy=parser.MERGE_POLICY_FIRST_WINS):
+        super().__init__(merge_policy)
+        self.packages = packages
+
+    def validate_file(self, file):
+        pass
+
+    def document_info(self):
+        self.doc["name"] = "test"
+
+    def package_info(self):
+        for package in self.packages:
+            self.append_package(dict(package))
+
+    def per_file_info(self):
+        pass
+
+    def extracted_license_info(self):
+        self.doc["extracted_license"].append({"identifier": "LicenseRef-1", "licenseName": "One", "extractedText": "one"})
+        self.doc["extracted_license"].append({"identifier": "LicenseRef-1", "licenseName": "Duplicated", "extractedText": "duplicated"})
+
+def package(name, version, license):
+    return {"name": name, "versionInfo": version, "licenseConcluded": license, "licenseDeclared": license, "copyrightText": "", "downloadLocation": ""}
+
+PACKAGES = [
+    package("a", "1.0", "MIT"),
+    package("b", "2.0", "Apache-2.0"),
+    package("a", "1.0", "BSD-3-Clause OR MIT"),
+    package("a", "1.1", "MIT"),
+    package("a", "1.0", "MIT"),
+]
+
+class TestAppendPackageCase(unittest.TestCase):
+    def append(self, merge_policy):
+        p = PackageListParser(PACKAGES, merge_policy)
+        p.package_info()
+        return [(package["name"], package["versionInfo"], package["licenseConcluded"]) for package in p.doc["packages"]]
+
+    def test_first_wins(self):
+        self.assertEqual(self.append(parser.MERGE_POLICY_FIRST_WINS),
+                         [("a", "1.0", "MIT"), ("b", "2.0", "Apache-2.0"), ("a", "1.1", "MIT")])
+
+    def test_last_wins(self):
+        self.assertEqual(self.append(parser.MERGE_POLICY_LAST_WINS),
+                         [("a", "1.0", "MIT"), ("b", "2.0", "Apache-2.0"), ("a", "1.1", "MIT")])
+        p = PackageListParser(PACKAGES[:3], parser.MERGE_POLICY_LAST_WINS)
+        p.package_info()
+        self.assertEqual(p.doc["packages"][0]["licenseConcluded"], "BSD-3-Clause OR MIT")
+
+    def test_merge_licenses(self):
+        self.assertEqual(self.append(parser.MERGE_POLICY_MERGE_LICENSES),
+                         [("a", "1.0", "MIT AND (BSD-3-Clause OR MIT)"), ("b", "2.0", "Apache-2.0"), ("a", "1.1", "MIT")])
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValueError, lambda: PackageListParser(PACKAGES, "random"))
+
+class FakeRegistry():
+    licenses = {"mit": "MIT", "apache-2.0": "Apache-2.0", "bsd-3-clause": "BSD-3-Clause"}
+
+    def prefetch(self, license_ids):
+        pass
+
+    def get_license(self, license_id):
+        if license_id.lower() not in self.licenses:
+            return None
+        license_id = self.licenses[license_id.lower()]
+        return {"licenseId": license_id, "name": license_id + " License", "licenseText": license_id, "licenseTextHtml": None}
+
+class TestLicenseInfoCase(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(parser.spdx_license, "get_registry", return_value=FakeRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_license_info(self):
+        p = PackageListParser([
+            package("a", "1.0", "MIT AND MIT"),
+            package("b", "2.0", "Apache-2.0 OR mit"),
+            package("c", "3.0", "LicenseRef-1"),
+            package("d", "4.0", "BSD-3-Clause"),
+        ])
+        doc = p.parse("")
+        licenses = [(license["licenseId"], license["name"], license["packages"]) for license in doc["licenses"]]
+        self.assertEqual(licenses, [
+            ("MIT", "MIT License", [("a", "1.0"), ("b", "2.0")]),
+            ("Apache-2.0", "Apache-2.0 License", [("b", "2.0")]),
+            ("LicenseRef-1", "One", [("c", "3.0")]),
+            ("BSD-3-Clause", "BSD-3-Clause License", [("d", "4.0")]),
+        ])
+
+    def test_unknown_license(self):
+        p = PackageListParser([package("a", "1.0", "LicenseRef-2")])
+        self.assertRaises(ValueError, lambda: p.parse(""))
+
+    def test_no_assertion(self):
+        declared = dict(package("b", "2.0", "NOASSERTION"), licenseDeclared="MIT")
+        p = PackageListParser([package("a", "1.0", "NOASSERTION"), declared, package("c", "3.0", "NONE OR Apache-2.0")])
+        doc = p.parse("")
+        self.assertEqual([(license["licenseId"], license["packages"]) for license in doc["licenses"]],
+                         [("MIT", [("b", "2.0")]), ("Apache-2.0", [("c", "3.0")])])
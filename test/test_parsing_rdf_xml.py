@@ -5,7 +5,10 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 from onot.parsing import rdf_xml
 
@@ -21,3 +24,59 @@ class TestParsingRdfXmlClass(unittest.TestCase):
 
     def test_result(self):
         result = self.instance.parse(SAMPLE_FILE)
+
+# one license set, referenced by both license predicates through rdf:nodeID
+SHARED_LICENSE_SET_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:spdx="http://spdx.org/rdf/terms#">
+  <spdx:SpdxDocument rdf:about="http://example.com/doc#SPDXRef-DOCUMENT">
+    <spdx:name>shared license set</spdx:name>
+  </spdx:SpdxDocument>
+  <spdx:DisjunctiveLicenseSet rdf:nodeID="licenses">
+    <spdx:member rdf:resource="http://spdx.org/licenses/MIT"/>
+    <spdx:member rdf:resource="http://spdx.org/licenses/Apache-2.0"/>
+  </spdx:DisjunctiveLicenseSet>
+  <spdx:Package rdf:about="http://example.com/doc#SPDXRef-Package">
+    <spdx:name>foo</spdx:name>
+    <spdx:versionInfo>1.0</spdx:versionInfo>
+    <spdx:licenseConcluded rdf:nodeID="licenses"/>
+    <spdx:licenseDeclared rdf:nodeID="licenses"/>
+    <spdx:copyrightText>Copyright foo</spdx:copyrightText>
+    <spdx:downloadLocation>http://example.com/foo</spdx:downloadLocation>
+  </spdx:Package>
+</rdf:RDF>
+"""
+
+def read_stages(instance, file):
+    # everything but license_info, which needs the spdx license list
+    instance.validate_file(file)
+    instance.document_info()
+    instance.package_info()
+    instance.per_file_info()
+    instance.extracted_license_info()
+    return instance.doc
+
+class TestRdfXmlIndexCase(unittest.TestCase):
+    def test_read_stages(self):
+        instance = rdf_xml.Parser(SAMPLE_FILE)
+        result = read_stages(instance, SAMPLE_FILE)
+        self.assertEqual(len(instance.subjects_of_type("Package")), 4)
+        self.assertEqual([(package["name"], package["versionInfo"]) for package in result["packages"]], [
+            ("Jena", "3.12.0"), ("glibc", "2.11.1"), ("Saxon", "8.8"), ("Apache Commons Lang", "1.1"),
+            ("DOAPProject", ""), ("foo", ""), ("myspec", ""), ("commons-lang3", "3.1"), ("jena", "2.6.3")])
+        # license sets (BNodes), nested and with exceptions
+        self.assertEqual(result["packages"][0]["licenseConcluded"], "BSD-3-Clause OR MIT OR LGPL-2.1-only")
+        self.assertEqual(result["packages"][1]["licenseDeclared"], "GPL-2.0-or-later WITH Bison-exception-2.2 AND LicenseRef-3 AND LGPL-2.0-only")
+        self.assertEqual(result["packages"][6]["licenseConcluded"], "(BSD-3-Clause OR LGPL-2.1-or-later) AND MIT")
+
+    def test_shared_license_set(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "shared.rdf.xml")
+            with open(file, "w", encoding="UTF-8") as f:
+                f.write(SHARED_LICENSE_SET_DOCUMENT)
+            instance = rdf_xml.Parser(file)
+        with mock.patch.object(instance, "extract_composite_license_expression", wraps=instance.extract_composite_license_expression) as composite:
+            instance.package_info()
+        package = instance.doc["packages"][0]
+        self.assertEqual((package["licenseConcluded"], package["licenseDeclared"]), ("MIT OR Apache-2.0", "MIT OR Apache-2.0"))
+        # the second reference is answered from the memo
+        self.assertEqual(composite.call_count, 1)
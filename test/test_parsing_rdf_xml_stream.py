@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from onot.parsing import parser
+from onot.parsing import rdf_xml
+from onot.parsing import rdf_xml_stream
+
+SAMPLE_FILE = 'sample/SPDXRdfExample-v2.3.rdf.xml'
+
+# the same package, once by rdf:nodeID reference, which only rdflib reads
+NODE_ID_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:spdx="http://spdx.org/rdf/terms#">
+  <spdx:SpdxDocument rdf:about="http://example.com/doc#SPDXRef-DOCUMENT">
+    <spdx:name>nodeID document</spdx:name>
+    <spdx:describesPackage rdf:nodeID="package"/>
+  </spdx:SpdxDocument>
+  <spdx:Package rdf:nodeID="package">
+    <spdx:name>foo</spdx:name>
+    <spdx:versionInfo>1.0</spdx:versionInfo>
+    <spdx:licenseConcluded rdf:resource="http://spdx.org/licenses/MIT"/>
+    <spdx:licenseDeclared rdf:resource="http://spdx.org/licenses/MIT"/>
+    <spdx:copyrightText>Copyright foo</spdx:copyrightText>
+    <spdx:downloadLocation>http://example.com/foo</spdx:downloadLocation>
+  </spdx:Package>
+</rdf:RDF>
+"""
+
+# a package the streaming pass reads before it meets the rdf:nodeID reference
+PARTIAL_DOCUMENT = NODE_ID_DOCUMENT.replace("""  <spdx:SpdxDocument""", """  <spdx:Package rdf:about="http://example.com/doc#SPDXRef-Package-bar">
+    <spdx:name>bar</spdx:name>
+    <spdx:versionInfo>2</spdx:versionInfo>
+    <spdx:licenseConcluded rdf:resource="http://spdx.org/licenses/MIT"/>
+    <spdx:licenseDeclared rdf:resource="http://spdx.org/licenses/MIT"/>
+    <spdx:copyrightText>Copyright bar</spdx:copyrightText>
+    <spdx:downloadLocation>http://example.com/bar</spdx:downloadLocation>
+  </spdx:Package>
+  <spdx:SpdxDocument""")
+
+def read_stages(instance, file):
+    # everything but license_info, which needs the spdx license list
+    instance.validate_file(file)
+    instance.document_info()
+    instance.package_info()
+    instance.per_file_info()
+    instance.extracted_license_info()
+    return instance.doc
+
+class TestParsingRdfXmlStreamClass(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_same_as_rdflib(self):
+        expected = read_stages(rdf_xml.Parser(SAMPLE_FILE), SAMPLE_FILE)
+        result = read_stages(rdf_xml_stream.Parser(SAMPLE_FILE), SAMPLE_FILE)
+
+        self.assertEqual(result["name"], expected["name"])
+        self.assertEqual(result["creationInfo"], expected["creationInfo"])
+        # the graph does not keep the document order, so compare regardless of the order
+        key = lambda package: (package["name"], package["versionInfo"])
+        self.assertEqual(sorted(result["packages"], key=key), sorted(expected["packages"], key=key))
+        key = lambda extracted_license: extracted_license["identifier"]
+        self.assertEqual(sorted(result["extracted_license"], key=key), sorted(expected["extracted_license"], key=key))
+
+    def test_document_order(self):
+        expected = read_stages(rdf_xml.Parser(SAMPLE_FILE), SAMPLE_FILE)
+        instance = rdf_xml_stream.Parser(SAMPLE_FILE)
+        names = [package["name"] for package in read_stages(instance, SAMPLE_FILE)["packages"]]
+        # in the order of the opening tags; Saxon is nested in glibc, the File nodes are interleaved
+        self.assertEqual(names, ['DOAPProject', 'foo', 'Jena', 'glibc', 'Saxon', 'myspec', 'commons-lang3', 'jena', 'Apache Commons Lang'])
+        self.assertEqual(instance.pending, [])
+        # the Package nodes keep the order of rdf_xml.Parser, which appends the File packages after them
+        package_names = [package["name"] for package in expected["packages"]][:4]
+        self.assertEqual([name for name in names if name in package_names], package_names)
+
+    def test_unsupported_serialization(self):
+        file = os.path.join(self.temp_dir, "node_id.rdf.xml")
+        with open(file, "w", encoding="UTF-8") as f:
+            f.write(NODE_ID_DOCUMENT)
+
+        with self.assertRaises(rdf_xml_stream.UnsupportedSerialization):
+            read_stages(rdf_xml_stream.Parser(file), file)
+
+        result = read_stages(rdf_xml.Parser(file), file)
+        self.assertEqual(result["packages"][0]["name"], "foo")
+
+    def test_fallback(self):
+        file = os.path.join(self.temp_dir, "partial.rdf.xml")
+        with open(file, "w", encoding="UTF-8") as f:
+            f.write(PARTIAL_DOCUMENT)
+
+        instance = rdf_xml_stream.Parser(file)
+        # license_info needs the spdx license list
+        with mock.patch.object(parser.AbstractParser, "license_info", autospec=True) as license_info:
+            result = instance.parse(file)
+        # the streaming pass had read bar before it gave up
+        self.assertEqual([package["name"] for package in instance.doc["packages"]], ["bar"])
+        # the document is read again by rdflib, from the start
+        self.assertIsNot(result, instance.doc)
+        self.assertEqual(sorted(package["name"] for package in result["packages"]), ["bar", "foo"])
+        self.assertEqual(result["name"], "nodeID document")
+        self.assertEqual(license_info.call_count, 1)
+        self.assertIsInstance(license_info.call_args[0][0], rdf_xml.Parser)
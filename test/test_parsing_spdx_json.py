@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from onot.parsing import spdx_json
+
+DOCUMENT = {
+    "spdxVersion": "SPDX-2.3",
+    "SPDXID": "SPDXRef-DOCUMENT",
+    "name": "json document",
+    "creationInfo": {
+        "created": "2022-10-01T00:00:00Z",
+        "creators": [
+            "Tool: scanner-1.0",
+            "Organization: ExampleCodeInspect (opensource@email.com)"
+        ]
+    },
+    # files before packages: the packages made of files come first
+    "files": [{
+        "SPDXID": "SPDXRef-File",
+        "fileName": "./lib/commons-io-2.11.0.jar",
+        "licenseConcluded": "Apache-2.0",
+        "licenseInfoInFiles": ["Apache-2.0", "MIT"],
+        "copyrightText": "Copyright commons-io"
+    }],
+    "packages": [{
+        "SPDXID": "SPDXRef-Package-foo",
+        "name": "foo",
+        "versionInfo": "1.0",
+        "licenseConcluded": "(MIT OR Apache-2.0)",
+        "licenseDeclared": "MIT",
+        "copyrightText": "Copyright foo",
+        "downloadLocation": "http://example.com/foo",
+        "checksums": [{"algorithm": "SHA1", "checksumValue": "85ed0817af83a24ad8da68c2b5094de69833983c"}]
+    }, {
+        "SPDXID": "SPDXRef-Package-bar",
+        "name": "bar",
+        "versionInfo": 2,
+        "licenseConcluded": "LicenseRef-bar",
+        "licenseDeclared": "NOASSERTION",
+        "copyrightText": "NOASSERTION",
+        "downloadLocation": "NOASSERTION"
+    }],
+    "hasExtractedLicensingInfos": [{
+        "licenseId": "LicenseRef-bar",
+        "name": "bar license",
+        "extractedText": "Permission is granted — to everybody."
+    }],
+    "relationships": [
+        {"spdxElementId": "SPDXRef-DOCUMENT", "relationshipType": "DESCRIBES", "relatedSpdxElement": "SPDXRef-Package-foo"}
+    ]
+}
+
+def read_stages(instance, file):
+    # everything but license_info, which needs the spdx license list
+    instance.validate_file(file)
+    instance.document_info()
+    instance.package_info()
+    instance.per_file_info()
+    instance.extracted_license_info()
+    return instance.doc
+
+class TestParsingSpdxJsonClass(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.temp_dir, "document.spdx.json")
+        with open(self.file, "w", encoding="UTF-8") as f:
+            json.dump(DOCUMENT, f, indent=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_result(self):
+        result = read_stages(spdx_json.Parser(self.file), self.file)
+        self.assertEqual(result["name"], "json document")
+        self.assertEqual(result["creationInfo"], {'organization': 'ExampleCodeInspect', 'email': 'opensource@email.com'})
+        self.assertEqual([(p["name"], p["versionInfo"]) for p in result["packages"]], [("commons-io", "2.11.0"), ("foo", "1.0"), ("bar", "2")])
+        self.assertEqual(result["packages"][1]["licenseConcluded"], "MIT OR Apache-2.0")
+        self.assertEqual(result["packages"][0]["licenseDeclared"], "Apache-2.0 AND MIT")
+        self.assertEqual(result["extracted_license"][0]["extractedText"], "Permission is granted — to everybody.")
+
+    def test_small_chunks(self):
+        # values split across chunks are read the same way
+        text = json.dumps(DOCUMENT)
+        for chunk_size in [1, 2, 7]:
+            reader = spdx_json.JsonStream(io.StringIO(text), chunk_size)
+            document = {}
+            for field in reader.members():
+                if field == "packages":
+                    document[field] = [reader.value() for _ in reader.items()]
+                elif field == "relationships":
+                    reader.skip()
+                else:
+                    document[field] = reader.value()
+            self.assertEqual(reader.peek(), "")
+            self.assertEqual(document["packages"], DOCUMENT["packages"])
+            self.assertEqual(document["hasExtractedLicensingInfos"], DOCUMENT["hasExtractedLicensingInfos"])
+
+    def test_required_field(self):
+        with open(self.file, "w", encoding="UTF-8") as f:
+            json.dump(dict(DOCUMENT, packages=[{"name": "foo"}]), f)
+        with self.assertRaisesRegex(ValueError, "packages.downloadLocation"):
+            read_stages(spdx_json.Parser(self.file), self.file)
+
+    def test_optional_fields(self):
+        # SPDX 2.3 requires only these
+        with open(self.file, "w", encoding="UTF-8") as f:
+            json.dump(dict(DOCUMENT, packages=[{"SPDXID": "SPDXRef-Package-foo", "name": "foo", "downloadLocation": "NOASSERTION"}],
+                           files=[{"SPDXID": "SPDXRef-File", "fileName": "./lib/commons-io-2.11.0.jar"}]), f)
+        result = read_stages(spdx_json.Parser(self.file), self.file)
+        self.assertEqual(result["packages"], [
+            {"name": "commons-io", "versionInfo": "2.11.0", "licenseConcluded": "NOASSERTION", "licenseDeclared": "NOASSERTION",
+             "copyrightText": "", "downloadLocation": ""},
+            {"name": "foo", "versionInfo": "", "licenseConcluded": "NOASSERTION", "licenseDeclared": "NOASSERTION",
+             "copyrightText": "", "downloadLocation": "NOASSERTION"}])
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from onot.parsing import tag_value
+
+DOCUMENT = """SPDXVersion: SPDX-2.3
+DataLicense: CC0-1.0
+SPDXID: SPDXRef-DOCUMENT
+DocumentName: tag-value document
+DocumentNamespace: http://example.com/tag-value
+Creator: Tool: scanner-1.0
+Creator: Organization: ExampleCodeInspect (opensource@email.com)
+Created: 2022-10-01T00:00:00Z
+
+## File
+FileName: ./lib/commons-io-2.11.0.jar
+SPDXID: SPDXRef-File
+LicenseConcluded: Apache-2.0
+LicenseInfoInFile: Apache-2.0
+LicenseInfoInFile: MIT
+FileCopyrightText: <text>Copyright commons-io</text>
+
+## Package
+PackageName: foo
+SPDXID: SPDXRef-Package-foo
+PackageVersion: 1.0
+PackageDownloadLocation: http://example.com/foo
+PackageLicenseConcluded: (MIT OR Apache-2.0)
+PackageLicenseDeclared: MIT
+PackageCopyrightText: <text>Copyright foo
+Copyright: bar
+</text>
+
+PackageName: bar
+SPDXID: SPDXRef-Package-bar
+PackageVersion: 2
+PackageDownloadLocation: NOASSERTION
+PackageLicenseConcluded: LicenseRef-bar
+PackageLicenseDeclared: NOASSERTION
+PackageCopyrightText: NOASSERTION
+
+## Snippet
+SnippetSPDXID: SPDXRef-Snippet
+SnippetFromFileSPDXID: SPDXRef-File
+SnippetLicenseConcluded: GPL-2.0-only
+LicenseInfoInSnippet: GPL-2.0-only
+
+## License
+LicenseID: LicenseRef-bar
+ExtractedText: <text>Permission is granted
+to everybody.</text>
+LicenseName: bar license
+
+Relationship: SPDXRef-DOCUMENT DESCRIBES SPDXRef-Package-foo
+"""
+
+def read_stages(instance, file):
+    # everything but license_info, which needs the spdx license list
+    instance.validate_file(file)
+    instance.document_info()
+    instance.package_info()
+    instance.per_file_info()
+    instance.extracted_license_info()
+    return instance.doc
+
+class TestParsingTagValueClass(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.temp_dir, "document.spdx")
+        self.write(DOCUMENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, text):
+        with open(self.file, "w", encoding="UTF-8") as f:
+            f.write(text)
+
+    def test_result(self):
+        result = read_stages(tag_value.Parser(self.file), self.file)
+        self.assertEqual(result["name"], "tag-value document")
+        self.assertEqual(result["creationInfo"], {'organization': 'ExampleCodeInspect', 'email': 'opensource@email.com'})
+        self.assertEqual([(p["name"], p["versionInfo"]) for p in result["packages"]], [("commons-io", "2.11.0"), ("foo", "1.0"), ("bar", "2")])
+        self.assertEqual(result["packages"][1]["licenseConcluded"], "MIT OR Apache-2.0")
+        self.assertEqual(result["packages"][1]["copyrightText"], "Copyright foo\nCopyright: bar")
+        self.assertEqual(result["packages"][0]["licenseDeclared"], "Apache-2.0 AND MIT")
+        self.assertEqual(result["extracted_license"], [{
+            "identifier": "LicenseRef-bar",
+            "licenseName": "bar license",
+            "extractedText": "Permission is granted\nto everybody."
+        }])
+
+    def test_required_tag(self):
+        self.write(DOCUMENT.replace("PackageDownloadLocation: NOASSERTION\n", ""))
+        with self.assertRaisesRegex(ValueError, "PackageDownloadLocation \\(package at line 29\\)"):
+            read_stages(tag_value.Parser(self.file), self.file)
+
+    def test_optional_tags(self):
+        # SPDX 2.3 requires only these
+        head = DOCUMENT[:DOCUMENT.index("## File")]
+        self.write(head + "FileName: ./lib/commons-io-2.11.0.jar\nSPDXID: SPDXRef-File\n\n"
+                   + "PackageName: foo\nSPDXID: SPDXRef-Package-foo\nPackageDownloadLocation: NOASSERTION\n")
+        result = read_stages(tag_value.Parser(self.file), self.file)
+        self.assertEqual(result["packages"], [
+            {"name": "commons-io", "versionInfo": "2.11.0", "licenseConcluded": "NOASSERTION", "licenseDeclared": "NOASSERTION",
+             "copyrightText": "", "downloadLocation": ""},
+            {"name": "foo", "versionInfo": "", "licenseConcluded": "NOASSERTION", "licenseDeclared": "NOASSERTION",
+             "copyrightText": "", "downloadLocation": "NOASSERTION"}])
+
+    def test_unterminated_text(self):
+        self.write(DOCUMENT.replace("to everybody.</text>", "to everybody."))
+        with self.assertRaisesRegex(ValueError, "</text> is not existed for the ExtractedText of line 45"):
+            read_stages(tag_value.Parser(self.file), self.file)
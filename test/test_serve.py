@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import time
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import http.client
+from unittest import mock
+from click.testing import CliRunner
+
+from onot.parsing import spdx_license
+from onot.tools import serve
+from test.spdx_server import SPDXServer
+from test.test_parsing_spdx_json import DOCUMENT
+
+class TestServeCase(unittest.TestCase):
+    def setUp(self):
+        self.spdx_server = SPDXServer().start()
+        self.cache_dir = tempfile.mkdtemp()
+        patcher = mock.patch.multiple(spdx_license, _registry=None, _registry_options={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        spdx_license.configure(url_prefix=self.spdx_server.url_prefix, cache_dir=self.cache_dir)
+        self.server = serve.make_server(port=0, workers=1, queue_size=1)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.stop_workers()
+        self.spdx_server.stop()
+        shutil.rmtree(self.cache_dir)
+
+    def request(self, method, path, body=None):
+        connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=10)
+        connection.request(method, path, body)
+        response = connection.getresponse()
+        data = response.read()
+        connection.close()
+        return response.status, data
+
+    def wait_for(self, condition):
+        deadline = time.time() + 10
+        while not condition():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+
+    def test_notice(self):
+        status, body = self.request("POST", "/notice?format=text", json.dumps(DOCUMENT).encode("UTF-8"))
+        self.assertEqual(status, 200)
+        self.assertIn("foo", body.decode("UTF-8"))
+        self.assertIn("bar license", body.decode("UTF-8"))
+
+        # the license lists are loaded once
+        self.request("POST", "/notice?format=html", json.dumps(DOCUMENT).encode("UTF-8"))
+        self.assertEqual(self.spdx_server.requests.get("/licenses/licenses.json"), 1)
+
+    def test_bad_request(self):
+        self.assertEqual(self.request("POST", "/notice", b"unknown")[0], 400)
+        self.assertEqual(self.request("POST", "/notice?format=pdf", b"{}")[0], 400)
+        self.assertEqual(self.request("GET", "/notice")[0], 404)
+
+    def test_queue_full(self):
+        # the only worker waits for the request line of an idle client, another client waits in the queue
+        idle = socket.create_connection(self.server.server_address[:2])
+        self.wait_for(lambda: self.server.active == 1)
+        waiting = socket.create_connection(self.server.server_address[:2])
+        self.wait_for(lambda: self.server.jobs.qsize() == 1)
+        self.assertEqual(self.request("GET", "/health")[0], 503)
+        idle.close()
+        waiting.close()
+        self.wait_for(lambda: self.server.active == 0 and self.server.jobs.qsize() == 0)
+        status, body = self.request("GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["workers"], 1)
+
+    def test_no_unix_socket(self):
+        # Windows has no unix sockets
+        with mock.patch.object(serve, "NoticeUnixServer", None):
+            self.assertRaises(ValueError, lambda: serve.make_server(socket_path="onot.sock"))
+            result = CliRunner().invoke(serve.main, ["--socket", "onot.sock"])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--socket", result.output)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright 2022 SK TELECOM CO., LTD. <haksung@sk.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from onot.parsing import excel
+from onot.parsing import rdf_xml_stream
+from onot.tools import synth
+
+class TestSynthCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.document = synth.SyntheticDocument(200, files=30, license_complexity=4, duplicate_ratio=0.2,
+                                                extracted_licenses=3, extracted_ratio=0.1, extracted_text_size=50)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self, instance, file):
+        instance.validate_file(file)
+        instance.document_info()
+        instance.package_info()
+        instance.per_file_info()
+        instance.extracted_license_info()
+        return instance.doc
+
+    def check(self, doc):
+        names = set((name, version) for name, version, _, _, _ in self.document.iter_packages())
+        self.assertLess(len(names), 200)
+        # the duplicates are merged, every file is another package
+        self.assertEqual(len(doc["packages"]), len(names) + 30)
+        self.assertEqual(doc["name"], "synthetic-200")
+        self.assertEqual([license["identifier"] for license in doc["extracted_license"]], ["LicenseRef-0", "LicenseRef-1", "LicenseRef-2"])
+        self.assertTrue(all(len(license["extractedText"]) == 50 for license in doc["extracted_license"]))
+
+    def test_excel(self):
+        path = os.path.join(self.directory, "synthetic.xlsx")
+        synth.write(self.document, path)
+        instance = excel.Parser(path)
+        try:
+            self.check(self.read(instance, path))
+        finally:
+            instance.wb.close()
+
+    def test_rdf_xml(self):
+        path = os.path.join(self.directory, "synthetic.rdf.xml")
+        synth.write(self.document, path)
+        self.check(self.read(rdf_xml_stream.Parser(path), path))
+
+    def test_options(self):
+        # the same seed gives the same document
+        again = synth.SyntheticDocument(200, files=30, license_complexity=4, duplicate_ratio=0.2,
+                                        extracted_licenses=3, extracted_ratio=0.1, extracted_text_size=50)
+        self.assertEqual(list(again.iter_packages()), list(self.document.iter_packages()))
+        simple = synth.SyntheticDocument(100, license_complexity=1, duplicate_ratio=0, extracted_ratio=0)
+        # single licenses, some with an exception
+        texts = [synth.expression_text(license) for _, _, license, _, _ in simple.iter_packages()]
+        self.assertFalse([text for text in texts if " AND " in text or " OR " in text or text.startswith("LicenseRef-")])
+        self.assertEqual(len(set(name for name, _, _, _, _ in simple.iter_packages())), 100)
+        self.assertRaises(ValueError, lambda: synth.SyntheticDocument(10, duplicate_ratio=2))
+        self.assertRaises(ValueError, lambda: synth.write(simple, os.path.join(self.directory, "synthetic.txt")))
+
+    def test_distinct_licenses(self):
+        def license_ids(expression):
+            if isinstance(expression, str):
+                return [expression]
+            if expression[0] == "WITH":
+                return [expression[1]]
+            return license_ids(expression[1]) + license_ids(expression[2])
+        # no MIT AND MIT; at most as many licenses as there are ids
+        for expression in self.document.expressions:
+            ids = license_ids(expression)
+            self.assertEqual(len(ids), len(set(ids)), expression)
+        small = synth.SyntheticDocument(10, license_complexity=4, license_ids=["MIT", "Apache-2.0"])
+        self.assertTrue(all(len(license_ids(expression)) <= 2 for expression in small.expressions))
+
+if __name__ == '__main__':
+    unittest.main()